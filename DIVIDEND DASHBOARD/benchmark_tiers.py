@@ -0,0 +1,108 @@
+"""
+Benchmarks the Prophet fidelity tiers of ForecastProcessor.
+
+Every tier is fitted cold on the same bars of each symbol and its smoothed bands are
+compared with the 'full' tier on the dates both predict. The report shows the fit time
+of each tier, how far its bands and predicted price move from 'full' (mean absolute
+difference in percent) and how often it makes the same below-the-lower-band call as
+'full' on the last bar, which is the Yield Hunter test.
+
+Usage:
+    python benchmark_tiers.py                 # the ETFs and the first current holdings
+    python benchmark_tiers.py KO PEP O --holdings 0
+"""
+import argparse
+import time
+import pandas as pd
+from files.StockDataFetcher import StockDataFetcher
+from files.DataProcessor import DataProcessor
+from files.ForecastProcessor import ForecastProcessor
+from files.WorkbookLoader import WorkbookLoader
+
+DEFAULT_SYMBOLS = ['SPLG', 'GLD', 'SH']
+
+def get_symbols(symbols, holdings):
+    # the ETFs of Market Watch plus the first holdings of the workbook
+    if symbols:
+        return symbols
+    symbols = list(DEFAULT_SYMBOLS)
+    if holdings:
+        tickers = WorkbookLoader('data/Dividend_Dashboard.xlsx').get_sheet('current_holdings', columns=['Ticker'])
+        symbols += [ticker for ticker in tickers['Ticker'].drop_duplicates().tolist()[:holdings] if ticker not in symbols]
+    return symbols
+
+def run_tier(prep_data, tier, period):
+    # cold fit, so no stored model skews the timing
+    start = time.perf_counter()
+    forecast = ForecastProcessor.prophet_forecast(prep_data, period=period, tier=tier, asset_class='equity')
+    elapsed = time.perf_counter() - start
+    return DataProcessor.process_prophet_forecast(forecast), elapsed
+
+def compare(processed, reference, last_date, last_close):
+    # mean absolute difference in percent on the dates both tiers predict
+    common = processed.index.intersection(reference.index)
+    result = {}
+    for column in ['predicted_price', 'lower_band', 'upper_band']:
+        diff = (processed.loc[common, column] - reference.loc[common, column]).abs() / reference.loc[common, column].abs()
+        result[column] = diff.mean() * 100
+    below = last_close < processed.loc[last_date, 'lower_band']
+    reference_below = last_close < reference.loc[last_date, 'lower_band']
+    result['same_call'] = below == reference_below
+    return result
+
+def benchmark(symbols, period=90):
+    rows = []
+    for symbol in symbols:
+        print(f'benchmarking {symbol}')
+        try:
+            stock_data_fetcher = StockDataFetcher()
+            stock_data_fetcher.set_ticker(symbol)
+            data = stock_data_fetcher.fetch_data()
+            prep_data = DataProcessor.prepare_data_for_prophet(data)
+            reference, reference_time = run_tier(prep_data, 'full', period)
+        except Exception as e:
+            print(f"Error benchmarking {symbol}: {e}")
+            continue
+        last_date = pd.Timestamp(prep_data['ds'].iloc[-1])
+        last_close = prep_data['y'].iloc[-1]
+        rows.append({'symbol': symbol, 'tier': 'full', 'seconds': reference_time,
+                     'predicted_price': 0.0, 'lower_band': 0.0, 'upper_band': 0.0, 'same_call': True})
+        for tier in ForecastProcessor.TIERS:
+            if tier == 'full':
+                continue
+            try:
+                processed, elapsed = run_tier(prep_data, tier, period)
+                rows.append({'symbol': symbol, 'tier': tier, 'seconds': elapsed,
+                             **compare(processed, reference, last_date, last_close)})
+            except Exception as e:
+                print(f"Error benchmarking the {tier} tier of {symbol}: {e}")
+    return pd.DataFrame(rows)
+
+def summarize(results):
+    # average over the symbols, the cheapest tiers first
+    summary = results.groupby('tier').agg(
+        seconds=('seconds', 'mean'),
+        predicted_price_pct=('predicted_price', 'mean'),
+        lower_band_pct=('lower_band', 'mean'),
+        upper_band_pct=('upper_band', 'mean'),
+        same_call=('same_call', 'mean'),
+    )
+    summary['speedup'] = summary.loc['full', 'seconds'] / summary['seconds']
+    return summary.sort_values('seconds')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the Prophet fidelity tiers with the full tier.')
+    parser.add_argument('symbols', nargs='*', help='the symbols to benchmark')
+    parser.add_argument('--holdings', type=int, default=10, help='the number of current holdings added to the default symbols')
+    parser.add_argument('--period', type=int, default=90, help='the number of days forecast forward')
+    args = parser.parse_args()
+
+    results = benchmark(get_symbols(args.symbols, args.holdings), period=args.period)
+    if results.empty:
+        print('No symbol could be benchmarked')
+    else:
+        pd.set_option('display.width', 200)
+        print('\nper symbol (band columns are the mean absolute difference from full, in %)')
+        print(results.round(3).to_string(index=False))
+        print('\nper tier')
+        print(summarize(results).round(3).to_string())
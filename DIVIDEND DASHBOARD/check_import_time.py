@@ -0,0 +1,81 @@
+"""
+Checks that importing app.py, and with it every page, stays within an import time budget.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter with the page and
+forecast warm-ups off, adds up the cumulative time of the top-level imports and fails
+when it goes over the budget or when a heavy dependency that should only be imported on
+first use (Prophet, SciPy, yfinance, plotly express) was imported at start up. The
+slowest imports are listed to show where the time goes.
+
+Usage:
+    python check_import_time.py                   # the default budget
+    python check_import_time.py --budget-ms 1500 --top 20
+
+tests/test_import_time.py runs the same measurement under pytest. Both read the budget
+from IMPORT_TIME_BUDGET_MS when it is set.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# agreed on with the pages importing dash, pandas and plotly.graph_objects only
+DEFAULT_BUDGET_MS = 2500
+# imported on first use by ForecastProcessor, DataProcessor, the fetchers and the charts
+DEFERRED_MODULES = ['prophet', 'cmdstanpy', 'scipy', 'scipy.signal', 'yfinance', 'plotly.express']
+
+def measure(module='app'):
+    # a fresh interpreter, so nothing is already imported
+    env = dict(os.environ, PAGE_WARMUP='0', FORECAST_WARMUP='0', DIVIDEND_WARMUP='0', MT4_STREAM='0')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    imports = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # one space follows the separator, nested imports are indented by two more each
+        imports.append((name[1:].rstrip(), int(cumulative)))
+    return imports
+
+def summarize(imports):
+    # nested imports are indented, the top-level ones add up to the total
+    top_level = [(name, cumulative) for name, cumulative in imports if not name.startswith(' ')]
+    total_ms = sum(cumulative for _, cumulative in top_level) / 1000
+    imported = {name.strip() for name, _ in imports}
+    return total_ms, top_level, imported
+
+def budget_from_env():
+    return float(os.environ.get('IMPORT_TIME_BUDGET_MS', DEFAULT_BUDGET_MS))
+
+def check(budget_ms=DEFAULT_BUDGET_MS, top=10):
+    total_ms, top_level, imported = summarize(measure())
+    deferred = [module for module in DEFERRED_MODULES if module in imported]
+
+    print(f'import app: {total_ms:.0f} ms (budget {budget_ms} ms)')
+    print('slowest top-level imports:')
+    for name, cumulative in sorted(top_level, key=lambda item: item[1], reverse=True)[:top]:
+        print(f'  {cumulative / 1000:8.1f} ms  {name}')
+
+    ok = True
+    if total_ms > budget_ms:
+        print(f'FAIL: import time is over the budget by {total_ms - budget_ms:.0f} ms')
+        ok = False
+    if deferred:
+        print(f'FAIL: imported at start up instead of on first use: {", ".join(deferred)}')
+        ok = False
+    if ok:
+        print('OK')
+    return ok
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--budget-ms', type=float, default=budget_from_env(),
+                        help=f'the import time budget in milliseconds (default {DEFAULT_BUDGET_MS})')
+    parser.add_argument('--top', type=int, default=10, help='the number of slowest imports listed')
+    args = parser.parse_args()
+    sys.exit(0 if check(args.budget_ms, args.top) else 1)
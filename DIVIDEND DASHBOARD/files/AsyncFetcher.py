@@ -0,0 +1,214 @@
+import asyncio
+import threading
+from urllib.parse import urlsplit
+from files.HttpClient import HttpClient
+
+class AsyncFetcher:
+    """
+    Fans out blocking HTTP calls on an asyncio event loop with bounded concurrency.
+
+    Each call runs in a worker thread through asyncio.to_thread, so the pooled HttpClient
+    (and anything else that blocks, such as a rate limited fetch) can be reused as is. A
+    global semaphore bounds the calls in flight and a semaphore per host keeps a single
+    API from being flooded. The sync methods let the existing fetchers and Dash callbacks
+    use it without being async themselves: N requests take about as long as the slowest
+    one instead of their sum.
+
+    Attributes:
+    -----------
+    max_concurrency : int
+        The most calls in flight across all hosts.
+    host_limit : int
+        The default most calls in flight per host.
+    host_limits : dict
+        The most calls in flight of specific hosts, e.g. {'api.polygon.io': 5}.
+
+    Methods:
+    --------
+    shared()
+        Returns the fetcher shared by the whole app.
+
+    fetch_all(self, requests, return_exceptions=False)
+        Sends many requests concurrently and returns the responses in order.
+
+    call_all(self, calls, host=None, limit=None, return_exceptions=False)
+        Runs many blocking callables concurrently and returns their results in order.
+    """
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, http_client=None, max_concurrency=16, host_limit=8, host_limits=None):
+        """
+        Initializes the AsyncFetcher.
+
+        Parameters:
+        -----------
+        http_client : HttpClient, optional
+            The client sending the requests (default is HttpClient.shared()).
+        max_concurrency : int, optional
+            The most calls in flight across all hosts (default is 16).
+        host_limit : int, optional
+            The default most calls in flight per host (default is 8).
+        host_limits : dict, optional
+            The most calls in flight of specific hosts (default is None).
+        """
+        self.http_client = http_client or HttpClient.shared()
+        self.max_concurrency = max_concurrency
+        self.host_limit = host_limit
+        self.host_limits = dict(host_limits or {})
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the fetcher shared by the whole app, creating it on the first call.
+
+        Returns:
+        --------
+        AsyncFetcher
+            The shared fetcher.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    async def acall_all(self, calls, host=None, limit=None, return_exceptions=False):
+        """
+        Runs blocking callables concurrently, see call_all().
+
+        Parameters:
+        -----------
+        calls : list
+            Callables taking no argument, or (host, callable) tuples.
+        host : str, optional
+            The host of the calls given without one (default is None, no host limit).
+        limit : int, optional
+            The most of these calls in flight (default is None, only the fetcher limits apply).
+        return_exceptions : bool, optional
+            Whether failures are returned in place of the results instead of raised.
+
+        Returns:
+        --------
+        list
+            The results, in the order of the calls.
+        """
+        # semaphores belong to the running loop, so they are created per batch
+        overall = asyncio.Semaphore(min(self.max_concurrency, limit) if limit else self.max_concurrency)
+        per_host = {}
+
+        async def run(call_host, call):
+            if call_host and call_host not in per_host:
+                per_host[call_host] = asyncio.Semaphore(self.host_limits.get(call_host, self.host_limit))
+            host_semaphore = per_host.get(call_host)
+            async with overall:
+                if host_semaphore is None:
+                    return await asyncio.to_thread(call)
+                async with host_semaphore:
+                    return await asyncio.to_thread(call)
+
+        tasks = [run(*call) if isinstance(call, tuple) else run(host, call) for call in calls]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def afetch_all(self, requests, return_exceptions=False):
+        """
+        Sends many requests concurrently, see fetch_all().
+
+        Parameters:
+        -----------
+        requests : list
+            The requests, as URLs or dicts of HttpClient.request() arguments.
+        return_exceptions : bool, optional
+            Whether failures are returned in place of the responses instead of raised.
+
+        Returns:
+        --------
+        list
+            The responses, in the order of the requests.
+        """
+        calls = []
+        for request in requests:
+            kwargs = {'url': request} if isinstance(request, str) else dict(request)
+            kwargs.setdefault('method', 'GET')
+            host = urlsplit(kwargs['url']).netloc
+            calls.append((host, lambda kwargs=kwargs: self.http_client.request(**kwargs)))
+        return await self.acall_all(calls, return_exceptions=return_exceptions)
+
+    @staticmethod
+    def run(coroutine):
+        """
+        Runs a coroutine to completion from sync code and returns its result.
+
+        Dash callbacks and the fetchers have no running event loop, so the coroutine gets
+        its own. If one is already running in this thread, it runs on a helper thread.
+
+        Parameters:
+        -----------
+        coroutine : coroutine
+            The coroutine to run.
+
+        Returns:
+        --------
+        object
+            The result of the coroutine.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        result = {}
+
+        def target():
+            try:
+                result['value'] = asyncio.run(coroutine)
+            except BaseException as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=target, name='async-fetcher')
+        thread.start()
+        thread.join()
+        if 'error' in result:
+            raise result['error']
+        return result['value']
+
+    def fetch_all(self, requests, return_exceptions=False):
+        """
+        Sends many requests concurrently and returns the responses in order.
+
+        Parameters:
+        -----------
+        requests : list
+            The requests, as URLs or dicts of HttpClient.request() arguments
+            (method defaults to 'GET').
+        return_exceptions : bool, optional
+            Whether failures are returned in place of the responses instead of raised
+            (default is False).
+
+        Returns:
+        --------
+        list
+            The responses, in the order of the requests.
+        """
+        return self.run(self.afetch_all(requests, return_exceptions=return_exceptions))
+
+    def call_all(self, calls, host=None, limit=None, return_exceptions=False):
+        """
+        Runs many blocking callables concurrently and returns their results in order.
+
+        Parameters:
+        -----------
+        calls : list
+            Callables taking no argument, or (host, callable) tuples.
+        host : str, optional
+            The host of the calls given without one, for its per-host limit (default is None).
+        limit : int, optional
+            The most of these calls in flight (default is None).
+        return_exceptions : bool, optional
+            Whether failures are returned in place of the results instead of raised
+            (default is False).
+
+        Returns:
+        --------
+        list
+            The results, in the order of the calls.
+        """
+        return self.run(self.acall_all(calls, host=host, limit=limit, return_exceptions=return_exceptions))
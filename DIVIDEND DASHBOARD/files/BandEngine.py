@@ -0,0 +1,133 @@
+import warnings
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+class BandEngine:
+    """
+    Computes trend and upper/lower bands for many symbols at once with NumPy.
+
+    Each bar gets a linear regression of the log close over the trailing window. The
+    trend is the fitted value at that bar and the bands are the trend shifted by the
+    quantiles of the window's residuals. With the default interval width this matches
+    the 80% interval Prophet draws, at a tiny fraction of the cost, which makes it
+    suitable for screening a whole universe before running Prophet on the survivors.
+
+    Methods:
+    --------
+    rolling_bands(closes, window=60, interval_width=0.8)
+        Returns the trend and bands of a 2D array of closes (symbols x bars).
+
+    band_panel(closes, window=60, interval_width=0.8)
+        Returns the trend and bands of a DataFrame of closes with one column per symbol.
+
+    below_lower_band(closes, window=60, interval_width=0.8, margin=0.0)
+        Returns the symbols whose last close is below their lower band.
+    """
+    @staticmethod
+    def rolling_bands(closes, window=60, interval_width=0.8):
+        """
+        Returns the trend and bands of a 2D array of closes.
+
+        Parameters:
+        -----------
+        closes : numpy.ndarray
+            The closes, shaped (symbols, bars). Missing bars are NaN.
+        window : int, optional
+            The number of bars in each regression (default is 60).
+        interval_width : float, optional
+            The width of the band, as a probability (default is 0.8).
+
+        Returns:
+        --------
+        dict
+            'trend', 'lower_band' and 'upper_band' arrays shaped like closes, and 'slope', the
+            log growth per bar of each regression. The first window - 1 bars are NaN.
+        """
+        closes = np.atleast_2d(np.asarray(closes, dtype=float))
+        n_symbols, n_bars = closes.shape
+        result = {name: np.full((n_symbols, n_bars), np.nan) for name in ['trend', 'lower_band', 'upper_band', 'slope']}
+        if n_bars < window:
+            return result
+
+        # windows without enough bars give NaN, which is expected and not worth a warning
+        with np.errstate(divide='ignore', invalid='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            log_closes = np.log(np.where(closes > 0, closes, np.nan))
+            # (symbols, windows, window) view, no copy is made
+            y = sliding_window_view(log_closes, window, axis=-1)
+            mask = ~np.isnan(y)
+            x = np.arange(window, dtype=float)
+
+            count = mask.sum(axis=-1)
+            x_mean = (mask * x).sum(axis=-1) / count
+            y_mean = np.nansum(y, axis=-1) / count
+            x_dev = np.where(mask, x - x_mean[..., None], 0.0)
+            slope = np.nansum(x_dev * (y - y_mean[..., None]), axis=-1) / (x_dev ** 2).sum(axis=-1)
+
+            fitted = y_mean[..., None] + slope[..., None] * (x - x_mean[..., None])
+            residuals = y - fitted
+            tail = (1 - interval_width) / 2
+            lower_q, upper_q = np.nanquantile(residuals, [tail, 1 - tail], axis=-1)
+
+            trend = y_mean + slope * (window - 1 - x_mean)
+            # too few bars in the window to fit a line
+            trend[count < 3] = np.nan
+            slope[count < 3] = np.nan
+
+        result['trend'][:, window - 1:] = np.exp(trend)
+        result['lower_band'][:, window - 1:] = np.exp(trend + lower_q)
+        result['upper_band'][:, window - 1:] = np.exp(trend + upper_q)
+        result['slope'][:, window - 1:] = slope
+        return result
+
+    @staticmethod
+    def band_panel(closes, window=60, interval_width=0.8):
+        """
+        Returns the trend and bands of a DataFrame of closes with one column per symbol.
+
+        Parameters:
+        -----------
+        closes : pandas.DataFrame
+            The closes indexed by date with one column per symbol, e.g. yf.download(tickers)['Close'].
+        window : int, optional
+            The number of bars in each regression (default is 60).
+        interval_width : float, optional
+            The width of the band, as a probability (default is 0.8).
+
+        Returns:
+        --------
+        dict
+            'trend', 'lower_band', 'upper_band' and 'slope' DataFrames shaped like closes.
+        """
+        bands = BandEngine.rolling_bands(closes.to_numpy(dtype=float).T, window, interval_width)
+        return {name: pd.DataFrame(values.T, index=closes.index, columns=closes.columns) for name, values in bands.items()}
+
+    @staticmethod
+    def below_lower_band(closes, window=60, interval_width=0.8, margin=0.0):
+        """
+        Returns the symbols whose last close is below their lower band.
+
+        Parameters:
+        -----------
+        closes : pandas.DataFrame
+            The closes indexed by date with one column per symbol.
+        window : int, optional
+            The number of bars in each regression (default is 60).
+        interval_width : float, optional
+            The width of the band, as a probability (default is 0.8).
+        margin : float, optional
+            Also keep symbols within this fraction above the band (default is 0.0). A small
+            margin keeps borderline symbols for a slower, more accurate second stage.
+
+        Returns:
+        --------
+        list
+            The symbols below (or within the margin of) their lower band.
+        """
+        closes = closes.ffill()
+        lower_band = BandEngine.band_panel(closes, window, interval_width)['lower_band']
+        last_close = closes.iloc[-1]
+        last_lower_band = lower_band.iloc[-1]
+        below = last_close < last_lower_band * (1 + margin)
+        return below[below].index.tolist()
@@ -0,0 +1,245 @@
+import json
+import os
+import re
+import threading
+import pandas as pd
+
+class BarStore:
+    """
+    A persistent store of OHLC bars, one Parquet file per symbol and interval.
+
+    The fetchers read the stored bars and only request the bars after the last stored
+    timestamp, so a refresh costs one small delta request instead of a full history
+    download. Each file has a small JSON sidecar recording how far back the history was
+    downloaded, so a symbol listed after the requested start is not downloaded again.
+
+    Attributes:
+    -----------
+    base_dir : str
+        The directory holding one sub-directory per interval.
+
+    Methods:
+    --------
+    period_start(period, now=None)
+        Returns the first date of a yfinance style period such as '2y'.
+
+    covers(self, symbol, interval, start)
+        Returns whether the stored history goes back to the start.
+
+    last_timestamp(self, symbol, interval)
+        Returns the timestamp of the last stored bar, or None.
+
+    read(self, symbol, interval, start=None)
+        Returns the stored bars from the start, or None.
+
+    append(self, symbol, interval, bars, covered_from=None, replace=False)
+        Merges new bars into the stored bars and returns all of them.
+    """
+    # days per yfinance period unit, months and years rounded up so the history is never short
+    PERIOD_DAYS = {'d': 1, 'wk': 7, 'mo': 31, 'y': 366}
+
+    def __init__(self, base_dir='data/bars'):
+        """
+        Initializes the BarStore.
+
+        Parameters:
+        -----------
+        base_dir : str, optional
+            The directory holding the Parquet files (default is 'data/bars').
+        """
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def period_start(period, now=None):
+        """
+        Returns the first date of a period.
+
+        Parameters:
+        -----------
+        period : str or int
+            A yfinance period such as '5d', '6mo', '2y', 'ytd' or 'max', or a number of days.
+        now : pandas.Timestamp, optional
+            The end of the period (default is now).
+
+        Returns:
+        --------
+        pandas.Timestamp or None
+            The first date, or None for 'max'.
+
+        Raises:
+        -------
+        ValueError
+            If the period is not understood.
+        """
+        now = pd.Timestamp.now() if now is None else now
+        if isinstance(period, int):
+            return (now - pd.Timedelta(days=period)).normalize()
+        if period == 'max':
+            return None
+        if period == 'ytd':
+            return now.normalize().replace(month=1, day=1)
+        match = re.fullmatch(r'(\d+)(d|wk|mo|y)', period)
+        if not match:
+            raise ValueError(f"Unknown period '{period}'")
+        days = int(match.group(1)) * BarStore.PERIOD_DAYS[match.group(2)]
+        return (now - pd.Timedelta(days=days)).normalize()
+
+    def _path(self, symbol, interval):
+        # symbols such as '^GSPC' or 'BTC-USDC' are not all safe file names
+        name = re.sub(r'[^A-Za-z0-9.-]', '_', str(symbol))
+        return os.path.join(self.base_dir, re.sub(r'[^A-Za-z0-9.-]', '_', str(interval)), f'{name}.parquet')
+
+    def _read_meta(self, path):
+        try:
+            with open(f'{path}.json') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _align_tz(timestamp, index):
+        # intraday yfinance bars are tz-aware while the period start is not
+        timestamp = pd.Timestamp(timestamp)
+        tz = getattr(index, 'tz', None)
+        if tz is not None and timestamp.tz is None:
+            return timestamp.tz_localize(tz)
+        if tz is None and timestamp.tz is not None:
+            return timestamp.tz_localize(None)
+        return timestamp
+
+    def _load(self, path):
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"Ignoring stored bars {path}: {e}")
+            return None
+
+    def covers(self, symbol, interval, start):
+        """
+        Returns whether the stored history goes back to the start.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol of the bars.
+        interval : str
+            The interval of the bars, e.g. '1d' or '1hour'.
+        start : pandas.Timestamp or None
+            The first date needed, None for the whole history.
+
+        Returns:
+        --------
+        bool
+            True if the bars from the start are stored.
+        """
+        path = self._path(symbol, interval)
+        covered_from = self._read_meta(path).get('covered_from')
+        if not os.path.exists(path) or covered_from is None:
+            return False
+        if covered_from == 'max':
+            return True
+        return start is not None and pd.Timestamp(covered_from) <= start
+
+    def last_timestamp(self, symbol, interval):
+        """
+        Returns the timestamp of the last stored bar.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol of the bars.
+        interval : str
+            The interval of the bars.
+
+        Returns:
+        --------
+        pandas.Timestamp or None
+            The last timestamp, or None if nothing is stored.
+        """
+        bars = self._load(self._path(symbol, interval))
+        if bars is None or bars.empty:
+            return None
+        return bars.index[-1]
+
+    def read(self, symbol, interval, start=None):
+        """
+        Returns the stored bars from the start.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol of the bars.
+        interval : str
+            The interval of the bars.
+        start : pandas.Timestamp, optional
+            The first date to return (default is None, every stored bar).
+
+        Returns:
+        --------
+        pandas.DataFrame or None
+            The bars sorted by date, or None if nothing is stored.
+        """
+        bars = self._load(self._path(symbol, interval))
+        if bars is None or start is None:
+            return bars
+        return bars[bars.index >= self._align_tz(start, bars.index)]
+
+    def append(self, symbol, interval, bars, covered_from=None, replace=False):
+        """
+        Merges new bars into the stored bars and writes them back.
+
+        Bars with a stored timestamp replace the stored ones, since the last stored bar is
+        usually still forming when it is fetched.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol of the bars.
+        interval : str
+            The interval of the bars.
+        bars : pandas.DataFrame
+            The new bars, indexed by date.
+        covered_from : pandas.Timestamp or str, optional
+            The start of a full history download, or 'max' (default is None for a delta).
+        replace : bool, optional
+            Whether the new bars replace every stored bar, e.g. after the history was
+            re-adjusted for a dividend or split (default is False).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Every stored bar of the symbol, sorted by date.
+        """
+        path = self._path(symbol, interval)
+        with self._lock:
+            stored = None if replace else self._load(path)
+            if stored is not None and not stored.empty:
+                combined = pd.concat([stored, bars])
+                combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+            else:
+                combined = bars.sort_index()
+            meta = {} if replace else self._read_meta(path)
+            if covered_from is not None:
+                previous = meta.get('covered_from')
+                if covered_from == 'max' or previous == 'max':
+                    meta['covered_from'] = 'max'
+                elif previous is None:
+                    meta['covered_from'] = pd.Timestamp(covered_from).isoformat()
+                else:
+                    meta['covered_from'] = min(pd.Timestamp(previous), pd.Timestamp(covered_from)).isoformat()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # write to temporary files first so a crash never leaves half written bars
+                tmp_path = f'{path}.{os.getpid()}.tmp'
+                combined.to_parquet(tmp_path)
+                os.replace(tmp_path, path)
+                with open(tmp_path, 'w') as file:
+                    json.dump(meta, file)
+                os.replace(tmp_path, f'{path}.json')
+            except (ImportError, OSError, ValueError) as e:
+                # the store is optional, the bars are still returned
+                print(f"Unable to store bars of {symbol} {interval}: {e}")
+        return combined
@@ -0,0 +1,299 @@
+import socketserver
+import threading
+from collections import OrderedDict
+from datetime import datetime
+import pandas as pd
+
+class _BarStreamHandler(socketserver.StreamRequestHandler):
+    # one connection, e.g. the EA, sends any number of bar lines
+    def handle(self):
+        for line in self.rfile:
+            self.server.bar_stream.ingest_line(line)
+
+class _BarStreamTCPServer(socketserver.ThreadingTCPServer):
+    # set on a subclass, not on ThreadingTCPServer, which other servers in the process share
+    allow_reuse_address = True
+    daemon_threads = True
+
+class BarStreamServer:
+    """
+    A localhost TCP server that receives bars pushed by MT4 and keeps them in memory.
+
+    Each bar is one line in the format of the EA's CSV files prefixed with the symbol and
+    timeframe:
+
+        EURUSD;1440;2024.03.01 00:00;1.08012;1.08450;1.07950;1.08380
+
+    A bar for a new date is appended and fires the new-bar callbacks; a bar for the last
+    date replaces the forming candle. MT4DataFetcher reads from the server when it is
+    enabled, so charts see a bar as soon as it is sent instead of when the CSV is polled.
+
+    Attributes:
+    -----------
+    host : str
+        The address the server listens on.
+    port : int
+        The port the server listens on.
+    max_bars : int
+        The number of bars kept per symbol and timeframe.
+
+    Methods:
+    --------
+    start(self)
+        Starts listening in a background thread.
+
+    stop(self)
+        Stops the server.
+
+    ingest_line(self, line)
+        Parses one bar line and adds the bar.
+
+    add_bar(self, symbol, period, date, open_price, high, low, close)
+        Adds or updates a bar.
+
+    seed(self, symbol, period, frame)
+        Adds the bars of a frame that were not received, e.g. the history in the CSV file.
+
+    get_frame(self, symbol, period)
+        Returns the bars of a symbol and timeframe as a DataFrame.
+
+    version(self, symbol, period)
+        Returns a number that changes whenever a bar is added or updated.
+
+    subscribe(self, callback)
+        Registers a callback fired on every new bar.
+
+    wait_for_bar(self, symbol, period, version, timeout=None)
+        Waits until the version of a symbol and timeframe moves past the given one.
+    """
+    DATE_FORMAT = '%Y.%m.%d %H:%M'
+
+    def __init__(self, host='127.0.0.1', port=5555, max_bars=730):
+        """
+        Initializes the BarStreamServer. Nothing listens until start() is called.
+
+        Parameters:
+        -----------
+        host : str, optional
+            The address to listen on (default is '127.0.0.1', local connections only).
+        port : int, optional
+            The port to listen on (default is 5555).
+        max_bars : int, optional
+            The number of bars kept per symbol and timeframe (default is 730, like the EA).
+        """
+        self.host = host
+        self.port = port
+        self.max_bars = max_bars
+        self._bars = {}
+        self._versions = {}
+        self._frames = {}
+        self._callbacks = []
+        self._condition = threading.Condition()
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Starts listening in a background thread, if it is not listening yet."""
+        if self._server is not None:
+            return
+        self._server = _BarStreamTCPServer((self.host, self.port), _BarStreamHandler)
+        self._server.bar_stream = self
+        # an ephemeral port (0) is resolved once bound
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='bar-stream', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the server and closes its socket."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    def ingest_line(self, line):
+        """
+        Parses one bar line and adds the bar. Invalid lines are reported and skipped.
+
+        Parameters:
+        -----------
+        line : bytes or str
+            'symbol;period;date;open;high;low;close'.
+
+        Returns:
+        --------
+        bool
+            True if the bar was added or updated.
+        """
+        if isinstance(line, bytes):
+            line = line.decode(errors='replace')
+        line = line.strip()
+        if not line:
+            return False
+        try:
+            symbol, period, date, open_price, high, low, close = line.split(';')
+            date = pd.Timestamp(datetime.strptime(date, self.DATE_FORMAT))
+            self.add_bar(symbol, period, date, float(open_price), float(high), float(low), float(close))
+        except ValueError as e:
+            print(f"Ignoring bar line {line!r}: {e}")
+            return False
+        return True
+
+    def add_bar(self, symbol, period, date, open_price, high, low, close):
+        """
+        Adds a bar for a new date or updates the bar of an existing one.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol, e.g. 'EURUSD'.
+        period : str
+            The timeframe in minutes, e.g. '60' or '1440'.
+        date : pandas.Timestamp
+            The open time of the bar.
+        open_price, high, low, close : float
+            The prices of the bar.
+        """
+        key = (symbol, str(period))
+        with self._condition:
+            bars = self._bars.setdefault(key, OrderedDict())
+            is_new = date not in bars
+            if is_new and bars and date < next(reversed(bars)):
+                # a late bar, keep the bars in date order
+                bars[date] = (open_price, high, low, close)
+                self._bars[key] = bars = OrderedDict(sorted(bars.items()))
+            else:
+                bars[date] = (open_price, high, low, close)
+            while len(bars) > self.max_bars:
+                bars.popitem(last=False)
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._frames.pop(key, None)
+            self._condition.notify_all()
+            callbacks = list(self._callbacks) if is_new else []
+        for callback in callbacks:
+            try:
+                callback(symbol, str(period), date)
+            except Exception as e:
+                print(f"Error in new bar callback for {symbol} {period}: {e}")
+
+    def seed(self, symbol, period, frame):
+        """
+        Adds the bars of a frame for the dates that were not received, without firing the
+        new-bar callbacks. The stream only holds the bars sent since it started, the older
+        ones come from the CSV file.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol.
+        period : str
+            The timeframe in minutes.
+        frame : pandas.DataFrame
+            Open, High, Low and Close indexed by date.
+
+        Returns:
+        --------
+        int
+            The number of bars added.
+        """
+        key = (symbol, str(period))
+        with self._condition:
+            bars = self._bars.get(key, OrderedDict())
+            # the streamed bars are newer than the file, they are kept on the same dates
+            seeded = {date: tuple(row) for date, row in zip(frame.index, frame[['Open', 'High', 'Low', 'Close']].itertuples(index=False))
+                      if date not in bars}
+            if not seeded:
+                return 0
+            bars = OrderedDict(sorted({**seeded, **bars}.items()))
+            while len(bars) > self.max_bars:
+                bars.popitem(last=False)
+            self._bars[key] = bars
+            self._versions[key] = self._versions.get(key, 0) + 1
+            self._frames.pop(key, None)
+            self._condition.notify_all()
+        return len(seeded)
+
+    def get_frame(self, symbol, period):
+        """
+        Returns the bars of a symbol and timeframe.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol.
+        period : str
+            The timeframe in minutes.
+
+        Returns:
+        --------
+        pandas.DataFrame or None
+            Open, High, Low and Close indexed by Date, or None if no bar was received.
+        """
+        key = (symbol, str(period))
+        with self._condition:
+            frame = self._frames.get(key)
+            if frame is not None:
+                return frame
+            bars = self._bars.get(key)
+            if not bars:
+                return None
+            frame = pd.DataFrame(list(bars.values()), index=pd.DatetimeIndex(list(bars.keys()), name='Date'),
+                                 columns=['Open', 'High', 'Low', 'Close'])
+            # built once per version, the charts and the scheduler share it
+            self._frames[key] = frame
+            return frame
+
+    def version(self, symbol, period):
+        """
+        Returns a number that changes whenever a bar of the symbol and timeframe is added or updated.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol.
+        period : str
+            The timeframe in minutes.
+
+        Returns:
+        --------
+        int or None
+            The version, or None if no bar was received.
+        """
+        with self._condition:
+            return self._versions.get((symbol, str(period)))
+
+    def subscribe(self, callback):
+        """
+        Registers a callback fired on every new bar, from the thread that received it.
+
+        Parameters:
+        -----------
+        callback : callable
+            callback(symbol, period, date).
+        """
+        with self._condition:
+            self._callbacks.append(callback)
+
+    def wait_for_bar(self, symbol, period, version, timeout=None):
+        """
+        Waits until the version of a symbol and timeframe moves past the given one.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol.
+        period : str
+            The timeframe in minutes.
+        version : int or None
+            The version already seen.
+        timeout : float, optional
+            The most seconds to wait (default is None, no limit).
+
+        Returns:
+        --------
+        bool
+            True if a bar arrived, False on timeout.
+        """
+        key = (symbol, str(period))
+        with self._condition:
+            return self._condition.wait_for(lambda: self._versions.get(key) != version, timeout=timeout)
@@ -0,0 +1,106 @@
+import threading
+import time
+from datetime import datetime
+from files.SingleFlight import SingleFlight
+
+class CachedLoader:
+    """
+    Loads a page's data on first use and keeps it, so importing a page does no I/O.
+
+    The first get(), or a background warm(), runs the load function and caches what it
+    returns. Concurrent first views share one load. If the load fails, the last value that
+    loaded is served, or the default if none did, and the load is tried again after a
+    short delay. An unreachable workbook or API then shows up as a page without data
+    instead of keeping the server from starting.
+
+    Attributes:
+    -----------
+    name : str
+        The name used in error messages.
+    ttl : float or None
+        The seconds a loaded value is served before it is loaded again, None to keep it.
+    loaded_at : datetime or None
+        When the cached value was loaded.
+    error : Exception or None
+        The error of the last failed load, cleared by the next successful one.
+
+    Methods:
+    --------
+    get(self)
+        Returns the cached value, loading it if needed.
+
+    warm(self)
+        Loads the value in a background thread.
+
+    invalidate(self)
+        Makes the next get() load the value again.
+    """
+    def __init__(self, load, name=None, ttl=None, default=None, retry_seconds=30):
+        """
+        Initializes the CachedLoader. Nothing is loaded until get() or warm() is called.
+
+        Parameters:
+        -----------
+        load : callable
+            A function without arguments returning the value.
+        name : str, optional
+            The name used in error messages (default is the name of the function).
+        ttl : float, optional
+            The seconds a loaded value is served before it is loaded again (default is None, keep it).
+        default : object, optional
+            The value served when nothing could be loaded yet (default is None).
+        retry_seconds : float, optional
+            The seconds to wait before loading again after a failure (default is 30).
+        """
+        self.load = load
+        self.name = name or getattr(load, '__name__', 'data')
+        self.ttl = ttl
+        self.default = default
+        self.retry_seconds = retry_seconds
+        self.loaded_at = None
+        self.error = None
+        self._value = None
+        self._loaded = False
+        self._expires = 0
+        self._single_flight = SingleFlight()
+
+    def _is_fresh(self):
+        return time.monotonic() < self._expires
+
+    def _load(self):
+        # a concurrent caller may have loaded the value while this one waited
+        if self._is_fresh():
+            return
+        try:
+            value = self.load()
+        except Exception as e:
+            print(f"Unable to load {self.name}: {e}")
+            self.error = e
+            self._expires = time.monotonic() + self.retry_seconds
+            return
+        self._value = value
+        self._loaded = True
+        self.error = None
+        self.loaded_at = datetime.now()
+        self._expires = time.monotonic() + self.ttl if self.ttl is not None else float('inf')
+
+    def get(self):
+        """
+        Returns the cached value, loading it if it was never loaded or is older than the TTL.
+
+        Returns:
+        --------
+        object
+            The loaded value, the last one that loaded if the load failed, or the default.
+        """
+        if not self._is_fresh():
+            self._single_flight.do(None, self._load)
+        return self._value if self._loaded else self.default
+
+    def warm(self):
+        """Loads the value in a background thread, so the first view finds it ready."""
+        threading.Thread(target=self.get, name=f'warm-{self.name}', daemon=True).start()
+
+    def invalidate(self):
+        """Makes the next get() load the value again. The current value is served if that load fails."""
+        self._expires = 0
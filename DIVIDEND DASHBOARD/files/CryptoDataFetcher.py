@@ -1,10 +1,35 @@
+import os
 import requests
+from urllib.parse import urlsplit
 from datetime import datetime, timedelta
 import pandas as pd
+from files.BarStore import BarStore
+from files.HttpClient import HttpClient
+from files.AsyncFetcher import AsyncFetcher
+from files.TokenBucket import TokenBucket
+from files.SingleFlight import SingleFlight
 
 class CryptoDataFetcher:
-    def __init__(self):
+    # the candles of every symbol and period, shared by all fetchers
+    bar_store = BarStore()
+    # note VIP0 is 2000 requests per 30 seconds, shared by all fetchers
+    rate_limiter = TokenBucket(capacity=2000, period=30)
+    # concurrent fetches of the same symbol and period share one set of requests
+    single_flight = SingleFlight()
+    # the number of days of candles kept for the charts and forecasts
+    HISTORY_DAYS = 730
+    # KuCoin returns at most 1500 candles per request
+    MAX_CANDLES = 1500
+    BASE_URL = 'https://api.kucoin.com'
+    PERIOD_SECONDS = {'1min': 60, '3min': 180, '5min': 300, '15min': 900, '30min': 1800, '1hour': 3600, '2hour': 7200,
+                      '4hour': 14400, '6hour': 21600, '8hour': 28800, '12hour': 43200, '1day': 86400, '1week': 604800}
+
+    def __init__(self, base_url=None, max_workers=4):
         self.symbol = None
+        # the API can be pointed elsewhere, e.g. a local stand-in server
+        self.base_url = (base_url or os.environ.get('KUCOIN_BASE_URL', self.BASE_URL)).rstrip('/')
+        # the number of candle windows requested at the same time
+        self.max_workers = max_workers
 
     def set_symbol(self, symbol):
         self.symbol = symbol
@@ -15,22 +40,62 @@ class CryptoDataFetcher:
         # check if symbol is set
         if not self.symbol:
             raise ValueError("Symbol not set. Use set_symbol() to set a cryptocurrency symbol before fetching data.")
+        return CryptoDataFetcher.single_flight.do((self.base_url, self.symbol, period), self._fetch_data, period)
 
-        start_date = datetime.now() - timedelta(days=730)
+    def _fetch_data(self, period):
+        start_date = datetime.now() - timedelta(days=self.HISTORY_DAYS)
         end_date = datetime.now()
+        history_start = BarStore.period_start(self.HISTORY_DAYS)
+        bar_store = CryptoDataFetcher.bar_store
+
+        # only request the candles from the last stored one, which may still have been forming
+        is_update = bar_store.covers(self.symbol, period, history_start)
+        if is_update:
+            # the candle dates are naive UTC, which is what Timestamp.timestamp() assumes
+            start_date = bar_store.last_timestamp(self.symbol, period)
+
+        df = self.fetch_candles(period, start_date, end_date)
+        if df is None:
+            # serve the stored candles if the update fails
+            return bar_store.read(self.symbol, period, history_start) if is_update else None
+        bar_store.append(self.symbol, period, df, covered_from=None if is_update else history_start)
+        return bar_store.read(self.symbol, period, history_start) if is_update else df
 
-        url = f'https://api.kucoin.com/api/v1/market/candles?type={period}&symbol={self.symbol}&startAt={int(start_date.timestamp())}&endAt={int(end_date.timestamp())}'
+    def fetch_candles(self, period, start_date, end_date):
+        # split the range into windows of at most MAX_CANDLES candles, fetched concurrently
+        if period not in self.PERIOD_SECONDS:
+            raise ValueError(f"Unknown candle type '{period}', use one of {list(self.PERIOD_SECONDS)}")
+        start_at = int(start_date.timestamp())
+        end_at = int(end_date.timestamp())
+        step = self.PERIOD_SECONDS[period] * self.MAX_CANDLES
+        windows = [(window_start, min(window_start + step, end_at)) for window_start in range(start_at, end_at, step)]
+        if not windows:
+            windows = [(start_at, end_at)]
 
+        calls = [lambda window=window: self._fetch_window(period, *window) for window in windows]
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            df = pd.DataFrame(data['data'], columns=['Date', 'Open', 'Close', 'High', 'Low', 'Volume', 'Turnover'])
-            df['Date'] = pd.to_datetime(df['Date'], unit='s')
-            df.set_index('Date', inplace=True)
-            df = df.astype(float).sort_index(ascending=True)[['Open', 'High', 'Low', 'Close']]
-            return df
-        except requests.RequestException as e:
+            results = AsyncFetcher.shared().call_all(calls, host=urlsplit(self.base_url).netloc, limit=self.max_workers)
+            candles = [candle for window in results for candle in window]
+        except (requests.RequestException, KeyError, ValueError) as e:
             # Handle different types of exceptions appropriately here
             print(f"Error fetching data: {e}")
-            return None
\ No newline at end of file
+            return None
+
+        df = pd.DataFrame(candles, columns=['Date', 'Open', 'Close', 'High', 'Low', 'Volume', 'Turnover'])
+        df['Date'] = pd.to_datetime(df['Date'].astype('int64'), unit='s')
+        df.set_index('Date', inplace=True)
+        # the windows share their edge candles
+        df = df[~df.index.duplicated(keep='last')]
+        df = df.astype(float).sort_index(ascending=True)[['Open', 'High', 'Low', 'Close']]
+        return df
+
+    def _fetch_window(self, period, start_at, end_at):
+        # one request per window, within the shared request budget
+        self.rate_limiter.acquire()
+        params = {'type': period, 'symbol': self.symbol, 'startAt': start_at, 'endAt': end_at}
+        response = HttpClient.shared().get(f'{self.base_url}/api/v1/market/candles', params=params, timeout=10)
+        response.raise_for_status()
+        data = response.json()
+        if data.get('code') != '200000':
+            raise ValueError(f"KuCoin error {data.get('code')}: {data.get('msg')}")
+        return data['data']
@@ -1,7 +1,11 @@
+import numpy as np
 import pandas as pd
-from scipy.signal import savgol_filter
 
 class DataProcessor:
+    # the Prophet columns stacked into a forecast panel, in the order of the panel's last axis
+    FORECAST_COLUMNS = ['yhat', 'yhat_lower', 'yhat_upper', 'trend']
+    # the columns of a processed forecast, the first three are the smoothed forecast columns
+    PROCESSED_COLUMNS = ['predicted_price', 'lower_band', 'upper_band', 'trend']
     @staticmethod
     def prepare_data_for_prophet(data):
         """
@@ -28,8 +32,9 @@ class DataProcessor:
         """
         Processes the forecast DataFrame obtained from the Prophet model.
 
-        This method takes the forecast DataFrame, smoothens the prediction lines using a rolling mean,
-        and keeps only relevant columns for further analysis.
+        This method takes the forecast DataFrame, smoothens the prediction lines using a savgol filter,
+        and keeps only relevant columns for further analysis. It is the single symbol case of
+        process_prophet_forecasts().
 
         Parameters:
         forecast_df (DataFrame): The forecast DataFrame obtained from the Prophet model.
@@ -38,26 +43,105 @@ class DataProcessor:
         DataFrame: A DataFrame with smoothed predicted prices, upper and lower confidence bands, 
                    and the trend, indexed by date.
         """
-        # use savgol_filter
-        forecast_df['predicted_price'] = savgol_filter(forecast_df['yhat'], window_length=31, polyorder=2) 
-        forecast_df['upper_band'] = savgol_filter(forecast_df['yhat_upper'], window_length=31, polyorder=2)
-        forecast_df['lower_band'] = savgol_filter(forecast_df['yhat_lower'], window_length=31, polyorder=2)
+        return DataProcessor.process_prophet_forecasts({None: forecast_df})[None]
 
-        # keep only needed columns in the forecast dataframe
-        forecast_df = forecast_df[['ds', 'predicted_price', 'lower_band', 'upper_band', 'trend']] 
-        # rename the ds column to Date
-        forecast_df = forecast_df.rename(columns={'ds': 'Date'})
-        # set the Date column as the index
-        forecast_df = forecast_df.set_index('Date') 
-        return forecast_df
+    @staticmethod
+    def stack_forecasts(forecasts):
+        """
+        Stacks the Prophet forecasts of many symbols into NumPy panels.
+
+        Forecasts over the same dates, e.g. every equity on the NYSE calendar, share one panel
+        so they can be processed with single vectorized calls.
+
+        A date repeated in a forecast keeps its last row, so every panel row is one date.
+
+        Parameters:
+        forecasts (dict): The Prophet forecast DataFrame of each symbol.
+
+        Returns:
+        list: A (symbols, dates, panel) tuple per distinct set of dates. panel is a float array
+              shaped (symbols, dates, FORECAST_COLUMNS).
+        """
+        groups = {}
+        for symbol, forecast_df in forecasts.items():
+            if not forecast_df['ds'].is_unique:
+                forecast_df = forecast_df.drop_duplicates('ds', keep='last')
+            if not forecast_df['ds'].is_monotonic_increasing:
+                forecast_df = forecast_df.sort_values('ds')
+            dates = forecast_df['ds'].to_numpy(dtype='datetime64[ns]')
+            group = groups.setdefault(dates.tobytes(), {'dates': dates, 'symbols': [], 'values': []})
+            group['symbols'].append(symbol)
+            group['values'].append(forecast_df[DataProcessor.FORECAST_COLUMNS].to_numpy(dtype=float))
+        return [(group['symbols'], group['dates'], np.stack(group['values'])) for group in groups.values()]
+
+    @staticmethod
+    def smooth_panel(panel, window_length=31, polyorder=2):
+        """
+        Smooths the forecast columns of a panel with one savgol_filter call.
+
+        Parameters:
+        panel (ndarray): A panel from stack_forecasts(), shaped (symbols, dates, FORECAST_COLUMNS).
+        window_length (int): The savgol window, in bars.
+        polyorder (int): The savgol polynomial order.
+
+        Returns:
+        ndarray: A panel shaped (symbols, dates, PROCESSED_COLUMNS). The trend is not smoothed.
+        """
+        # imported on first use, SciPy is only needed once a forecast is processed
+        from scipy.signal import savgol_filter
+        smoothed = savgol_filter(panel[..., :3], window_length=window_length, polyorder=polyorder, axis=1)
+        return np.concatenate([smoothed, panel[..., 3:]], axis=-1)
+
+    @staticmethod
+    def process_prophet_forecasts(forecasts):
+        """
+        Processes the Prophet forecasts of many symbols at once.
+
+        The yhat and band columns of every symbol sharing the same dates are smoothed in a
+        single savgol_filter call over the panel. The returned DataFrames are views of the
+        smoothed panel, so no per-symbol copy is made.
+
+        Parameters:
+        forecasts (dict): The Prophet forecast DataFrame of each symbol.
+
+        Returns:
+        dict: The processed forecast of each symbol, with the PROCESSED_COLUMNS indexed by Date.
+        """
+        processed = {}
+        for symbols, dates, panel in DataProcessor.stack_forecasts(forecasts):
+            smoothed = DataProcessor.smooth_panel(panel)
+            index = pd.DatetimeIndex(dates, name='Date')
+            for i, symbol in enumerate(symbols):
+                processed[symbol] = pd.DataFrame(smoothed[i], index=index, columns=DataProcessor.PROCESSED_COLUMNS, copy=False)
+        return processed
+
+    @staticmethod
+    def unique_dates(data):
+        """
+        Returns the bars with one row per date, sorted by date.
+
+        A date can repeat when a forming bar was appended twice, e.g. by a delta download.
+        The last row of a repeated date is kept, it is the most recent one.
+
+        Parameters:
+        data (DataFrame): A DataFrame indexed by date.
+
+        Returns:
+        DataFrame: The DataFrame itself if its dates are unique and sorted, otherwise a copy
+                   without the repeated dates.
+        """
+        if not data.index.is_unique:
+            data = data[~data.index.duplicated(keep='last')]
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        return data
 
     @staticmethod
     def merge_dataframes_for_prophet(original_data, forecast_data):
         """
         Merges the original data DataFrame with the processed forecast DataFrame.
 
-        This method performs an outer join on the 'Date' column, allowing for the combination of 
-        the original data with the forecast data, facilitating comparison and analysis.
+        This is the single symbol case of merge_panel().
 
         Parameters:
         original_data (DataFrame): The original data DataFrame.
@@ -66,9 +150,54 @@ class DataProcessor:
         Returns:
         DataFrame: A merged DataFrame containing both the original and forecast data.
         """
-        merged_df = pd.merge(original_data, forecast_data, on='Date', how='outer')
-        return merged_df 
+        return DataProcessor.merge_panel({None: original_data}, {None: forecast_data})[None]
+
+    @staticmethod
+    def merge_panel(original_data, forecast_data):
+        """
+        Merges the bars of many symbols with their processed forecasts.
+
+        This is an outer join on the dates, done with index arithmetic. Symbols with the same
+        bar and forecast dates, e.g. every equity on the NYSE calendar, are written into one
+        (symbols, dates, columns) block: the positions of both date indexes on their sorted
+        union are found once with searchsorted. The returned DataFrames are views of the
+        block, so no per-symbol copy is made. Repeated dates keep their last row, see
+        unique_dates().
+
+        Parameters:
+        original_data (dict): The bars DataFrame of each symbol.
+        forecast_data (dict): The processed forecast of each symbol, e.g. from process_prophet_forecasts().
+
+        Returns:
+        dict: The merged DataFrame of each symbol found in both dicts.
+        """
+        groups = {}
+        for symbol in original_data:
+            if symbol not in forecast_data:
+                continue
+            history = DataProcessor.unique_dates(original_data[symbol])
+            forecast = DataProcessor.unique_dates(forecast_data[symbol])
+            history_dates = history.index.to_numpy(dtype='datetime64[ns]')
+            forecast_dates = forecast.index.to_numpy(dtype='datetime64[ns]')
+            key = (history_dates.tobytes(), forecast_dates.tobytes(), tuple(history.columns), tuple(forecast.columns))
+            group = groups.setdefault(key, {'history_dates': history_dates, 'forecast_dates': forecast_dates,
+                                            'columns': list(history.columns) + list(forecast.columns),
+                                            'symbols': [], 'history': [], 'forecast': []})
+            group['symbols'].append(symbol)
+            group['history'].append(history.to_numpy(dtype=float))
+            group['forecast'].append(forecast.to_numpy(dtype=float))
 
+        merged = {}
+        for group in groups.values():
+            dates = np.union1d(group['history_dates'], group['forecast_dates'])
+            n_history = group['history'][0].shape[1]
+            block = np.full((len(group['symbols']), len(dates), len(group['columns'])), np.nan)
+            block[:, np.searchsorted(dates, group['history_dates']), :n_history] = np.stack(group['history'])
+            block[:, np.searchsorted(dates, group['forecast_dates']), n_history:] = np.stack(group['forecast'])
+            index = pd.DatetimeIndex(dates, name='Date')
+            for i, symbol in enumerate(group['symbols']):
+                merged[symbol] = pd.DataFrame(block[i], index=index, columns=group['columns'], copy=False)
+        return merged
 
     # Future methods for other ML techniques can be added similarly
     # For example:
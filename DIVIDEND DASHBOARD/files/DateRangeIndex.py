@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+class DateRangeIndex:
+    """
+    Keeps a DataFrame sorted by one datetime column so date ranges can be sliced with a binary search.
+
+    Attributes:
+    -----------
+    date_column : str
+        The name of the datetime column the rows are sorted by.
+    version : object
+        An opaque value identifying the source data the index was built from.
+
+    Methods:
+    --------
+    slice(self, start_date=None, end_date=None)
+        Returns the rows whose date falls within the inclusive range.
+    """
+    def __init__(self, df, date_column, version=None):
+        """
+        Builds the index by sorting the rows once.
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            The rows to index.
+        date_column : str
+            The name of the column holding the dates. It is converted to datetime64 if needed.
+        version : object, optional
+            An opaque value identifying the source data, used by callers to detect a stale index.
+        """
+        df = df.copy()
+        df[date_column] = pd.to_datetime(df[date_column])
+        # a stable sort keeps rows with the same date in their original order
+        self._df = df.sort_values(by=date_column, kind='mergesort').reset_index(drop=True)
+        self._dates = self._df[date_column].to_numpy(dtype='datetime64[ns]')
+        self.date_column = date_column
+        self.version = version
+
+    def __len__(self):
+        return len(self._df)
+
+    @property
+    def frame(self):
+        """The indexed rows sorted by date."""
+        return self._df
+
+    def min_date(self):
+        """Returns the earliest date in the index, or None when it is empty."""
+        return self._df[self.date_column].iloc[0] if len(self) else None
+
+    def max_date(self):
+        """Returns the latest date in the index, or None when it is empty."""
+        return self._df[self.date_column].iloc[-1] if len(self) else None
+
+    def slice(self, start_date=None, end_date=None):
+        """
+        Returns the rows whose date falls within the inclusive range.
+
+        Both bounds are compared by calendar day, so an end date of '2024-01-31' keeps every
+        row dated on the 31st.
+
+        Parameters:
+        -----------
+        start_date : str, date or datetime, optional
+            The first day to include (default is the start of the index).
+        end_date : str, date or datetime, optional
+            The last day to include (default is the end of the index).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            A slice of the sorted rows. Callers must copy it before modifying it.
+        """
+        lower = 0
+        upper = len(self._dates)
+        if start_date:
+            start = np.datetime64(pd.Timestamp(start_date).normalize(), 'ns')
+            lower = np.searchsorted(self._dates, start, side='left')
+        if end_date:
+            end = np.datetime64(pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1), 'ns')
+            upper = np.searchsorted(self._dates, end, side='left')
+        return self._df.iloc[lower:max(lower, upper)]
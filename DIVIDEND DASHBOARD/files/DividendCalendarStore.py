@@ -0,0 +1,215 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import date, timedelta
+import pandas as pd
+
+class DividendCalendarStore:
+    """
+    A local SQLite calendar of cash dividends indexed by ex-dividend date.
+
+    A rolling window around today is bulk synced from Polygon, every page included, and
+    refreshed once it is older than the TTL. Date picks, the monthly chart and the
+    screener then read the calendar locally. A date outside the window is synced on its
+    own the first time it is asked for. If Polygon cannot be reached the stored rows are
+    served as they are.
+
+    Attributes:
+    -----------
+    db_path : str
+        Path to the SQLite database file.
+    fetcher : DividendDataFetcher
+        The fetcher used to sync the calendar.
+    ttl : int
+        The number of seconds a synced range stays fresh.
+
+    Methods:
+    --------
+    sync(self, start_date=None, end_date=None)
+        Syncs the range, or the rolling window, if it is not fresh.
+
+    refresh(self, start_date, end_date)
+        Replaces the range with the dividends fetched from Polygon.
+
+    get_dividends(self, start_date, end_date=None)
+        Returns the dividends with an ex-dividend date in the range.
+
+    count_by_ex_date(self, start_date, end_date)
+        Returns the number of dividends per ex-dividend date.
+    """
+    # serializes syncs so two callbacks never fetch the same range at the same time
+    _lock = threading.Lock()
+
+    COLUMNS = ['id', 'ticker', 'cash_amount', 'currency', 'declaration_date', 'dividend_type',
+               'ex_dividend_date', 'frequency', 'pay_date', 'record_date']
+
+    def __init__(self, fetcher, db_path='data/dividend_calendar.db', ttl=6 * 3600, days_back=7, days_ahead=62):
+        """
+        Initializes the DividendCalendarStore.
+
+        Parameters:
+        -----------
+        fetcher : DividendDataFetcher
+            The fetcher used to sync the calendar.
+        db_path : str, optional
+            Path to the SQLite database file (default is 'data/dividend_calendar.db').
+        ttl : int, optional
+            The number of seconds a synced range stays fresh (default is 6 hours).
+        days_back : int, optional
+            The number of days before today in the rolling window (default is 7).
+        days_ahead : int, optional
+            The number of days after today in the rolling window (default is 62, which
+            covers the rest of this month and all of next month).
+        """
+        self.fetcher = fetcher
+        self.db_path = db_path
+        self.ttl = ttl
+        self.days_back = days_back
+        self.days_ahead = days_ahead
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        conn.execute('''CREATE TABLE IF NOT EXISTS dividends (
+                            id TEXT PRIMARY KEY, ticker TEXT, cash_amount REAL, currency TEXT,
+                            declaration_date TEXT, dividend_type TEXT, ex_dividend_date TEXT,
+                            frequency INTEGER, pay_date TEXT, record_date TEXT)''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_dividends_exdividenddate ON dividends (ex_dividend_date)')
+        return closing(conn)
+
+    def _synced_ranges(self, conn):
+        # the ranges synced so far as [start, end, synced_at] with ISO dates
+        row = conn.execute("SELECT value FROM meta WHERE key = 'synced_ranges'").fetchone()
+        return json.loads(row[0]) if row else []
+
+    def _is_fresh(self, conn, start, end):
+        now = time.time()
+        return any(synced_start <= start and end <= synced_end and now - synced_at < self.ttl
+                   for synced_start, synced_end, synced_at in self._synced_ranges(conn))
+
+    def _window(self):
+        today = date.today()
+        return today - timedelta(days=self.days_back), today + timedelta(days=self.days_ahead)
+
+    def sync(self, start_date=None, end_date=None):
+        """
+        Syncs the range if it was not synced within the TTL.
+
+        A range inside the rolling window refreshes the whole window, so the usual date
+        picks and the monthly chart share a single bulk sync.
+
+        Parameters:
+        -----------
+        start_date : datetime.date, optional
+            The first ex-dividend date needed (default is the start of the rolling window).
+        end_date : datetime.date, optional
+            The last ex-dividend date needed (default is the end of the rolling window).
+
+        Returns:
+        --------
+        bool
+            True if the range was fetched, False if the stored rows were fresh or the fetch failed.
+        """
+        window_start, window_end = self._window()
+        start_date = start_date or window_start
+        end_date = end_date or window_end
+        if window_start <= start_date and end_date <= window_end:
+            start_date, end_date = window_start, window_end
+        start, end = start_date.isoformat(), end_date.isoformat()
+        with self._connect() as conn:
+            if self._is_fresh(conn, start, end):
+                return False
+        with DividendCalendarStore._lock:
+            with self._connect() as conn:
+                # another thread may have synced the range while we waited for the lock
+                if self._is_fresh(conn, start, end):
+                    return False
+            try:
+                self.refresh(start_date, end_date)
+            except Exception as e:
+                print(f"Unable to sync the dividend calendar, using the stored dividends: {e}")
+                return False
+            return True
+
+    def refresh(self, start_date, end_date):
+        """
+        Replaces the dividends of the range with the ones fetched from Polygon.
+
+        Parameters:
+        -----------
+        start_date : datetime.date
+            The first ex-dividend date, included.
+        end_date : datetime.date
+            The last ex-dividend date, included.
+        """
+        dividends = self.fetcher.fetch_range(start_date, end_date)
+        dividends = dividends.reindex(columns=self.COLUMNS)
+        if dividends['id'].isna().any():
+            # rows without a Polygon id still need a stable primary key
+            fallback_id = dividends['ticker'].astype(str) + ':' + dividends['ex_dividend_date'].astype(str)
+            dividends['id'] = dividends['id'].fillna(fallback_id)
+        rows = dividends.astype(object).where(dividends.notna(), None).itertuples(index=False, name=None)
+        start, end = start_date.isoformat(), end_date.isoformat()
+
+        with self._connect() as conn:
+            with conn:
+                conn.execute('DELETE FROM dividends WHERE ex_dividend_date BETWEEN ? AND ?', (start, end))
+                conn.executemany(f'INSERT OR REPLACE INTO dividends ({", ".join(self.COLUMNS)}) '
+                                 f'VALUES ({", ".join("?" for _ in self.COLUMNS)})', rows)
+                # keep the ranges still fresh next to the new one
+                now = time.time()
+                ranges = [r for r in self._synced_ranges(conn) if now - r[2] < self.ttl]
+                ranges.append([start, end, now])
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('synced_ranges', ?)", (json.dumps(ranges),))
+
+    def get_dividends(self, start_date, end_date=None):
+        """
+        Returns the dividends with an ex-dividend date in the range, syncing it if needed.
+
+        Parameters:
+        -----------
+        start_date : datetime.date
+            The first ex-dividend date, included.
+        end_date : datetime.date, optional
+            The last ex-dividend date, included (default is start_date).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The dividends sorted by ex-dividend date, with the Polygon columns.
+        """
+        end_date = end_date or start_date
+        self.sync(start_date, end_date)
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                f'SELECT {", ".join(self.COLUMNS)} FROM dividends WHERE ex_dividend_date BETWEEN ? AND ? '
+                'ORDER BY ex_dividend_date, ticker',
+                conn, params=(start_date.isoformat(), end_date.isoformat()))
+
+    def count_by_ex_date(self, start_date, end_date):
+        """
+        Returns the number of dividends per ex-dividend date, syncing the range if needed.
+
+        Parameters:
+        -----------
+        start_date : datetime.date
+            The first ex-dividend date, included.
+        end_date : datetime.date
+            The last ex-dividend date, included.
+
+        Returns:
+        --------
+        pandas.Series
+            The number of dividends indexed by ex_dividend_date.
+        """
+        self.sync(start_date, end_date)
+        with self._connect() as conn:
+            counts = pd.read_sql_query(
+                'SELECT ex_dividend_date, COUNT(*) AS count FROM dividends '
+                'WHERE ex_dividend_date BETWEEN ? AND ? GROUP BY ex_dividend_date ORDER BY ex_dividend_date',
+                conn, params=(start_date.isoformat(), end_date.isoformat()))
+        return counts.set_index('ex_dividend_date')['count']
@@ -0,0 +1,80 @@
+import pandas as pd
+from files.HttpClient import HttpClient
+
+class DividendDataFetcher:
+    """
+    A class for fetching cash dividends by ex-dividend date from the Polygon API.
+
+    Polygon returns at most 1000 dividends per response and a next_url for the rest, which
+    is followed until every page of the range is fetched.
+
+    Attributes:
+    -----------
+    api_key : str
+        The Polygon API key.
+
+    Methods:
+    --------
+    fetch_range(self, start_date, end_date, dividend_type='CD')
+        Fetches every dividend with an ex-dividend date in the range.
+    """
+    BASE_URL = 'https://api.polygon.io/v3/reference/dividends'
+    PAGE_LIMIT = 1000
+
+    def __init__(self, api_key, http_client=None):
+        """
+        Initializes the DividendDataFetcher.
+
+        Parameters:
+        -----------
+        api_key : str
+            The Polygon API key.
+        http_client : HttpClient, optional
+            The client sending the requests (default is HttpClient.shared()).
+        """
+        self.api_key = api_key
+        self.http_client = http_client or HttpClient.shared()
+
+    def fetch_range(self, start_date, end_date, dividend_type='CD'):
+        """
+        Fetches every dividend with an ex-dividend date in the range, following next_url.
+
+        Parameters:
+        -----------
+        start_date : datetime.date
+            The first ex-dividend date, included.
+        end_date : datetime.date
+            The last ex-dividend date, included.
+        dividend_type : str, optional
+            The Polygon dividend type (default is 'CD', cash dividends).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per dividend with the columns returned by Polygon.
+
+        Raises:
+        -------
+        requests.RequestException
+            If a page cannot be fetched.
+        """
+        url = self.BASE_URL
+        params = {
+            'ex_dividend_date.gte': start_date.strftime('%Y-%m-%d'),
+            'ex_dividend_date.lte': end_date.strftime('%Y-%m-%d'),
+            'dividend_type': dividend_type,
+            'order': 'asc',
+            'sort': 'ex_dividend_date',
+            'limit': self.PAGE_LIMIT,
+            'apiKey': self.api_key,
+        }
+        results = []
+        while url:
+            response = self.http_client.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            results.extend(data.get('results') or [])
+            url = data.get('next_url')
+            # next_url carries the query and cursor, only the key has to be added again
+            params = {'apiKey': self.api_key}
+        return pd.DataFrame(results)
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+import pandas as pd
+from files.SingleFlight import SingleFlight
+
+class ForecastCache:
+    """
+    An LRU cache of processed forecasts with an optional on-disk tier.
+
+    Entries are keyed by the symbol, the forecast frequency and period, any model
+    parameters and a fingerprint of the input bars, so a forecast is only recomputed
+    when a new bar arrives or the settings change.
+
+    Attributes:
+    -----------
+    max_entries : int
+        The number of forecasts kept in memory.
+    cache_dir : str or None
+        The directory of the on-disk tier, or None to keep forecasts in memory only.
+
+    Methods:
+    --------
+    make_key(symbol, freq, period, data, **params)
+        Builds the cache key for a forecast of the given bars.
+
+    get(self, key)
+        Returns the cached forecast or None.
+
+    set(self, key, value)
+        Stores a forecast in memory and on disk.
+
+    get_or_compute(self, key, compute)
+        Returns the cached forecast, computing and storing it on a miss. Concurrent misses
+        of the same key share one computation.
+    """
+    def __init__(self, max_entries=64, cache_dir=None, max_disk_entries=512):
+        """
+        Initializes an empty ForecastCache.
+
+        Parameters:
+        -----------
+        max_entries : int, optional
+            The number of forecasts kept in memory (default is 64).
+        cache_dir : str, optional
+            The directory of the on-disk tier (default is None, memory only).
+        max_disk_entries : int, optional
+            The number of forecasts kept on disk before the oldest are removed (default is 512).
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight()
+
+    @staticmethod
+    def make_key(symbol, freq, period, data, **params):
+        """
+        Builds the cache key for a forecast of the given bars.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol being forecast.
+        freq : str
+            The forecast frequency, e.g. 'D' or 'H'.
+        period : int
+            The number of periods forecast forward.
+        data : pandas.DataFrame
+            The input bars. Their last timestamp and a hash of their values are part of the key.
+        **params
+            Any other model parameters that change the forecast.
+
+        Returns:
+        --------
+        tuple
+            A hashable key.
+        """
+        fingerprint = hashlib.sha1(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes()).hexdigest()
+        last_timestamp = ''
+        if len(data):
+            last_timestamp = str(data['ds'].iloc[-1]) if 'ds' in data.columns else str(data.index[-1])
+        return (symbol, freq, period, last_timestamp, len(data), fingerprint, tuple(sorted(params.items())))
+
+    def _disk_path(self, key):
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{name}.pickle')
+
+    def get(self, key):
+        """
+        Returns the cached forecast for a key, or None on a miss.
+
+        Parameters:
+        -----------
+        key : tuple
+            A key built with make_key().
+
+        Returns:
+        --------
+        pandas.DataFrame or None
+            The cached forecast. It is shared, treat it as read-only.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            if os.path.exists(path):
+                try:
+                    with open(path, 'rb') as file:
+                        value = pickle.load(file)
+                except (OSError, pickle.UnpicklingError, EOFError) as e:
+                    print(f"Ignoring cached forecast {path}: {e}")
+                else:
+                    self._remember(key, value)
+                    with self._lock:
+                        self.hits += 1
+                    return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set(self, key, value):
+        """
+        Stores a forecast in memory and, if enabled, on disk.
+
+        Parameters:
+        -----------
+        key : tuple
+            A key built with make_key().
+        value : pandas.DataFrame
+            The forecast to cache.
+        """
+        self._remember(key, value)
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self._disk_path(key) + '.tmp'
+            with open(tmp_path, 'wb') as file:
+                pickle.dump(value, file)
+            os.replace(tmp_path, self._disk_path(key))
+            self._prune_disk()
+        except OSError as e:
+            print(f"Unable to write cached forecast: {e}")
+
+    def _prune_disk(self):
+        paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.pickle')]
+        if len(paths) <= self.max_disk_entries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            os.remove(path)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached forecast, computing and storing it on a miss. Callers missing the
+        same key at the same time wait for a single computation instead of fitting in parallel.
+
+        Parameters:
+        -----------
+        key : tuple
+            A key built with make_key().
+        compute : callable
+            A function without arguments returning the forecast.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The cached or freshly computed forecast.
+        """
+        value = self.get(key)
+        if value is None:
+            value = self._single_flight.do(key, self._compute, key, compute)
+        return value
+
+    def _compute(self, key, compute):
+        # a computation of the key may have finished between the miss and the flight
+        with self._lock:
+            value = self._entries.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
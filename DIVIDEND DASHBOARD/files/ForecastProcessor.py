@@ -1,8 +1,60 @@
-from prophet import Prophet
+import numpy as np
+import pandas as pd
+from files.BandEngine import BandEngine
+from files.ProphetModelStore import ProphetModelStore
+from files.TradingCalendar import TradingCalendar
 
 class ForecastProcessor:
+    # the last fitted model per symbol and frequency, used to warm-start the next fit
+    model_store = ProphetModelStore()
+    # forecast backends by name, every backend takes (data, period, freq) and returns Prophet's columns
+    BACKENDS = {'prophet': 'prophet_forecast', 'bands': 'band_forecast'}
+    # Prophet fidelity tiers, from the cheapest to the default settings. 'prophet' holds the
+    # Prophet() arguments, 'history' the number of bars fitted and 'predict_history' the
+    # number of fitted bars predicted along with the future (None keeps all of them).
+    # Run benchmark_tiers.py to see how far each tier's bands move from 'full'.
+    TIERS = {
+        'screen': {
+            'prophet': {'uncertainty_samples': 100, 'yearly_seasonality': False, 'daily_seasonality': False},
+            'history': 365,
+            'predict_history': 30,
+        },
+        'interactive': {
+            'prophet': {'uncertainty_samples': 300, 'daily_seasonality': False},
+            'history': None,
+            'predict_history': None,
+        },
+        'full': {
+            'prophet': {},
+            'history': None,
+            'predict_history': None,
+        },
+    }
+
+    @staticmethod
+    def forecast(data, period=90, freq='D', backend='prophet', **kwargs):
+        """
+        Generates a forecast with the named backend.
+
+        Args:
+            data (DataFrame): A Pandas DataFrame with the 'ds' and 'y' columns.
+            period (int): The number of periods to forecast forward.
+            freq (str): The frequency of the forecast, see prophet_forecast().
+            backend (str): 'prophet' for a full Prophet fit or 'bands' for the fast rolling
+                           regression bands of BandEngine.
+            **kwargs: Arguments passed to the backend.
+
+        Returns:
+            DataFrame: The forecast with at least the 'ds', 'yhat', 'yhat_lower', 'yhat_upper'
+                       and 'trend' columns.
+        """
+        if backend not in ForecastProcessor.BACKENDS:
+            raise ValueError(f"Unknown forecast backend '{backend}', use one of {list(ForecastProcessor.BACKENDS)}")
+        method = getattr(ForecastProcessor, ForecastProcessor.BACKENDS[backend])
+        return method(data, period=period, freq=freq, **kwargs)
+
     @staticmethod
-    def prophet_forecast(data, period=90, freq='D'):
+    def prophet_forecast(data, period=90, freq='D', model_key=None, tier='full', asset_class=None):
         """
         Generates a forecast using the Prophet model from the provided time series data.
 
@@ -16,13 +68,107 @@ class ForecastProcessor:
                         - 'W' generates weekly data points, defaulting to Sunday as the week start.
                           Use 'W-MON', 'W-TUE', 'W-WED', etc., for weeks starting on other days.
                           This flexibility aligns future data points with specific weekly cycles.
+            model_key (str): An optional name for the series, usually the symbol. When given, the
+                             fit is initialized from the previous fit of the same symbol, frequency
+                             and tier and the fitted model is persisted for the next one.
+            tier (str): The fidelity tier, one of ForecastProcessor.TIERS. 'screen' is the
+                        cheapest and only predicts the last bars, 'full' uses Prophet's defaults.
+            asset_class (str): 'equity', 'fx' or 'crypto'. When given, the future only holds
+                               the sessions the asset class trades (see TradingCalendar) and
+                               period counts sessions. When None, every calendar period is used.
 
         Returns:
             DataFrame: A Pandas DataFrame containing the forecast. Includes the forecasted
                        values along with components like trend and uncertainty intervals.
         """
-        model = Prophet()
-        model.fit(data)
-        future = model.make_future_dataframe(periods=period, freq=freq)
+        if tier not in ForecastProcessor.TIERS:
+            raise ValueError(f"Unknown forecast tier '{tier}', use one of {list(ForecastProcessor.TIERS)}")
+        settings = ForecastProcessor.TIERS[tier]
+        if settings['history']:
+            data = data.tail(settings['history'])
+        key = (model_key, freq, tier) if model_key else None
+        model = ForecastProcessor.fit_prophet(data, key=key, **settings['prophet'])
+        if asset_class:
+            future = TradingCalendar.future_dataframe(model.history_dates, period, freq, asset_class)
+        else:
+            future = model.make_future_dataframe(periods=period, freq=freq)
+        if settings['predict_history'] is not None:
+            future = future.tail(settings['predict_history'] + period)
         forecast = model.predict(future)
         return forecast
+
+    @staticmethod
+    def fit_prophet(data, key=None, **prophet_kwargs):
+        """
+        Fits a Prophet model, warm-starting it from the stored model for the key.
+
+        Consecutive fits of a symbol differ by a bar or two, so starting the optimizer from
+        the previous parameters converges much faster than a cold fit. If the stored model
+        is incompatible (e.g. the seasonalities changed) the model is fitted cold.
+
+        Args:
+            data (DataFrame): The 'ds' and 'y' columns to fit.
+            key (tuple): The model store key, or None to fit cold without storing the model.
+            **prophet_kwargs: Arguments passed to Prophet().
+
+        Returns:
+            Prophet: The fitted model.
+        """
+        # imported on first use, Prophet and cmdstanpy take seconds to import
+        from prophet import Prophet
+        previous = ForecastProcessor.model_store.load(key) if key else None
+        model = Prophet(**prophet_kwargs)
+        if previous is not None:
+            try:
+                model.fit(data, init=ProphetModelStore.warm_start_params(previous))
+            except Exception as e:
+                print(f"Warm start failed for {key}, fitting cold: {e}")
+                model = Prophet(**prophet_kwargs)
+                model.fit(data)
+        else:
+            model.fit(data)
+        if key:
+            ForecastProcessor.model_store.save(key, model)
+        return model
+
+    @staticmethod
+    def band_forecast(data, period=90, freq='D', window=60, interval_width=0.8, asset_class=None):
+        """
+        Generates trend and bands with the rolling regression of BandEngine.
+
+        The result has the same columns as prophet_forecast() so it can be processed and
+        charted the same way. The history is the rolling fit; the future extends the last
+        trend along its slope and keeps the last band offsets.
+
+        Args:
+            data (DataFrame): A Pandas DataFrame with the 'ds' and 'y' columns.
+            period (int): The number of periods to forecast forward.
+            freq (str): The frequency of the future dates.
+            window (int): The number of bars in each regression.
+            interval_width (float): The width of the bands, 0.8 like Prophet's default.
+            asset_class (str): 'equity', 'fx' or 'crypto' to only forecast trading sessions,
+                               or None for every calendar period.
+
+        Returns:
+            DataFrame: The 'ds', 'yhat', 'yhat_lower', 'yhat_upper' and 'trend' columns.
+        """
+        bands = BandEngine.rolling_bands(data['y'].to_numpy(dtype=float), window, interval_width)
+        trend = bands['trend'][0]
+        lower_band = bands['lower_band'][0]
+        upper_band = bands['upper_band'][0]
+        ds = pd.to_datetime(data['ds']).reset_index(drop=True)
+
+        if period > 0 and not np.isnan(trend[-1]):
+            if asset_class:
+                future_ds = TradingCalendar.future_dates(ds.iloc[-1], period, freq, asset_class)
+            else:
+                future_ds = pd.date_range(ds.iloc[-1], periods=period + 1, freq=freq)[1:]
+            growth = np.exp(bands['slope'][0][-1] * np.arange(1, period + 1))
+            future_trend = trend[-1] * growth
+            ds = pd.concat([ds, pd.Series(future_ds)], ignore_index=True)
+            trend = np.concatenate([trend, future_trend])
+            lower_band = np.concatenate([lower_band, lower_band[-1] * growth])
+            upper_band = np.concatenate([upper_band, upper_band[-1] * growth])
+
+        return pd.DataFrame({'ds': ds, 'yhat': trend, 'yhat_lower': lower_band,
+                             'yhat_upper': upper_band, 'trend': trend})
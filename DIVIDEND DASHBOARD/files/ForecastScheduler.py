@@ -0,0 +1,216 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class ForecastScheduler:
+    """
+    Precomputes forecasts in the background whenever a new bar is due.
+
+    Every registered (symbol, timeframe) pair has a bar version, e.g. the date of the last
+    completed trading session or the start of the current candle. A background thread
+    checks the versions periodically and recomputes a forecast on a bounded thread pool
+    whenever its version changed, so a chart only has to read the ready result.
+
+    Attributes:
+    -----------
+    max_workers : int
+        The number of forecasts computed at the same time.
+    poll_seconds : int
+        How often the bar versions are checked.
+    settle_seconds : float
+        How long a requested check waits for more requests, so a burst is checked once.
+
+    Methods:
+    --------
+    add(self, symbol, timeframe)
+        Registers a symbol and timeframe to keep warm.
+
+    start(self)
+        Starts the background thread.
+
+    stop(self)
+        Stops the background thread and the pool.
+
+    tick(self)
+        Submits every pair whose bar version changed since its last forecast.
+
+    request_tick(self)
+        Asks the background thread to check the bar versions before the next poll.
+
+    get_ready(self, symbol, timeframe, version)
+        Returns the precomputed result for a bar version, or None.
+
+    set_ready(self, symbol, timeframe, version, result)
+        Stores a result computed outside the scheduler.
+    """
+    def __init__(self, compute, bar_version, max_workers=2, poll_seconds=60, settle_seconds=1.0):
+        """
+        Initializes the ForecastScheduler.
+
+        Parameters:
+        -----------
+        compute : callable
+            compute(symbol, timeframe) returns the forecast result to keep.
+        bar_version : callable
+            bar_version(symbol, timeframe) returns a hashable value that changes when a
+            new bar is available, or None if it cannot be determined.
+        max_workers : int, optional
+            The number of forecasts computed at the same time (default is 2).
+        poll_seconds : int, optional
+            How often the bar versions are checked (default is 60).
+        settle_seconds : float, optional
+            How long a requested check waits for more requests (default is 1.0).
+        """
+        self.compute = compute
+        self.bar_version = bar_version
+        self.max_workers = max_workers
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self._jobs = []
+        self._ready = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._tick_event = threading.Event()
+        self._thread = None
+        self._executor = None
+
+    def add(self, symbol, timeframe):
+        """
+        Registers a symbol and timeframe to keep warm.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol to forecast.
+        timeframe : str
+            The timeframe passed to compute() and bar_version().
+        """
+        with self._lock:
+            if (symbol, timeframe) not in self._jobs:
+                self._jobs.append((symbol, timeframe))
+
+    def start(self):
+        """Starts the background thread, if it is not running yet."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='forecast-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the background thread and waits for the running forecasts."""
+        self._stop_event.set()
+        self._tick_event.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='forecast-warmup')
+        return self._executor
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Forecast scheduler error: {e}")
+            # a requested check wakes the loop early, the requests of a burst are checked once
+            if self._tick_event.wait(self.poll_seconds):
+                self._stop_event.wait(self.settle_seconds)
+            self._tick_event.clear()
+
+    def request_tick(self):
+        """
+        Asks the background thread to check the bar versions before the next poll. Returns
+        at once, so it can be called from the thread that received a new bar.
+        """
+        self._tick_event.set()
+
+    def tick(self):
+        """
+        Submits every pair whose bar version changed since its last forecast.
+
+        Returns:
+        --------
+        int
+            The number of forecasts submitted.
+        """
+        with self._lock:
+            jobs = list(self._jobs)
+        submitted = 0
+        for symbol, timeframe in jobs:
+            key = (symbol, timeframe)
+            try:
+                version = self.bar_version(symbol, timeframe)
+            except Exception as e:
+                print(f"Unable to get the bar version of {symbol} {timeframe}: {e}")
+                continue
+            if version is None:
+                continue
+            with self._lock:
+                ready = self._ready.get(key)
+                if key in self._pending or (ready is not None and ready[0] == version):
+                    continue
+                self._pending.add(key)
+            self._get_executor().submit(self._warm, symbol, timeframe, version)
+            submitted += 1
+        return submitted
+
+    def _warm(self, symbol, timeframe, version):
+        try:
+            result = self.compute(symbol, timeframe)
+        except Exception as e:
+            print(f"Unable to precompute the forecast of {symbol} {timeframe}: {e}")
+            return
+        finally:
+            with self._lock:
+                self._pending.discard((symbol, timeframe))
+        self.set_ready(symbol, timeframe, version, result)
+
+    def get_ready(self, symbol, timeframe, version):
+        """
+        Returns the precomputed result for a bar version.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol of the forecast.
+        timeframe : str
+            The timeframe of the forecast.
+        version : object
+            The current bar version. None never matches.
+
+        Returns:
+        --------
+        object or None
+            The result computed for this bar version, or None if it is not ready.
+        """
+        if version is None:
+            return None
+        with self._lock:
+            ready = self._ready.get((symbol, timeframe))
+        if ready is not None and ready[0] == version:
+            return ready[1]
+        return None
+
+    def set_ready(self, symbol, timeframe, version, result):
+        """
+        Stores a result, e.g. one computed by a chart before the scheduler got to it.
+
+        Parameters:
+        -----------
+        symbol : str
+            The symbol of the forecast.
+        timeframe : str
+            The timeframe of the forecast.
+        version : object
+            The bar version the result was computed for.
+        result : object
+            The forecast result.
+        """
+        if version is None:
+            return
+        with self._lock:
+            self._ready[(symbol, timeframe)] = (version, result)
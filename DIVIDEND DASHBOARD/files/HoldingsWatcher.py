@@ -0,0 +1,110 @@
+import threading
+import pandas as pd
+
+class HoldingsWatcher:
+    """
+    Detects edits to the holdings by polling the workbook signature and diffing by ticker.
+
+    Polling only costs an os.stat() while the workbook is unchanged. When it changes the
+    holdings are reloaded and compared with the last snapshot, and the version is bumped
+    only if a row was actually inserted, updated or deleted.
+
+    Attributes:
+    -----------
+    version : int
+        Incremented every time the holdings change.
+    holdings : pandas.DataFrame
+        The latest snapshot of the holdings.
+    last_changes : dict
+        The tickers inserted, updated and deleted by the latest change.
+
+    Methods:
+    --------
+    poll(self)
+        Checks the workbook and returns the changes if the holdings changed, otherwise None.
+    """
+    def __init__(self, workbook_loader, load_holdings, key='Ticker'):
+        """
+        Initializes the HoldingsWatcher and takes the first snapshot.
+
+        Parameters:
+        -----------
+        workbook_loader : WorkbookLoader
+            The loader whose signature is polled for changes.
+        load_holdings : callable
+            A function returning the holdings DataFrame.
+        key : str, optional
+            The column identifying a holding (default is 'Ticker').
+        """
+        self.workbook_loader = workbook_loader
+        self.load_holdings = load_holdings
+        self.key = key
+        self.version = 0
+        self.last_changes = {'inserted': [], 'updated': [], 'deleted': []}
+        self._lock = threading.Lock()
+        self._signature = workbook_loader.signature()
+        self.holdings = load_holdings()
+
+    def _keyed(self, df):
+        # a ticker can be held in more than one lot, number repeated tickers to keep keys unique
+        keyed = df.copy()
+        keyed.index = pd.MultiIndex.from_arrays([df[self.key], df.groupby(self.key).cumcount()])
+        return keyed
+
+    def diff(self, old, new):
+        """
+        Compares two snapshots of the holdings by ticker.
+
+        Parameters:
+        -----------
+        old : pandas.DataFrame
+            The previous snapshot.
+        new : pandas.DataFrame
+            The new snapshot.
+
+        Returns:
+        --------
+        dict
+            The lists of tickers that were inserted, updated and deleted.
+        """
+        old, new = self._keyed(old), self._keyed(new)
+        inserted = new.index.difference(old.index)
+        deleted = old.index.difference(new.index)
+        common = new.index.intersection(old.index)
+        columns = new.columns.intersection(old.columns)
+        before, after = old.loc[common, columns], new.loc[common, columns]
+        changed = ((before != after) & ~(before.isna() & after.isna())).any(axis=1)
+        # a column added or removed in the sheet changes every row
+        if len(columns) != len(new.columns) or len(columns) != len(old.columns):
+            changed[:] = True
+        return {
+            'inserted': [ticker for ticker, _ in inserted],
+            'updated': [ticker for ticker, _ in common[changed.to_numpy()]],
+            'deleted': [ticker for ticker, _ in deleted],
+        }
+
+    def poll(self):
+        """
+        Checks the workbook and returns the changes if the holdings changed.
+
+        Returns:
+        --------
+        dict or None
+            The tickers inserted, updated and deleted, or None if nothing changed.
+        """
+        signature = self.workbook_loader.signature()
+        if signature == self._signature:
+            return None
+        with self._lock:
+            if signature == self._signature:
+                return None
+            holdings = self.load_holdings()
+            self._signature = signature
+            changes = self.diff(self.holdings, holdings)
+            if not any(changes.values()):
+                # the workbook was saved but the holdings are the same
+                return None
+            self.holdings = holdings
+            self.last_changes = changes
+            self.version += 1
+            return changes
@@ -0,0 +1,247 @@
+import random
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+
+class HttpClient:
+    """
+    A shared HTTP client with keep-alive connection pools, deadlines and retries.
+
+    Every host gets its own requests.Session, so the TCP and TLS handshakes are paid once
+    per pooled connection instead of once per call. Each call has a timeout and an overall
+    deadline, and 429 and 5xx responses are retried with jittered exponential backoff.
+    Latency, retry and pool statistics are kept per host.
+
+    Attributes:
+    -----------
+    timeout : tuple
+        The default (connect, read) timeout of each attempt, in seconds.
+    retries : int
+        The default number of retries after the first attempt.
+
+    Methods:
+    --------
+    shared()
+        Returns the client shared by the whole app.
+
+    request(self, method, url, timeout=None, retries=None, deadline=None, **kwargs)
+        Sends a request, retrying 429, 5xx and connection errors.
+
+    get(self, url, **kwargs)
+        Sends a GET request.
+
+    post(self, url, **kwargs)
+        Sends a POST request.
+
+    stats(self)
+        Returns the latency, retry and pool statistics of each host.
+    """
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    # methods that are safe to send twice; the others are only retried when the server
+    # did not process them (429 or a failed connect)
+    IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+    # the number of latencies kept per host for the statistics
+    LATENCY_SAMPLES = 500
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, timeout=(3.05, 15), retries=3, backoff=0.5, max_backoff=8, pool_maxsize=10):
+        """
+        Initializes the HttpClient. Sessions are created on the first call to each host.
+
+        Parameters:
+        -----------
+        timeout : float or tuple, optional
+            The (connect, read) timeout of each attempt, in seconds (default is (3.05, 15)).
+        retries : int, optional
+            The number of retries after the first attempt (default is 3).
+        backoff : float, optional
+            The base of the exponential backoff, in seconds (default is 0.5).
+        max_backoff : float, optional
+            The longest wait between two attempts, in seconds (default is 8).
+        pool_maxsize : int, optional
+            The number of keep-alive connections kept per host (default is 10).
+        """
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """
+        Returns the client shared by the whole app, creating it on the first call.
+
+        Returns:
+        --------
+        HttpClient
+            The shared client.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def _session(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # retries are handled in request() so they can be jittered and counted
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=0)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._sessions[host] = session
+                self._stats[host] = {'requests': 0, 'errors': 0, 'retries': 0,
+                                     'latencies': deque(maxlen=self.LATENCY_SAMPLES)}
+            return session
+
+    def _record(self, host, latency=None, error=False, retry=False):
+        with self._lock:
+            stats = self._stats[host]
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['retries'] += int(retry)
+            if latency is not None:
+                stats['latencies'].append(latency)
+
+    def _wait(self, attempt, response=None):
+        # honor a Retry-After in seconds, otherwise use full jitter backoff
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def request(self, method, url, timeout=None, retries=None, deadline=None, **kwargs):
+        """
+        Sends a request, retrying 429, 5xx and connection errors with jittered backoff.
+
+        Parameters:
+        -----------
+        method : str
+            The HTTP method, e.g. 'GET'.
+        url : str
+            The URL to request.
+        timeout : float or tuple, optional
+            The timeout of each attempt (default is the client timeout).
+        retries : int, optional
+            The number of retries after the first attempt (default is the client retries).
+        deadline : float, optional
+            The most seconds spent on the call, all attempts included (default is None).
+        **kwargs
+            Arguments passed to requests, e.g. params or json.
+
+        Returns:
+        --------
+        requests.Response
+            The last response. Retried statuses that never succeeded are returned as is, so
+            callers can still check status_code or call raise_for_status().
+
+        Raises:
+        -------
+        requests.RequestException
+            If the last attempt failed without a response.
+        """
+        method = method.upper()
+        host = urlsplit(url).netloc
+        session = self._session(host)
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        idempotent = method in self.IDEMPOTENT_METHODS
+        end_time = time.monotonic() + deadline if deadline else None
+
+        attempt = 0
+        while True:
+            attempt_timeout = timeout
+            if end_time is not None:
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    raise requests.Timeout(f"Deadline of {deadline}s exceeded for {method} {url}")
+                # a single attempt never runs past the deadline
+                attempt_timeout = min(remaining, max(timeout) if isinstance(timeout, tuple) else timeout)
+
+            start = time.monotonic()
+            try:
+                response = session.request(method, url, timeout=attempt_timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                can_retry = attempt < retries and (idempotent or isinstance(e, requests.ConnectTimeout))
+                self._record(host, error=True, retry=can_retry)
+                if not can_retry:
+                    raise
+                wait = self._wait(attempt)
+            else:
+                latency = time.monotonic() - start
+                status = response.status_code
+                can_retry = (attempt < retries and status in self.RETRY_STATUSES
+                             and (idempotent or status == 429))
+                self._record(host, latency=latency, error=status >= 400, retry=can_retry)
+                if not can_retry:
+                    return response
+                wait = self._wait(attempt, response)
+                response.close()
+
+            if end_time is not None and time.monotonic() + wait >= end_time:
+                raise requests.Timeout(f"Deadline of {deadline}s exceeded for {method} {url}")
+            time.sleep(wait)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        """Sends a GET request, see request()."""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """Sends a POST request, see request(). POSTs are only retried on 429 and failed connects."""
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        """
+        Returns the latency, retry and pool statistics of each host.
+
+        Returns:
+        --------
+        dict
+            Per host: the number of requests, errors and retries, the mean, p50, p95 and max
+            latency in seconds over the recent requests, and the open pooled connections.
+        """
+        with self._lock:
+            hosts = {host: (dict(stats), list(stats['latencies']), self._sessions[host])
+                     for host, stats in self._stats.items()}
+        report = {}
+        for host, (stats, latencies, session) in hosts.items():
+            latencies.sort()
+            entry = {'requests': stats['requests'], 'errors': stats['errors'], 'retries': stats['retries']}
+            if latencies:
+                entry.update({
+                    'latency_mean': sum(latencies) / len(latencies),
+                    'latency_p50': latencies[len(latencies) // 2],
+                    'latency_p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                    'latency_max': latencies[-1],
+                })
+            entry.update(self._pool_stats(session))
+            report[host] = entry
+        return report
+
+    @staticmethod
+    def _pool_stats(session):
+        # urllib3 keeps one pool per scheme, host and port in the adapter's pool manager
+        connections = 0
+        pooled_requests = 0
+        try:
+            pools = session.get_adapter('https://').poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    pooled_requests += pool.num_requests
+        except AttributeError:
+            pass
+        return {'pool_connections': connections, 'pool_requests': pooled_requests}
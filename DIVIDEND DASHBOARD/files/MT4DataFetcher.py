@@ -1,7 +1,22 @@
-import pandas as pd
+import io
 import os
+import threading
+from datetime import datetime
+import pandas as pd
 
 class MT4DataFetcher:
+    COLUMNS = ['Date', 'Open', 'High', 'Low', 'Close']
+    # TimeToString(..., TIME_DATE | TIME_MINUTES) in UFX_FXRateCollector.mq4
+    DATE_FORMAT = '%Y.%m.%d %H:%M'
+    # the size of the blocks read backwards when looking for the new bars of a rewritten file
+    TAIL_BLOCK_SIZE = 16 * 1024
+    # the parsed frame, size, mtime and offsets of every CSV file read, shared by all fetchers
+    _cache = {}
+    _cache_lock = threading.Lock()
+    # the BarStreamServer the EA pushes bars to, when streaming is enabled; the CSV files
+    # are only read for the symbols it has not received a bar of
+    bar_stream = None
+
     def __init__(self, period='1440', base_path=None):
         """
         Initializes an instance of the MT4DataFetcher.
@@ -31,22 +46,172 @@ class MT4DataFetcher:
 
     def fetch_data(self):
         """
-        Fetches the MT4 data for the set symbol and period.
+        Fetches the MT4 data for the set symbol and period, from the bar stream when it has
+        bars of them, otherwise from the CSV file. A stream holding less than a full window
+        is seeded with the older bars of the CSV file first.
 
         :return: A DataFrame containing the fetched data.
         """
         if not self.symbol:
             raise ValueError("Symbol not set. Use set_symbol() to set the symbol before fetching data.")
 
+        bar_stream = MT4DataFetcher.bar_stream
+        if bar_stream is not None:
+            frame = bar_stream.get_frame(self.symbol, self.period)
+            if frame is not None and len(frame) >= bar_stream.max_bars:
+                return frame
+            if frame is not None:
+                try:
+                    bar_stream.seed(self.symbol, self.period, self._read_file())
+                except Exception as e:
+                    # a few streamed bars are better than none
+                    print(f"Unable to seed the bar stream of {self.symbol} {self.period} from the CSV file: {e}")
+                return bar_stream.get_frame(self.symbol, self.period)
+
+        return self._read_file()
+
+    def _read_file(self):
         filename = f'{self.symbol}_{self.period}.csv'
         file_path = os.path.join(self.base_path, filename)
 
         try:
-            col_names = ['Date', 'Open', 'High', 'Low', 'Close']
-            df = pd.read_csv(file_path, index_col=0, parse_dates=True, delimiter=';', names=col_names)
-            return df
+            return MT4DataFetcher.read_csv(file_path)
         except FileNotFoundError:
             raise FileNotFoundError(f"CSV file not found at {file_path}")
         except Exception as e:
             raise Exception(f"Error while reading the CSV file: {e}")
 
+    @staticmethod
+    def read_csv(file_path):
+        """
+        Reads an MT4 CSV file, only parsing what changed since the last read.
+
+        The parsed frame of every file is cached with its size, mtime and the offset of its
+        last complete line. An unchanged file is served from the cache. If the EA appended
+        bars, only the bytes after the offset are parsed. If it rewrote its sliding window,
+        only the lines from the last cached bar on are parsed, read backwards from the end,
+        and the cached bars before it are reused. Anything else is parsed in full.
+
+        :param file_path: The path of the CSV file.
+        :return: A DataFrame of Open, High, Low and Close indexed by Date.
+        """
+        stat = os.stat(file_path)
+        with MT4DataFetcher._cache_lock:
+            cached = MT4DataFetcher._cache.get(file_path)
+        if cached is not None and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            return cached['frame']
+
+        with open(file_path, 'rb') as file:
+            data = None
+            if cached is not None:
+                data = MT4DataFetcher._read_append(file, stat.st_size, cached)
+                if data is None:
+                    data = MT4DataFetcher._read_window_shift(file, stat.st_size, cached)
+            if data is None:
+                # the incremental readers may have moved the position
+                file.seek(0)
+                content = file.read()
+                end = MT4DataFetcher._complete_length(content)
+                frame = MT4DataFetcher._parse(content[:end])
+                first_line = content[:content.find(b'\n') + 1]
+                data = frame, end, first_line, MT4DataFetcher._last_line(content[:end])
+        frame, offset, first_line, last_line = data
+
+        with MT4DataFetcher._cache_lock:
+            MT4DataFetcher._cache[file_path] = {
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'offset': offset,
+                'first_line': first_line, 'last_line': last_line, 'frame': frame,
+            }
+        return frame
+
+    @staticmethod
+    def _parse(content):
+        # the C engine with an explicit date format, instead of inferring it per call
+        df = pd.read_csv(io.BytesIO(content), delimiter=';', names=MT4DataFetcher.COLUMNS, engine='c')
+        df['Date'] = pd.to_datetime(df['Date'], format=MT4DataFetcher.DATE_FORMAT)
+        return df.set_index('Date')
+
+    @staticmethod
+    def _complete_length(content):
+        # the EA may still be writing the last line
+        return len(content) if content.endswith(b'\n') else content.rfind(b'\n') + 1
+
+    @staticmethod
+    def _last_line(content):
+        start = content.rfind(b'\n', 0, len(content) - 1) + 1
+        return content[start:]
+
+    @staticmethod
+    def _line_date(line):
+        return pd.Timestamp(datetime.strptime(line.split(b';', 1)[0].strip().decode(), MT4DataFetcher.DATE_FORMAT))
+
+    @staticmethod
+    def _combine(frame, tail):
+        # the tail replaces the bars it shares with the cached frame
+        if tail.empty:
+            return frame
+        return pd.concat([frame[frame.index < tail.index[0]], tail])
+
+    @staticmethod
+    def _read_append(file, size, cached):
+        # a pure append keeps the first line and the last parsed line where they were
+        offset = cached['offset']
+        last_line = cached['last_line']
+        if size <= offset or not last_line:
+            return None
+        file.seek(0)
+        if file.read(len(cached['first_line'])) != cached['first_line']:
+            return None
+        file.seek(offset - len(last_line))
+        if file.read(len(last_line)) != last_line:
+            return None
+        content = file.read()
+        end = MT4DataFetcher._complete_length(content)
+        if end == 0:
+            return None
+        frame = MT4DataFetcher._combine(cached['frame'], MT4DataFetcher._parse(content[:end]))
+        return frame, offset + end, cached['first_line'], MT4DataFetcher._last_line(content[:end])
+
+    @staticmethod
+    def _read_window_shift(file, size, cached):
+        # the EA rewrites the last N bars on every new candle, so the new file holds the
+        # cached bars from its first date on plus the new ones at the end
+        frame = cached['frame']
+        if frame.empty:
+            return None
+        file.seek(0)
+        first_line = file.readline()
+        try:
+            first_date = MT4DataFetcher._line_date(first_line)
+        except ValueError:
+            return None
+        if first_date not in frame.index:
+            return None
+        last_cached_date = frame.index[-1]
+
+        # read blocks backwards until a complete line older than the last cached bar
+        position = size
+        content = b''
+        while position > 0:
+            read_size = min(MT4DataFetcher.TAIL_BLOCK_SIZE, position)
+            position -= read_size
+            file.seek(position)
+            content = file.read(read_size) + content
+            end = MT4DataFetcher._complete_length(content)
+            lines = content[:end].splitlines(keepends=True)
+            # the first line of the block may be cut unless the block starts the file
+            start_index = 0 if position == 0 else 1
+            for i in range(len(lines) - 1, start_index - 1, -1):
+                if not lines[i].strip():
+                    continue
+                try:
+                    line_date = MT4DataFetcher._line_date(lines[i])
+                except ValueError:
+                    return None
+                if line_date < last_cached_date:
+                    tail_content = b''.join(lines[i + 1:])
+                    tail = MT4DataFetcher._parse(tail_content) if tail_content.strip() else frame.iloc[:0]
+                    kept = frame[frame.index >= first_date]
+                    return (MT4DataFetcher._combine(kept, tail), position + end, first_line,
+                            MT4DataFetcher._last_line(content[:end]))
+        return None
@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+class MergedDataStore:
+    """
+    A memory bounded LRU store of merged OHLC and forecast DataFrames.
+
+    Each entry is kept compact: one datetime64 index array and one float32 block with
+    the OHLC, prediction and band columns. When the total size goes over the budget the
+    least recently used entries are evicted, so a long-running server keeps bounded memory
+    no matter how many tickers are viewed.
+
+    Attributes:
+    -----------
+    max_bytes : int
+        The memory budget of all entries.
+    nbytes : int
+        The current size of all entries.
+
+    Methods:
+    --------
+    set(self, key, df)
+        Stores a compact copy of a DataFrame and evicts entries over the budget.
+
+    get(self, key, default=None)
+        Returns the DataFrame of a key, rebuilt from the compact arrays.
+
+    footprint(self)
+        Returns the rows, columns and size of every entry.
+    """
+    def __init__(self, max_bytes=256 * 1024 ** 2):
+        """
+        Initializes an empty MergedDataStore.
+
+        Parameters:
+        -----------
+        max_bytes : int, optional
+            The memory budget of all entries (default is 256 MB). The most recent entry is
+            always kept, even if it alone is over the budget.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set(self, key, df):
+        """
+        Stores a compact copy of a DataFrame and evicts the least recently used entries.
+
+        Parameters:
+        -----------
+        key : hashable
+            The key of the entry, e.g. the symbol.
+        df : pandas.DataFrame
+            A DataFrame with a datetime index and numeric columns.
+        """
+        entry = {
+            'index': df.index.to_numpy(dtype='datetime64[ns]'),
+            'values': np.ascontiguousarray(df.to_numpy(dtype=np.float32)),
+            'columns': list(df.columns),
+            'index_name': df.index.name,
+        }
+        entry['nbytes'] = entry['index'].nbytes + entry['values'].nbytes
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= old['nbytes']
+            self._entries[key] = entry
+            self.nbytes += entry['nbytes']
+            while self.nbytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted['nbytes']
+
+    def get(self, key, default=None):
+        """
+        Returns the DataFrame of a key and marks it as recently used.
+
+        Parameters:
+        -----------
+        key : hashable
+            The key of the entry.
+        default : object, optional
+            The value returned if the key is not stored (default is None).
+
+        Returns:
+        --------
+        pandas.DataFrame or object
+            A float32 DataFrame backed by the stored arrays, or the default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+        index = pd.DatetimeIndex(entry['index'], name=entry['index_name'])
+        return pd.DataFrame(entry['values'], index=index, columns=entry['columns'], copy=False)
+
+    def __getitem__(self, key):
+        df = self.get(key)
+        if df is None:
+            raise KeyError(key)
+        return df
+
+    def __setitem__(self, key, df):
+        self.set(key, df)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def footprint(self):
+        """
+        Returns the rows, columns and size of every entry, least recently used first.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The 'rows', 'columns' and 'bytes' of each key. The total is the nbytes attribute.
+        """
+        with self._lock:
+            rows = [{'key': key, 'rows': len(entry['index']), 'columns': len(entry['columns']), 'bytes': entry['nbytes']}
+                    for key, entry in self._entries.items()]
+        return pd.DataFrame(rows, columns=['key', 'rows', 'columns', 'bytes']).set_index('key')
@@ -0,0 +1,235 @@
+import os
+import sqlite3
+import threading
+from contextlib import closing
+import pandas as pd
+from files.WorkbookLoader import WorkbookLoader
+
+class PortfolioStore:
+    """
+    An indexed SQLite store for the holdings, dividend ledger and closed trades.
+
+    The Excel workbook stays the place where trades are entered. Whenever its signature
+    changes the store re-imports it, after which every page reads through indexed queries
+    instead of scanning whole sheets.
+
+    Attributes:
+    -----------
+    db_path : str
+        Path to the SQLite database file.
+    workbook_loader : WorkbookLoader
+        The loader used to import the workbook.
+
+    Methods:
+    --------
+    sync(self)
+        Re-imports the workbook if it changed since the last import.
+
+    import_workbook(self)
+        Replaces every table with the current content of the workbook.
+
+    get_current_holdings(self)
+        Returns the current holdings sorted by G/L ($).
+
+    get_dividend_info(self, start_date=None, end_date=None)
+        Returns the upcoming dividends, optionally limited to a pay_date range.
+
+    get_dividend_payments(self, years=None)
+        Returns the dividends paid, optionally limited to some years.
+
+    get_dividend_totals_by_year(self, years=None)
+        Returns the total dividends paid per year.
+
+    get_closed_trades(self)
+        Returns the closed trades sorted by date closed.
+    """
+    # serializes imports so two callbacks never rebuild the tables at the same time
+    _lock = threading.Lock()
+
+    TABLE_INDEXES = {
+        'holdings': ['Ticker'],
+        'dividend_payments': ['Symbol', 'Date', 'Year'],
+        'closed_trades': ['Ticker', 'Date Closed'],
+        'dividend_info': ['Ticker', 'pay_date', 'ex_dividend_date'],
+    }
+
+    def __init__(self, db_path='data/portfolio.db', workbook_loader=None):
+        """
+        Initializes the PortfolioStore.
+
+        Parameters:
+        -----------
+        db_path : str, optional
+            Path to the SQLite database file (default is 'data/portfolio.db').
+        workbook_loader : WorkbookLoader, optional
+            The loader used to import the workbook (default is the dashboard workbook).
+        """
+        self.db_path = db_path
+        self.workbook_loader = workbook_loader or WorkbookLoader()
+
+    def _connect(self):
+        return closing(sqlite3.connect(self.db_path))
+
+    def _stored_signature(self, conn):
+        conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        row = conn.execute("SELECT value FROM meta WHERE key = 'workbook_signature'").fetchone()
+        return row[0] if row else None
+
+    def sync(self):
+        """
+        Re-imports the workbook if it changed since the last import.
+
+        Returns:
+        --------
+        bool
+            True if the workbook was imported, False if the store was already up to date.
+        """
+        signature = '{}:{}'.format(*self.workbook_loader.signature())
+        with self._connect() as conn:
+            if self._stored_signature(conn) == signature:
+                return False
+        with PortfolioStore._lock:
+            with self._connect() as conn:
+                # another thread may have imported the workbook while we waited for the lock
+                if self._stored_signature(conn) == signature:
+                    return False
+            self.import_workbook()
+            return True
+
+    def import_workbook(self):
+        """
+        Replaces every table with the current content of the workbook.
+
+        The yearly dividend sheets (named after the year, e.g. '2023') are combined into a
+        single dividend_payments table with the sheet name as the Year column.
+        """
+        signature = '{}:{}'.format(*self.workbook_loader.signature())
+        sheet_names = self.workbook_loader.sheet_names()
+        year_sheets = [name for name in sheet_names if name.isdigit()]
+
+        payments = []
+        for sheet in year_sheets:
+            data = self.workbook_loader.get_sheet(sheet)
+            # the 2023 sheet names the account column 'Acc.'
+            data = data.rename(columns={'Acc.': 'Account Type'})
+            data['Year'] = int(sheet)
+            payments.append(data[['Symbol', 'Account Type', 'Date', 'Month', 'Year', 'Amount']])
+
+        tables = {
+            'holdings': self.workbook_loader.get_sheet('current_holdings'),
+            'dividend_payments': pd.concat(payments, ignore_index=True) if payments else pd.DataFrame(),
+            'closed_trades': self.workbook_loader.get_sheet('closed_trades'),
+            'dividend_info': self.workbook_loader.get_sheet('dividend_info'),
+        }
+
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        with self._connect() as conn:
+            with conn:
+                for table, df in tables.items():
+                    df.to_sql(table, conn, if_exists='replace', index=False)
+                    for column in self.TABLE_INDEXES[table]:
+                        if column not in df.columns:
+                            continue
+                        index_name = 'idx_{}_{}'.format(table, ''.join(c for c in column.lower() if c.isalnum()))
+                        conn.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} ("{column}")')
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('workbook_signature', ?)", (signature,))
+
+    def _query(self, sql, params=(), parse_dates=None):
+        self.sync()
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params, parse_dates=parse_dates)
+
+    def get_current_holdings(self):
+        """
+        Returns the current holdings sorted by G/L ($), largest gain first.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The holdings with 'Date Op.' parsed as a datetime.
+        """
+        return self._query('SELECT * FROM holdings ORDER BY "G/L ($)" DESC', parse_dates=['Date Op.'])
+
+    def get_dividend_info(self, start_date=None, end_date=None):
+        """
+        Returns the upcoming dividends, optionally limited to a pay_date range.
+
+        Parameters:
+        -----------
+        start_date : str or date, optional
+            The first pay_date to include.
+        end_date : str or date, optional
+            The last pay_date to include.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The dividend_info rows with ex_dividend_date and pay_date parsed as datetimes.
+        """
+        sql = 'SELECT * FROM dividend_info'
+        conditions, params = [], []
+        # dates are stored as ISO text so a string range uses the pay_date index
+        if start_date is not None:
+            conditions.append('pay_date >= ?')
+            params.append(pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+        if end_date is not None:
+            conditions.append('pay_date < ?')
+            params.append((pd.Timestamp(end_date) + pd.Timedelta(days=1)).strftime('%Y-%m-%d'))
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        return self._query(sql, params, parse_dates=['ex_dividend_date', 'pay_date'])
+
+    def get_dividend_payments(self, years=None):
+        """
+        Returns the dividends paid, optionally limited to some years.
+
+        Parameters:
+        -----------
+        years : list, optional
+            The years to include (default is every year).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The dividend payments sorted by Date.
+        """
+        sql = 'SELECT * FROM dividend_payments'
+        params = []
+        if years is not None:
+            params = [int(year) for year in years]
+            sql += ' WHERE Year IN ({})'.format(', '.join('?' * len(params)))
+        return self._query(sql + ' ORDER BY Date', params, parse_dates=['Date'])
+
+    def get_dividend_totals_by_year(self, years=None):
+        """
+        Returns the total dividends paid per year.
+
+        Parameters:
+        -----------
+        years : list, optional
+            The years to include (default is every year).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            A DataFrame with the year as a string index and an 'Amount' column.
+        """
+        sql = 'SELECT Year, ROUND(SUM(Amount), 2) AS Amount FROM dividend_payments'
+        params = []
+        if years is not None:
+            params = [int(year) for year in years]
+            sql += ' WHERE Year IN ({})'.format(', '.join('?' * len(params)))
+        df = self._query(sql + ' GROUP BY Year ORDER BY Year', params)
+        df.index = df.pop('Year').astype(str)
+        return df
+
+    def get_closed_trades(self):
+        """
+        Returns the closed trades sorted by date closed.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The closed trades with 'Date Closed' parsed as a datetime.
+        """
+        return self._query('SELECT * FROM closed_trades ORDER BY "Date Closed"', parse_dates=['Date Op.', 'Date Closed'])
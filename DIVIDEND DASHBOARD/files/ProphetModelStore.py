@@ -0,0 +1,130 @@
+import os
+import re
+import threading
+import numpy as np
+
+class ProphetModelStore:
+    """
+    Keeps the last fitted Prophet model per symbol and frequency, in memory and on disk.
+
+    The stored model is used to warm-start the next fit, which only differs by the newest
+    bars, and survives a server restart as JSON.
+
+    Attributes:
+    -----------
+    model_dir : str
+        The directory holding the serialized models.
+
+    Methods:
+    --------
+    load(self, key)
+        Returns the last fitted model for a key, or None.
+
+    save(self, key, model)
+        Keeps a fitted model in memory and writes it to disk.
+
+    warm_start_params(model)
+        Returns the fitted parameters of a model in the form Prophet.fit(init=...) expects.
+    """
+    def __init__(self, model_dir='data/models'):
+        """
+        Initializes the ProphetModelStore.
+
+        Parameters:
+        -----------
+        model_dir : str, optional
+            The directory holding the serialized models (default is 'data/models').
+        """
+        self.model_dir = model_dir
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        # symbols such as 'S&P500e' or 'BTC-USDC' are not all safe file names
+        name = '_'.join(re.sub(r'[^A-Za-z0-9.-]', '_', str(part)) for part in key)
+        return os.path.join(self.model_dir, f'{name}.json')
+
+    def load(self, key):
+        """
+        Returns the last fitted model for a key.
+
+        Parameters:
+        -----------
+        key : tuple
+            The model key, e.g. (symbol, freq).
+
+        Returns:
+        --------
+        Prophet or None
+            The fitted model, or None if there is none in memory or on disk.
+        """
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        # imported on first use, like Prophet itself
+        from prophet.serialize import model_from_json
+        try:
+            with open(path) as file:
+                model = model_from_json(file.read())
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring stored Prophet model {path}: {e}")
+            return None
+        with self._lock:
+            self._models[key] = model
+        return model
+
+    def save(self, key, model):
+        """
+        Keeps a fitted model in memory and writes it to disk.
+
+        Parameters:
+        -----------
+        key : tuple
+            The model key, e.g. (symbol, freq).
+        model : Prophet
+            The fitted model.
+        """
+        from prophet.serialize import model_to_json
+        with self._lock:
+            self._models[key] = model
+        try:
+            os.makedirs(self.model_dir, exist_ok=True)
+            path = self._path(key)
+            # write to a temporary file first so a crash never leaves a half written model
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as file:
+                file.write(model_to_json(model))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Unable to save Prophet model: {e}")
+
+    @staticmethod
+    def warm_start_params(model):
+        """
+        Returns the fitted parameters of a model in the form Prophet.fit(init=...) expects.
+
+        Parameters:
+        -----------
+        model : Prophet
+            A fitted model.
+
+        Returns:
+        --------
+        dict
+            The k, m, sigma_obs, delta and beta parameters.
+        """
+        params = {}
+        for name in ['k', 'm', 'sigma_obs']:
+            if model.mcmc_samples == 0:
+                params[name] = model.params[name][0][0]
+            else:
+                params[name] = np.mean(model.params[name])
+        for name in ['delta', 'beta']:
+            if model.mcmc_samples == 0:
+                params[name] = model.params[name][0]
+            else:
+                params[name] = np.mean(model.params[name], axis=0)
+        return params
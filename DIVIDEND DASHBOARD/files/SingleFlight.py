@@ -0,0 +1,87 @@
+import threading
+
+class _Call:
+    # one in-flight computation and what its waiting callers receive
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single computation.
+
+    The first caller of a key runs the function; callers arriving while it runs wait for
+    it and receive the same result, or the same exception. Once it finishes the key is
+    released, so a later call computes again. Nothing is cached, which is left to the
+    stores and caches around it.
+
+    Attributes:
+    -----------
+    calls : int
+        The number of computations run.
+    shared : int
+        The number of callers that received the result of another caller's computation.
+
+    Methods:
+    --------
+    do(self, key, function, *args, **kwargs)
+        Runs the function, or waits for the in-flight call of the same key.
+    """
+    def __init__(self):
+        """
+        Initializes a SingleFlight with no call in flight.
+        """
+        self.calls = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        Runs the function, or waits for the in-flight call of the same key and shares its result.
+
+        Parameters:
+        -----------
+        key : hashable
+            The key identifying the computation, e.g. (symbol, timeframe, bar version).
+        function : callable
+            The function to run.
+        *args, **kwargs
+            The arguments of the function.
+
+        Returns:
+        --------
+        object
+            The result of the function.
+
+        Raises:
+        -------
+        Exception
+            Whatever the function raised, for the caller that ran it and every waiting one.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
@@ -1,9 +1,15 @@
-import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from files.BarStore import BarStore
+from files.SingleFlight import SingleFlight
 
 class StockDataFetcher:
     """
     A class for fetching stock data for a specified ticker symbol.
 
+    The bars are kept in a local BarStore, so after the first download only the bars since
+    the last stored bar are requested.
+
     Attributes:
     -----------
     ticker : str
@@ -16,7 +22,16 @@ class StockDataFetcher:
 
     fetch_data(self, period='2y', interval='1d')
         Fetches and returns stock data for the set ticker symbol.
+
+    fetch_many(tickers, period='2y', interval='1d', chunk_size=50, max_workers=4)
+        Fetches many tickers with a few bulk downloads.
     """
+    # the bars of every ticker and interval, shared by all fetchers
+    bar_store = BarStore()
+    # concurrent fetches of the same ticker share one download
+    single_flight = SingleFlight()
+    COLUMNS = ['Open', 'High', 'Low', 'Close']
+
     def __init__(self):
         """
         Initializes the StockDataFetcher class with no ticker set.
@@ -36,7 +51,8 @@ class StockDataFetcher:
 
     def fetch_data(self, period='2y', interval='1d'):
         """
-        Fetches and returns stock data for the set ticker symbol.
+        Fetches and returns stock data for the set ticker symbol. Callers fetching the same
+        ticker, period and interval at the same time share a single download.
 
         Parameters:
         -----------
@@ -57,5 +73,130 @@ class StockDataFetcher:
         """
         if not self.ticker:
             raise ValueError("Ticker symbol not set. Use set_ticker() to set a stock ticker symbol before fetching data.")
-        symbol_data = yf.download(self.ticker, period=period, interval=interval, rounding=True)[['Open', 'High', 'Low', 'Close']]
+        return StockDataFetcher.single_flight.do((self.ticker, period, interval), self._fetch_data, period, interval)
+
+    def _fetch_data(self, period, interval):
+        # imported on first use, yfinance is slow to import and only needed to download
+        import yfinance as yf
+        start = BarStore.period_start(period)
+        bar_store = StockDataFetcher.bar_store
+        stored = bar_store.read(self.ticker, interval) if bar_store.covers(self.ticker, interval, start) else None
+        if stored is None or stored.empty:
+            return self._download_history(yf, period, interval, start)
+        # request the bars from the one before the last stored bar, the last one may still
+        # have been forming, the one before it is complete and is compared with the store
+        check_timestamp = stored.index[-2] if len(stored) > 1 else stored.index[-1]
+        try:
+            new_data = StockDataFetcher._clean(yf.download(self.ticker, start=check_timestamp.strftime('%Y-%m-%d'), interval=interval, rounding=True))
+            if StockDataFetcher._readjusted(stored, new_data, check_timestamp):
+                # yfinance adjusts every past bar for a new dividend or split, so the stored
+                # history no longer matches the new bars
+                print(f"{self.ticker} was re-adjusted, downloading the whole history again")
+                return self._download_history(yf, period, interval, start)
+            if not new_data.empty:
+                bar_store.append(self.ticker, interval, new_data)
+        except Exception as e:
+            # serve the stored bars if the update fails
+            print(f"Error updating {self.ticker}, using the stored bars: {e}")
+        return bar_store.read(self.ticker, interval, start)
+
+    def _download_history(self, yf, period, interval, start):
+        symbol_data = StockDataFetcher._clean(yf.download(self.ticker, period=period, interval=interval, rounding=True))
+        if symbol_data.empty:
+            return symbol_data
+        StockDataFetcher.bar_store.append(self.ticker, interval, symbol_data, covered_from=start or 'max', replace=True)
         return symbol_data
+
+    @staticmethod
+    def _readjusted(stored, new_data, timestamp):
+        # the bars are rounded to cents, a larger difference of a complete bar is an adjustment
+        if timestamp not in new_data.index:
+            return False
+        return abs(new_data.at[timestamp, 'Close'] - stored.at[timestamp, 'Close']) > 0.01
+
+    @staticmethod
+    def fetch_many(tickers, period='2y', interval='1d', chunk_size=50, max_workers=4):
+        """
+        Fetches many tickers with a few bulk downloads instead of one request per ticker.
+
+        The tickers are split into chunks that are downloaded concurrently. Each chunk result
+        is split into per-ticker frames by selecting its column group, and every frame also
+        replaces the stored bars of its ticker so a later fetch_data() only needs a delta.
+
+        Parameters:
+        -----------
+        tickers : list
+            The ticker symbols to fetch.
+        period : str, optional
+            The period over which to fetch stock data (default is '2y').
+        interval : str, optional
+            The interval between data points (default is '1d').
+        chunk_size : int, optional
+            The number of tickers per download (default is 50).
+        max_workers : int, optional
+            The number of downloads running at the same time (default is 4).
+
+        Returns:
+        --------
+        tuple
+            A dict of the Open, High, Low and Close DataFrame of each ticker and a list of
+            the tickers that could not be fetched.
+        """
+        import yfinance as yf
+        tickers = list(dict.fromkeys(tickers))
+        chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+        start = BarStore.period_start(period)
+
+        def download(chunk):
+            try:
+                # threads=False, the chunks already run concurrently
+                return chunk, yf.download(chunk, period=period, interval=interval, group_by='ticker', rounding=True, threads=False, progress=False)
+            except Exception as e:
+                print(f"Error downloading {len(chunk)} tickers: {e}")
+                return chunk, None
+
+        frames = {}
+        failed = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+            for chunk, data in executor.map(download, chunks):
+                for ticker in chunk:
+                    symbol_data = StockDataFetcher._split_ticker(data, ticker, len(chunk))
+                    if symbol_data is None:
+                        failed.append(ticker)
+                        continue
+                    frames[ticker] = symbol_data
+                    # the whole period was downloaded with yfinance's current adjustments, so
+                    # it replaces the stored bars instead of merging into stale ones
+                    StockDataFetcher.bar_store.append(ticker, interval, symbol_data, covered_from=start or 'max', replace=True)
+        return frames, failed
+
+    @staticmethod
+    def _split_ticker(data, ticker, chunk_length):
+        # select the column group of one ticker, None if it has no bars
+        if data is None or data.empty:
+            return None
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                return None
+            symbol_data = data[ticker]
+        elif chunk_length == 1:
+            # older yfinance versions return flat columns for a single ticker
+            symbol_data = data
+        else:
+            return None
+        # only build a new frame when the download has extra columns such as Volume
+        if list(symbol_data.columns) != StockDataFetcher.COLUMNS:
+            symbol_data = symbol_data.reindex(columns=StockDataFetcher.COLUMNS)
+        # the chunk shares one date index, drop the dates this ticker did not trade
+        if symbol_data['Close'].isna().any():
+            symbol_data = symbol_data.dropna(how='all')
+        return symbol_data if not symbol_data.empty else None
+
+    @staticmethod
+    def _clean(symbol_data):
+        # newer yfinance versions return a (Price, Ticker) column index even for a single ticker
+        if isinstance(symbol_data.columns, pd.MultiIndex):
+            symbol_data = symbol_data.copy()
+            symbol_data.columns = symbol_data.columns.get_level_values(0)
+        # a failed download may come back without any column
+        return symbol_data.reindex(columns=StockDataFetcher.COLUMNS)
@@ -0,0 +1,241 @@
+import math
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+class TableBackend:
+    """
+    Serves a Dash DataTable in custom paging, sorting and filtering mode from a cached frame.
+
+    Dash sends the page, sort and filter state of the table and the backend answers with
+    only the visible page. Sorted copies of the frame are cached per sort order and the
+    table's filter_query is translated into vectorized pandas masks.
+
+    Attributes:
+    -----------
+    page_size : int
+        The default number of rows per page.
+    version : object
+        An opaque value identifying the data the frame was built from.
+
+    Methods:
+    --------
+    column_type(series)
+        Returns the DataTable column type of a column.
+
+    set_frame(self, df, version=None)
+        Replaces the cached frame and clears the sorted copies.
+
+    query(self, page_current, page_size, sort_by, filter_query)
+        Returns the records of the visible page and the number of pages.
+    """
+    OPERATORS = [['ge ', '>='],
+                 ['le ', '<='],
+                 ['lt ', '<'],
+                 ['gt ', '>'],
+                 ['ne ', '!='],
+                 ['eq ', '='],
+                 ['contains '],
+                 ['datestartswith ']]
+
+    def __init__(self, page_size=15, max_sorted_frames=8):
+        """
+        Initializes the TableBackend with an empty frame.
+
+        Parameters:
+        -----------
+        page_size : int, optional
+            The default number of rows per page (default is 15).
+        max_sorted_frames : int, optional
+            The number of sorted copies of the frame to keep (default is 8).
+        """
+        self.page_size = page_size
+        self.max_sorted_frames = max_sorted_frames
+        self.version = None
+        self._frame = pd.DataFrame()
+        self._sorted = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def frame(self):
+        """The cached frame in its original order."""
+        return self._frame
+
+    @staticmethod
+    def column_type(series):
+        """
+        Returns the DataTable column type of a column, so the table builds filters it can answer.
+
+        Numbers are 'numeric', datetimes and text holding ISO dates such as '2024-01-31'
+        are 'datetime' and anything else is 'text'.
+
+        Parameters:
+        -----------
+        series : pandas.Series
+            The column of the table.
+
+        Returns:
+        --------
+        str
+            'numeric', 'datetime' or 'text'.
+        """
+        if pd.api.types.is_bool_dtype(series):
+            return 'text'
+        if pd.api.types.is_numeric_dtype(series):
+            return 'numeric'
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return 'datetime'
+        values = series.dropna()
+        if len(values) and values.map(lambda value: isinstance(value, str)).all():
+            # ISO dates sort and filter as text in the same order as dates
+            if values.str.match(r'\d{4}-\d{2}-\d{2}').all():
+                if pd.to_datetime(values, format='ISO8601', errors='coerce').notna().all():
+                    return 'datetime'
+        return 'text'
+
+    def set_frame(self, df, version=None):
+        """
+        Replaces the cached frame and clears the sorted copies.
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            The full table.
+        version : object, optional
+            An opaque value identifying the data, callers compare it to skip unneeded refreshes.
+        """
+        with self._lock:
+            self._frame = df.reset_index(drop=True)
+            self._sorted = OrderedDict()
+            self.version = version
+
+    def _sorted_frame(self, sort_by):
+        key = tuple((col['column_id'], col['direction']) for col in sort_by or [])
+        with self._lock:
+            if key in self._sorted:
+                self._sorted.move_to_end(key)
+                return self._sorted[key]
+            df = self._frame
+            columns = [column for column, _ in key if column in df.columns]
+            if columns:
+                df = df.sort_values(
+                    columns,
+                    ascending=[direction == 'asc' for column, direction in key if column in df.columns],
+                    kind='mergesort',
+                    inplace=False
+                )
+            self._sorted[key] = df
+            if len(self._sorted) > self.max_sorted_frames:
+                self._sorted.popitem(last=False)
+            return df
+
+    @classmethod
+    def split_filter_part(cls, filter_part):
+        """
+        Splits one part of a DataTable filter_query into its column, operator and value.
+
+        Parameters:
+        -----------
+        filter_part : str
+            A single filter expression, e.g. '{G/L ($)} s> 0'.
+
+        Returns:
+        --------
+        tuple
+            The column name, the operator and the value, or three Nones if it cannot be parsed.
+        """
+        for operator_type in cls.OPERATORS:
+            for operator in operator_type:
+                if operator in filter_part:
+                    name_part, value_part = filter_part.split(operator, 1)
+                    name = name_part[name_part.find('{') + 1: name_part.rfind('}')]
+
+                    value_part = value_part.strip()
+                    v0 = value_part[0] if value_part else ''
+                    if v0 and v0 == value_part[-1] and v0 in ("'", '"', '`'):
+                        value = value_part[1: -1].replace('\\' + v0, v0)
+                    elif operator_type[0] == 'datestartswith ':
+                        # a partial date such as '01' is a prefix, not a number
+                        value = value_part
+                    else:
+                        try:
+                            value = float(value_part)
+                        except ValueError:
+                            value = value_part
+
+                    # word operators need spaces after them in the filter string,
+                    # but we don't want these later
+                    return name, operator_type[0].strip(), value
+
+        return [None] * 3
+
+    @classmethod
+    def filter_mask(cls, df, filter_query):
+        """
+        Translates a DataTable filter_query into a boolean mask over the frame.
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            The frame to filter.
+        filter_query : str
+            The filter_query of the table, parts are joined with ' && '.
+
+        Returns:
+        --------
+        pandas.Series
+            A boolean mask aligned with the frame.
+        """
+        mask = pd.Series(True, index=df.index)
+        if not filter_query:
+            return mask
+        for filter_part in filter_query.split(' && '):
+            col_name, operator, filter_value = cls.split_filter_part(filter_part)
+            if col_name not in df.columns:
+                continue
+            column = df[col_name]
+            if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+                if isinstance(filter_value, float) and not pd.api.types.is_numeric_dtype(column):
+                    # the user typed a number in a text column, compare it as text
+                    filter_value = str(filter_value).rstrip('0').rstrip('.')
+                try:
+                    mask &= getattr(column, operator)(filter_value).fillna(False)
+                except (TypeError, ValueError):
+                    # text typed in a numeric column matches nothing
+                    mask &= False
+            elif operator == 'contains':
+                mask &= column.astype(str).str.contains(str(filter_value), case=False, regex=False)
+            elif operator == 'datestartswith':
+                # this is a simplification of the front-end filtering logic,
+                # only works with complete fields in standard format
+                mask &= column.astype(str).str.startswith(str(filter_value))
+        return mask
+
+    def query(self, page_current, page_size, sort_by, filter_query):
+        """
+        Returns the records of the visible page and the number of pages.
+
+        Parameters:
+        -----------
+        page_current : int
+            The zero based page shown by the table.
+        page_size : int
+            The number of rows per page.
+        sort_by : list
+            The sort_by property of the table.
+        filter_query : str
+            The filter_query property of the table.
+
+        Returns:
+        --------
+        tuple
+            The list of records for the page and the page count.
+        """
+        page_current = page_current or 0
+        page_size = page_size or self.page_size
+        df = self._sorted_frame(sort_by)
+        if filter_query:
+            df = df[self.filter_mask(df, filter_query).to_numpy()]
+        page_count = max(1, math.ceil(len(df) / page_size))
+        page = df.iloc[page_current * page_size: (page_current + 1) * page_size]
+        return page.to_dict('records'), page_count
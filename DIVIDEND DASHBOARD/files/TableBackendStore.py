@@ -0,0 +1,112 @@
+import threading
+from collections import OrderedDict
+from files.TableBackend import TableBackend
+
+class TableBackendStore:
+    """
+    An LRU of TableBackends keyed by what their frame was built from.
+
+    Pages are shared by every browser session, so a single backend would let one session
+    replace the frame another one is paging through. Each key, e.g. a date range or a
+    screening job id, gets its own backend instead, and the least recently used ones are
+    dropped.
+
+    Attributes:
+    -----------
+    page_size : int
+        The default number of rows per page of the backends.
+    max_entries : int
+        The number of backends kept.
+
+    Methods:
+    --------
+    get(self, key)
+        Returns the backend of a key, or None.
+
+    set(self, key, df)
+        Builds a backend for the frame and stores it under the key.
+
+    get_or_set(self, key, load)
+        Returns the backend of a key, building it from load() on a miss.
+    """
+    def __init__(self, page_size=15, max_entries=32):
+        """
+        Initializes an empty TableBackendStore.
+
+        Parameters:
+        -----------
+        page_size : int, optional
+            The default number of rows per page of the backends (default is 15).
+        max_entries : int, optional
+            The number of backends kept (default is 32).
+        """
+        self.page_size = page_size
+        self.max_entries = max_entries
+        self._backends = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the backend of a key.
+
+        Parameters:
+        -----------
+        key : hashable
+            The key the backend was stored under.
+
+        Returns:
+        --------
+        TableBackend or None
+            The backend, or None if it was never stored or was dropped.
+        """
+        with self._lock:
+            backend = self._backends.get(key)
+            if backend is not None:
+                self._backends.move_to_end(key)
+            return backend
+
+    def set(self, key, df):
+        """
+        Builds a backend for the frame and stores it under the key.
+
+        Parameters:
+        -----------
+        key : hashable
+            The key of the frame, also used as the backend version.
+        df : pandas.DataFrame
+            The full table.
+
+        Returns:
+        --------
+        TableBackend
+            The new backend.
+        """
+        backend = TableBackend(page_size=self.page_size)
+        backend.set_frame(df, version=key)
+        with self._lock:
+            self._backends[key] = backend
+            self._backends.move_to_end(key)
+            while len(self._backends) > self.max_entries:
+                self._backends.popitem(last=False)
+        return backend
+
+    def get_or_set(self, key, load):
+        """
+        Returns the backend of a key, building it from load() on a miss.
+
+        Parameters:
+        -----------
+        key : hashable
+            The key of the frame.
+        load : callable
+            A function without arguments returning the frame.
+
+        Returns:
+        --------
+        tuple
+            The backend and whether it was built by this call.
+        """
+        backend = self.get(key)
+        if backend is not None:
+            return backend, False
+        return self.set(key, load()), True
@@ -0,0 +1,68 @@
+import threading
+import time
+
+class TokenBucket:
+    """
+    A thread-safe token bucket rate limiter.
+
+    The bucket holds up to capacity tokens and refills at capacity / period tokens per
+    second. Each request takes a token and waits when the bucket is empty, so a burst
+    never goes over an API budget such as KuCoin's 2000 requests per 30 seconds.
+
+    Attributes:
+    -----------
+    capacity : int
+        The largest burst of requests.
+    period : float
+        The number of seconds in which capacity tokens are refilled.
+
+    Methods:
+    --------
+    acquire(self, tokens=1)
+        Takes tokens from the bucket, waiting until they are available.
+    """
+    def __init__(self, capacity, period):
+        """
+        Initializes a full TokenBucket.
+
+        Parameters:
+        -----------
+        capacity : int
+            The number of requests allowed per period.
+        period : float
+            The length of the period, in seconds.
+        """
+        self.capacity = capacity
+        self.period = period
+        self._rate = capacity / period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """
+        Takes tokens from the bucket, waiting until they are available.
+
+        Parameters:
+        -----------
+        tokens : int, optional
+            The number of tokens to take (default is 1).
+
+        Returns:
+        --------
+        float
+            The number of seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self._rate
+            # sleep outside the lock so other threads can refill and take tokens meanwhile
+            time.sleep(wait)
+            waited += wait
@@ -1,5 +1,6 @@
 import requests
 import json
+from files.HttpClient import HttpClient
 
 class TradingBotController:
     def start_bot(self, trade_message):
@@ -11,8 +12,12 @@ class TradingBotController:
         api_url = "https://3commas.io/trade_signal/trading_view"
         # Your data payload this is for stopping the bot
         payload = trade_dict
-        # Send POST request
-        response = requests.post(api_url, json=payload)
+        # Send POST request, it is only retried if 3commas did not take it
+        try:
+            response = HttpClient.shared().post(api_url, json=payload)
+        except requests.RequestException as e:
+            print("Failed to START the bot:", e)
+            return
         # Check response
         if response.status_code == 200:
             print("Bot started successfully.")
@@ -27,8 +32,12 @@ class TradingBotController:
         api_url = "https://3commas.io/trade_signal/trading_view"
         # Your data payload this is for stopping the bot
         payload = trade_dict
-        # Send POST request
-        response = requests.post(api_url, json=payload)
+        # Send POST request, it is only retried if 3commas did not take it
+        try:
+            response = HttpClient.shared().post(api_url, json=payload)
+        except requests.RequestException as e:
+            print("Failed to stop the bot:", e)
+            return
         # Check response
         if response.status_code == 200:
             print("Bot stopped successfully.")
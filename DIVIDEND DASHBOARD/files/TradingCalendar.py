@@ -0,0 +1,132 @@
+import pandas as pd
+from pandas.tseries.holiday import (AbstractHolidayCalendar, Holiday, nearest_workday, sunday_to_monday,
+                                    USMartinLutherKingJr, USPresidentsDay, GoodFriday, USMemorialDay,
+                                    USLaborDay, USThanksgivingDay)
+from pandas.tseries.offsets import CustomBusinessDay, CustomBusinessHour, BDay
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """The full day NYSE holidays. Early closes are treated as normal sessions."""
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-06-19', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday),
+    ]
+
+class TradingCalendar:
+    """
+    Builds forecast dates that only fall on the sessions an asset class trades.
+
+    Equities trade NYSE sessions, FX and the MT4 CFDs trade 24 hours on weekdays and
+    crypto trades around the clock, so a forecast never predicts, smooths or charts bars
+    that can not exist.
+
+    Methods:
+    --------
+    future_dates(last_date, periods, freq='D', asset_class='crypto')
+        Returns the next sessions after the last date.
+
+    future_dataframe(history_dates, periods, freq='D', asset_class='crypto', include_history=True)
+        Returns a Prophet future frame with a 'ds' column of sessions.
+    """
+    ASSET_CLASSES = ('equity', 'fx', 'crypto')
+    # NYSE regular trading hours, used for hourly equity forecasts
+    EQUITY_OPEN = '09:30'
+    EQUITY_CLOSE = '16:00'
+    _offsets = {}
+
+    @staticmethod
+    def _session_offset(asset_class, freq):
+        # the offsets are cached since building the holiday list is the slow part
+        key = (asset_class, freq)
+        if key not in TradingCalendar._offsets:
+            if asset_class == 'equity' and freq == 'D':
+                offset = CustomBusinessDay(calendar=NYSEHolidayCalendar())
+            elif asset_class == 'equity' and freq == 'H':
+                offset = CustomBusinessHour(start=TradingCalendar.EQUITY_OPEN, end=TradingCalendar.EQUITY_CLOSE,
+                                            calendar=NYSEHolidayCalendar())
+            elif asset_class == 'fx' and freq == 'D':
+                offset = BDay()
+            else:
+                offset = None
+            TradingCalendar._offsets[key] = offset
+        return TradingCalendar._offsets[key]
+
+    @staticmethod
+    def future_dates(last_date, periods, freq='D', asset_class='crypto'):
+        """
+        Returns the next sessions after the last date.
+
+        Parameters:
+        -----------
+        last_date : datetime-like
+            The date of the last known bar.
+        periods : int
+            The number of sessions to return.
+        freq : str, optional
+            'D' for daily or 'H' for hourly sessions (default is 'D'). Other pandas
+            frequencies are returned as plain calendar ranges.
+        asset_class : str, optional
+            'equity' for NYSE sessions, 'fx' for 24x5 or 'crypto' for 24x7 (default is 'crypto').
+
+        Returns:
+        --------
+        pandas.DatetimeIndex
+            The dates of the next sessions.
+
+        Raises:
+        -------
+        ValueError
+            If the asset class is unknown.
+        """
+        if asset_class not in TradingCalendar.ASSET_CLASSES:
+            raise ValueError(f"Unknown asset class '{asset_class}', use one of {list(TradingCalendar.ASSET_CLASSES)}")
+        last_date = pd.Timestamp(last_date)
+        if periods <= 0:
+            return pd.DatetimeIndex([], tz=last_date.tz)
+
+        if asset_class == 'fx' and freq == 'H':
+            # 24x5: every hour except Saturday and Sunday, with room for the weekends skipped
+            hours = pd.date_range(last_date, periods=periods * 7 // 5 + 49, freq='h')[1:]
+            return hours[hours.weekday < 5][:periods]
+
+        offset = TradingCalendar._session_offset(asset_class, freq)
+        if offset is None:
+            # newer pandas versions only accept the lower case hourly alias
+            return pd.date_range(last_date, periods=periods + 1, freq='h' if freq == 'H' else freq)[1:]
+        return pd.date_range(last_date + offset, periods=periods, freq=offset)
+
+    @staticmethod
+    def future_dataframe(history_dates, periods, freq='D', asset_class='crypto', include_history=True):
+        """
+        Returns a Prophet future frame, like Prophet.make_future_dataframe() but with sessions only.
+
+        Parameters:
+        -----------
+        history_dates : pandas.Series or pandas.DatetimeIndex
+            The dates of the fitted bars, e.g. model.history_dates.
+        periods : int
+            The number of sessions to forecast.
+        freq : str, optional
+            'D' for daily or 'H' for hourly sessions (default is 'D').
+        asset_class : str, optional
+            'equity', 'fx' or 'crypto' (default is 'crypto').
+        include_history : bool, optional
+            Whether the fitted dates are included (default is True).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            A frame with a single 'ds' column.
+        """
+        history_dates = pd.DatetimeIndex(history_dates)
+        dates = TradingCalendar.future_dates(history_dates.max(), periods, freq, asset_class)
+        if include_history:
+            dates = history_dates.append(dates)
+        return pd.DataFrame({'ds': dates})
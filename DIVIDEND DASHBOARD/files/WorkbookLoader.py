@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import threading
+import pandas as pd
+
+class WorkbookLoader:
+    """
+    Parses every sheet of the dividend workbook once and shares the result between pages.
+
+    The parsed sheets are kept in memory for as long as the workbook on disk is unchanged,
+    and are also written to a Parquet side-cache so a restarted server can skip the slow
+    openpyxl parse. Both tiers are rebuilt only when the workbook mtime/size changes and
+    its content hash no longer matches.
+
+    Attributes:
+    -----------
+    excel_file : str
+        Path to the Excel workbook.
+    cache_dir : str
+        Directory holding the Parquet side-cache and its manifest.
+
+    Methods:
+    --------
+    signature(self)
+        Returns the (mtime, size) pair used to detect changes to the workbook.
+
+    load(self)
+        Returns a dict of every sheet name to its parsed DataFrame.
+
+    get_sheet(self, sheet_name, columns=None)
+        Returns a copy of one parsed sheet, optionally limited to some columns.
+    """
+    # parsed workbooks shared by every instance, keyed by the absolute workbook path
+    _workbooks = {}
+    _lock = threading.Lock()
+
+    def __init__(self, excel_file='data/Dividend_Dashboard.xlsx', cache_dir=None):
+        """
+        Initializes the WorkbookLoader for a workbook path.
+
+        Parameters:
+        -----------
+        excel_file : str, optional
+            Path to the Excel workbook (default is 'data/Dividend_Dashboard.xlsx').
+        cache_dir : str, optional
+            Directory for the Parquet side-cache (default is '.workbook_cache' next to the workbook).
+        """
+        self.excel_file = excel_file
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(excel_file) or '.', '.workbook_cache')
+
+    def signature(self):
+        """
+        Returns the (mtime, size) pair used to detect changes to the workbook.
+
+        Returns:
+        --------
+        tuple
+            The workbook modification time in nanoseconds and its size in bytes.
+        """
+        stat = os.stat(self.excel_file)
+        return stat.st_mtime_ns, stat.st_size
+
+    def load(self):
+        """
+        Returns every sheet of the workbook, parsing it only when it changed on disk.
+
+        Returns:
+        --------
+        dict
+            A dict of sheet name to DataFrame. The frames are shared, use get_sheet() for a copy.
+        """
+        key = os.path.abspath(self.excel_file)
+        signature = self.signature()
+        cached = WorkbookLoader._workbooks.get(key)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with WorkbookLoader._lock:
+            # another thread may have reloaded the workbook while we waited for the lock
+            cached = WorkbookLoader._workbooks.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+            digest = self._file_digest()
+            sheets = self._read_side_cache(signature, digest)
+            if sheets is None:
+                sheets = pd.read_excel(self.excel_file, sheet_name=None)
+                sheets = {name: self._normalise_types(df) for name, df in sheets.items()}
+                self._write_side_cache(signature, digest, sheets)
+            WorkbookLoader._workbooks[key] = (signature, sheets)
+            return sheets
+
+    def sheet_names(self):
+        """
+        Returns the names of the sheets in the workbook.
+
+        Returns:
+        --------
+        list
+            The sheet names in workbook order.
+        """
+        return list(self.load().keys())
+
+    def get_sheet(self, sheet_name, columns=None):
+        """
+        Returns a copy of one parsed sheet.
+
+        Parameters:
+        -----------
+        sheet_name : str
+            The name of the sheet to return.
+        columns : list, optional
+            The columns to keep (default is all columns).
+
+        Returns:
+        --------
+        pandas.DataFrame
+            A copy of the sheet that callers are free to modify.
+
+        Raises:
+        -------
+        KeyError
+            If the sheet does not exist in the workbook.
+        """
+        sheets = self.load()
+        if sheet_name not in sheets:
+            raise KeyError(f"Sheet '{sheet_name}' not found in {self.excel_file}")
+        df = sheets[sheet_name]
+        if columns is not None:
+            df = df[columns]
+        return df.copy()
+
+    @staticmethod
+    def _normalise_types(df):
+        """
+        Gives every column a single type so the sheet can be stored in a columnar format.
+
+        Column names are converted to strings and object columns holding a mix of strings
+        and numbers (e.g. '#VALUE!' cells) are converted to strings, keeping missing values.
+        """
+        df.columns = [str(column) for column in df.columns]
+        for column in df.columns:
+            if df[column].dtype != object:
+                continue
+            values = df[column].dropna()
+            if not values.map(lambda value: isinstance(value, str)).all():
+                df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+        return df
+
+    def _file_digest(self):
+        # hash the workbook so a touched but unchanged file can reuse the side-cache
+        sha = hashlib.sha256()
+        with open(self.excel_file, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _manifest_path(self):
+        return os.path.join(self.cache_dir, 'manifest.json')
+
+    def _read_side_cache(self, signature, digest):
+        manifest_path = self._manifest_path()
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path) as file:
+                manifest = json.load(file)
+            if manifest.get('sha256') != digest:
+                return None
+            sheets = {name: pd.read_parquet(os.path.join(self.cache_dir, filename))
+                      for name, filename in manifest['sheets'].items()}
+        except (ImportError, OSError, ValueError, KeyError) as e:
+            print(f"Ignoring workbook side-cache: {e}")
+            return None
+        # the content is unchanged, remember the new mtime so the next check is cheap
+        if tuple(manifest.get('signature', ())) != signature:
+            manifest['signature'] = list(signature)
+            self._write_manifest(manifest)
+        return sheets
+
+    def _write_side_cache(self, signature, digest, sheets):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            filenames = {}
+            for i, (name, df) in enumerate(sheets.items()):
+                filename = f'sheet_{i}.parquet'
+                df.to_parquet(os.path.join(self.cache_dir, filename), index=False)
+                filenames[name] = filename
+        except (ImportError, OSError, ValueError) as e:
+            # the side-cache is optional, the in-memory copy is still used
+            print(f"Unable to write workbook side-cache: {e}")
+            return
+        self._write_manifest({'signature': list(signature), 'sha256': digest, 'sheets': filenames})
+
+    def _write_manifest(self, manifest):
+        # write to a temporary file first so a crash never leaves a half written manifest
+        tmp_path = self._manifest_path() + '.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(manifest, file)
+            os.replace(tmp_path, self._manifest_path())
+        except OSError as e:
+            print(f"Unable to write workbook side-cache manifest: {e}")
@@ -0,0 +1,275 @@
+import multiprocessing
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from files.BandEngine import BandEngine
+from files.StockDataFetcher import StockDataFetcher
+from files.DataProcessor import DataProcessor
+from files.ForecastProcessor import ForecastProcessor
+
+class YieldScreener:
+    """
+    Screens dividend candidates in parallel across a process pool.
+
+    Screening runs in two stages. prefilter() downloads the closes of every candidate in
+    one request and keeps the ones near their lower band with the vectorized BandEngine.
+    Each survivor is then fetched, forecast with Prophet and checked against the lower band
+    in a worker process. Results are collected as they complete so the page can show each
+    qualifying chart without waiting for the slowest ticker.
+
+    Attributes:
+    -----------
+    max_workers : int
+        The number of worker processes.
+    prefilter_window : int
+        The number of bars in each regression of the first stage.
+    prefilter_margin : float
+        How far above the fast lower band a close may be and still reach Prophet.
+    tier : str
+        The ForecastProcessor fidelity tier of the Prophet stage.
+
+    Methods:
+    --------
+    prefilter(self, tickers, period='2y')
+        Returns the tickers whose last close is near their fast lower band.
+
+    screen_symbol(symbol, tier='screen')
+        Forecasts one symbol and reports whether its last close is below the lower band.
+
+    start(self, tickers)
+        Submits the tickers to the pool and returns a job id.
+
+    cancel(self, job_id)
+        Cancels the tickers of a job that have not started yet.
+
+    collect(self, job_id)
+        Returns the results completed since the last call and whether the job is done.
+    """
+    # spawned workers import the app's main module, and with it every page, again. These
+    # flags keep the pages from starting their warm-ups and the bar stream in the workers
+    WORKER_ENV = {'PAGE_WARMUP': '0', 'FORECAST_WARMUP': '0', 'DIVIDEND_WARMUP': '0', 'MT4_STREAM': '0'}
+
+    def __init__(self, max_workers=None, prefilter_window=60, prefilter_margin=0.02, tier='screen'):
+        """
+        Initializes the YieldScreener. The process pool is created on the first job.
+
+        Parameters:
+        -----------
+        max_workers : int, optional
+            The number of worker processes (default is the number of CPUs).
+        prefilter_window : int, optional
+            The number of bars in each regression of the first stage (default is 60).
+        prefilter_margin : float, optional
+            How far above the fast lower band a close may be and still reach Prophet
+            (default is 0.02). The bands of the two stages are close but not identical, so
+            the margin keeps borderline tickers for Prophet to decide.
+        tier : str, optional
+            The ForecastProcessor fidelity tier of the Prophet stage (default is 'screen').
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.prefilter_window = prefilter_window
+        self.prefilter_margin = prefilter_margin
+        self.tier = tier
+        self._executor = None
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def process_forecast(forecast_df):
+        """
+        Smooths the Prophet prediction and bands with DataProcessor, keeping the ds column
+        for charting.
+
+        Parameters:
+        -----------
+        forecast_df : pandas.DataFrame
+            The forecast returned by Prophet.
+
+        Returns:
+        --------
+        pandas.DataFrame
+            The ds, predicted_price, lower_band, upper_band and trend columns.
+        """
+        processed = DataProcessor.process_prophet_forecast(forecast_df)
+        return processed.rename_axis('ds').reset_index()
+
+    @staticmethod
+    def screen_symbol(symbol, tier='screen'):
+        """
+        Forecasts one symbol and reports whether its last close is below the lower band.
+
+        This runs in a worker process, so it only uses module level imports from files/.
+
+        Parameters:
+        -----------
+        symbol : str
+            The ticker to screen.
+        tier : str, optional
+            The ForecastProcessor fidelity tier (default is 'screen').
+
+        Returns:
+        --------
+        tuple
+            (symbol, data, processed_forecast, None) if the symbol qualifies, (symbol, None,
+            None, None) if it does not and (symbol, None, None, error) if it could not be screened.
+        """
+        try:
+            stock_data_fetcher = StockDataFetcher()
+            stock_data_fetcher.set_ticker(symbol)
+            data = stock_data_fetcher.fetch_data()
+            prep_data = DataProcessor.prepare_data_for_prophet(data)
+            forecast = ForecastProcessor.prophet_forecast(prep_data, model_key=symbol, tier=tier, asset_class='equity')
+            processed_forecast = YieldScreener.process_forecast(forecast)
+            # check if price is less then the lower band
+            last_date = data.index[-1].tz_localize(None).normalize()
+            price = data['Close'].iloc[-1]
+            lower_band = processed_forecast.loc[processed_forecast['ds'] == last_date, 'lower_band'].values[0]
+        except Exception as e:
+            print(f"Error screening {symbol}: {e}")
+            return symbol, None, None, str(e)
+        if price < lower_band:
+            return symbol, data, processed_forecast, None
+        return symbol, None, None, None
+
+    def prefilter(self, tickers, period='2y'):
+        """
+        Returns the tickers whose last close is near their lower band, using BandEngine.
+
+        Parameters:
+        -----------
+        tickers : list
+            The candidate tickers.
+        period : str, optional
+            The period of daily closes to download (default is '2y', like screen_symbol()).
+
+        Returns:
+        --------
+        list
+            The tickers to screen with Prophet, in their original order. Tickers whose
+            closes cannot be downloaded are kept so nothing is missed.
+        """
+        if not tickers:
+            return []
+        # a few bulk downloads, which also fill the bar store for the Prophet stage
+        frames, failed = StockDataFetcher.fetch_many(tickers, period=period)
+        if not frames:
+            print("Error prefiltering the candidates, screening all of them")
+            return list(tickers)
+        try:
+            closes = pd.concat({ticker: data['Close'] for ticker, data in frames.items()}, axis=1).sort_index()
+            survivors = set(BandEngine.below_lower_band(closes, window=self.prefilter_window,
+                                                        margin=self.prefilter_margin))
+        except Exception as e:
+            print(f"Error prefiltering the candidates, screening all of them: {e}")
+            return list(tickers)
+        # the tickers that failed to download are left to the Prophet stage
+        survivors.update(failed)
+        return [ticker for ticker in tickers if ticker in survivors]
+
+    @staticmethod
+    def _init_worker():
+        # keep the flags for anything the worker reads from the environment later
+        os.environ.update(YieldScreener.WORKER_ENV)
+
+    @staticmethod
+    @contextmanager
+    def _worker_env():
+        # a spawned worker imports the pages before its initializer runs, so the flags have
+        # to be in the environment it inherits. They are restored once the workers started
+        previous = {name: os.environ.get(name) for name in YieldScreener.WORKER_ENV}
+        os.environ.update(YieldScreener.WORKER_ENV)
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    def _get_executor(self):
+        if self._executor is None:
+            # forked workers would inherit the locks and threads of the dashboard, e.g. the
+            # warm-ups and the bar stream, so they are spawned
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=YieldScreener._init_worker,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def start(self, tickers):
+        """
+        Submits the tickers to the process pool.
+
+        Parameters:
+        -----------
+        tickers : list
+            The tickers to screen.
+
+        Returns:
+        --------
+        str
+            The id of the job, used with collect().
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            executor = self._get_executor()
+            # the pool starts its workers on submit
+            with YieldScreener._worker_env():
+                futures = [executor.submit(YieldScreener.screen_symbol, ticker, self.tier) for ticker in tickers]
+            self._jobs[job_id] = {'tickers': list(tickers), 'futures': futures, 'collected': set()}
+        return job_id
+
+    def cancel(self, job_id):
+        """
+        Cancels the tickers of a job that have not started yet and forgets the job.
+
+        Parameters:
+        -----------
+        job_id : str
+            The id returned by start().
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job:
+            for future in job['futures']:
+                future.cancel()
+
+    def collect(self, job_id):
+        """
+        Returns the results completed since the last call.
+
+        Parameters:
+        -----------
+        job_id : str
+            The id returned by start().
+
+        Returns:
+        --------
+        tuple
+            A list of newly completed (symbol, data, processed_forecast, error) results, the number
+            of tickers screened so far, the total number of tickers and whether the job is done.
+            Unknown job ids are reported as done with no results.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return [], 0, 0, True
+            results = []
+            for i, future in enumerate(job['futures']):
+                if i in job['collected'] or not future.done():
+                    continue
+                job['collected'].add(i)
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # the worker process died, the ticker is reported as failed
+                    print(f"Error collecting screening result: {e}")
+                    results.append((job['tickers'][i], None, None, str(e) or type(e).__name__))
+            completed = len(job['collected'])
+            total = len(job['futures'])
+            done = completed == total
+            if done:
+                del self._jobs[job_id]
+            return results, completed, total, done
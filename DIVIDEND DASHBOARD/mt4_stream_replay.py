@@ -0,0 +1,49 @@
+"""
+Plays the role of the EA for the MT4 bar stream of Market Watch.
+
+Connects to the BarStreamServer started with MT4_STREAM=1 and sends the bars of MT4 CSV
+files as 'symbol;period;date;open;high;low;close' lines, the way the EA would on start
+up. With --follow it keeps polling the files and sends the bars that changed, so the
+stream can be tried without MetaTrader running.
+
+Usage:
+    python mt4_stream_replay.py data/mt4 EURUSD GBPUSD
+    python mt4_stream_replay.py data/mt4 EURUSD --period 60 --follow --port 5555
+"""
+import argparse
+import os
+import socket
+import time
+
+def read_lines(base_path, symbol, period):
+    # the CSV lines are 'date;open;high;low;close', prefixed with the symbol and timeframe
+    with open(os.path.join(base_path, f'{symbol}_{period}.csv'), 'rb') as file:
+        return [f'{symbol};{period};'.encode() + line.strip() + b'\n'
+                for line in file if line.endswith(b'\n') and line.strip()]
+
+def replay(base_path, symbols, period='1440', host='127.0.0.1', port=5555, follow=False, poll_seconds=1.0):
+    sent = {}
+    with socket.create_connection((host, port)) as connection:
+        while True:
+            for symbol in symbols:
+                lines = read_lines(base_path, symbol, period)
+                # the whole window first, then only the bars that are new or still forming
+                new_lines = [line for line in lines if line not in sent.get(symbol, set())]
+                if new_lines:
+                    connection.sendall(b''.join(new_lines))
+                    print(f'sent {len(new_lines)} bars of {symbol} {period}')
+                sent[symbol] = set(lines)
+            if not follow:
+                return
+            time.sleep(poll_seconds)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('base_path', help='the folder of the MT4 CSV files')
+    parser.add_argument('symbols', nargs='+', help='the symbols to send')
+    parser.add_argument('--period', default='1440', help='the timeframe in minutes (default 1440)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('MT4_STREAM_PORT', 5555)))
+    parser.add_argument('--follow', action='store_true', help='keep sending the bars that change')
+    args = parser.parse_args()
+    replay(args.base_path, args.symbols, args.period, args.host, args.port, args.follow)
@@ -1,12 +1,22 @@
 import dash
-from dash import html, dcc, dash_table, Input, Output, callback
+import os
+import threading
+from dash import html, dcc, dash_table, Input, Output, callback, callback_context, no_update
 from datetime import date, datetime
-import pandas as pd
-import plotly.express as px
+from files.WorkbookLoader import WorkbookLoader
+from files.PortfolioStore import PortfolioStore
+from files.DateRangeIndex import DateRangeIndex
+from files.TableBackend import TableBackend
+from files.TableBackendStore import TableBackendStore
+
+############### Object Instantiation ###############
+workbook_loader = WorkbookLoader('./data/Dividend_Dashboard.xlsx')
+portfolio_store = PortfolioStore(workbook_loader=workbook_loader)
 
 #################### FUNCTIONS ####################
 def create_dividend_chart(data):
-    # Create the line chart
+    # Create the line chart, plotly express is imported on first use
+    import plotly.express as px
     fig = px.line(data, x='pay_date', y='next_div_earned', color='Ticker', markers=True,
                 title='Dividend Payout Over Time')
     # Update layout
@@ -42,98 +52,167 @@ def set_decimal_places(df, column_name, decimal_places):
     df[column_name] = df[column_name].round(decimal_places)
     return df
 
-def calculate_upcoming_dividends():
-    #  read in the dividend_info sheet
-    dividend_info_df = pd.read_excel('./data/Dividend_Dashboard.xlsx', sheet_name='dividend_info')
+def get_upcoming_dividends_index():
+    """
+    Returns the upcoming dividends indexed by pay_date.
+
+    The index is rebuilt only when the workbook changes, so filtering by date range
+    is a binary search instead of a fresh read of the dividend_info table.
+
+    Returns
+    -------
+    DateRangeIndex
+        The dividend_info rows sorted by pay_date.
+    """
+    signature = workbook_loader.signature()
+    index = UPCOMING_DIVIDENDS_INDEX.get('index')
+    if index is None or index.version != signature:
+        #  read in the dividend_info table
+        dividend_info_df = portfolio_store.get_dividend_info()
+        index = DateRangeIndex(dividend_info_df, 'pay_date', version=signature)
+        UPCOMING_DIVIDENDS_INDEX['index'] = index
+    return index
+
+def format_dividend_dates(df):
     # Format dates as 'year-month-day'
+    dividend_info_df = df.copy()
     dividend_info_df['ex_dividend_date'] = dividend_info_df['ex_dividend_date'].dt.strftime('%Y-%m-%d')
     dividend_info_df['pay_date'] = dividend_info_df['pay_date'].dt.strftime('%Y-%m-%d')
     return dividend_info_df
 
-#################### LOAD DATA ####################
-upcoming_dividends_df = calculate_upcoming_dividends()
+def warm_upcoming_dividends_index():
+    # build the index before the first view, an unreadable workbook is reported on the view
+    try:
+        get_upcoming_dividends_index()
+    except Exception as e:
+        print(f"Unable to warm the upcoming dividends: {e}")
+
+def calculate_upcoming_dividends(start_date=None, end_date=None):
+    # slice the pay_date index and format only the rows that are returned
+    dividend_info_df = get_upcoming_dividends_index().slice(start_date, end_date)
+    return format_dividend_dates(dividend_info_df)
 
 #################### CONSTANTS ####################
 MONEY_FORMAT = dash_table.FormatTemplate.money(2)
-START_DATE = date.today()
-# set the end date to the end of the month
-END_DATE = upcoming_dividends_df['pay_date'].max()
+# number of rows sent to the browser per table page
+PAGE_SIZE = 15
+# build the pay_date index in the background at start up instead of on the first view
+PAGE_WARMUP = os.environ.get('PAGE_WARMUP', '1') == '1'
+
+#################### LOAD DATA ####################
+# cache of the pay_date index, rebuilt when the workbook changes. Nothing is read from
+# the workbook until the page is viewed or warmed up.
+UPCOMING_DIVIDENDS_INDEX = {}
+if PAGE_WARMUP:
+    threading.Thread(target=warm_upcoming_dividends_index, name='warm-dividend-table', daemon=True).start()
 
 dash.register_page(__name__, path='/dividend_table', name='Dividend Table')
 
+############### Object Instantiation ###############
+# one table frame per workbook version and date range, shared by the sessions showing it
+dividend_table_backends = TableBackendStore(page_size=PAGE_SIZE)
+
 #################### PAGE LAYOUT ####################
-layout = html.Div(children=[
-    html.Div([
-        dcc.Graph(id='dividend_chart', figure=create_dividend_chart(upcoming_dividends_df), style={'margin': 'auto'}),
-    ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row'}),
-    html.Div(children=[
+def layout():
+    try:
+        upcoming_dividends_df = calculate_upcoming_dividends()
+    except Exception as e:
+        print(f"Unable to load the upcoming dividends: {e}")
+        return html.Div(children=[
+            html.Br(),
+            html.H3('The upcoming dividends could not be loaded, try again in a moment.', style={'textAlign': 'center', 'margin': 10, 'padding': 0}),
+        ])
+    # set the end date to the last upcoming pay date
+    end_date = upcoming_dividends_df['pay_date'].max()
+    # the table is filled by update_dividend_table on load, for the persisted date range
+    return html.Div(children=[
+        html.Div([
+            dcc.Graph(id='dividend_chart', figure=create_dividend_chart(upcoming_dividends_df), style={'margin': 'auto'}),
+        ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row'}),
         html.Div(children=[
             html.Div(children=[
-                html.H4('Upcoming Dividend Payouts', style={'textAlign': 'left', 'margin': 10, 'paddingTop': 15}),
                 html.Div(children=[
-                    html.H4('Filter by Date: ', style={'textAlign': 'left', 'margin': 10, 'paddingTop': 15}),
-                    dcc.DatePickerRange(id='date_range', start_date=START_DATE, end_date=END_DATE, display_format='YYYY-MM-DD', persistence=True, persisted_props=['start_date', 'end_date'], persistence_type='session',
-                                    style={'margin': 10}),
-                ], style={'display': 'flex'}),
-            ], style={'display': 'flex', 'justifyContent': 'space-between', 'width': '100%'}),
-            dash_table.DataTable(
-                id='dividend_table',
-                    columns=[
-                        {
-                            "name": i, 
-                            "id": i,
-                            "type": "numeric",
-                            "format": MONEY_FORMAT if i in ['cash_amount', 'next_div_earned', 'est_yr_yield'] else None
-                        } for i in upcoming_dividends_df.columns],
-                    data=upcoming_dividends_df.to_dict('records'),
-                    cell_selectable=False,
-                    sort_action='native',
-                    filter_action='native',
-                    style_header={'textAlign': 'center', 'backgroundColor': '#1E1E1E', 'fontWeight': 'bold', 'color': 'white'},
-                    style_filter={'backgroundColor': '#FFEB9C', 'fontWeight': 'bold', 'color': '#9C5700'},
-                    style_cell_conditional=[
-                        {
-                            'if': { 'column_id': ['Ticker', 'frequency', 'Shares', 'next_div_earned', 'est_yr_yield'] },
-                            'textAlign': 'center',
-                        }
-                    ],
-                    style_data_conditional=[
-                        {
-                            'if': {'row_index': 'odd'},
-                            'backgroundColor': '#1E1E1E',
-                            'color': 'white',
-                            'fontWeight': 'bold'
-                        },
-                        {
-                            'if': {'row_index': 'even'},
-                            'backgroundColor': '#adaaaa',  # A light grey for even rows
-                            'color': 'black',
-                            'fontWeight': 'bold'
-                        },
-                    ],
-                    style_as_list_view=False,
-                    style_table={'overflowX': 'scroll', 'width': '100%'}, 
-            )
-        ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'flexDirection': 'column', 'width': '100%'}),
-    ], style={'display': 'flex', 'justifyContent': 'flex-start', 'width': '60%', 'margin': 'auto'}),
-])
+                    html.H4('Upcoming Dividend Payouts', style={'textAlign': 'left', 'margin': 10, 'paddingTop': 15}),
+                    html.Div(children=[
+                        html.H4('Filter by Date: ', style={'textAlign': 'left', 'margin': 10, 'paddingTop': 15}),
+                        dcc.DatePickerRange(id='date_range', start_date=date.today(), end_date=end_date, display_format='YYYY-MM-DD', persistence=True, persisted_props=['start_date', 'end_date'], persistence_type='session',
+                                        style={'margin': 10}),
+                    ], style={'display': 'flex'}),
+                ], style={'display': 'flex', 'justifyContent': 'space-between', 'width': '100%'}),
+                dash_table.DataTable(
+                    id='dividend_table',
+                        columns=[
+                            {
+                                "name": i, 
+                                "id": i,
+                                "type": TableBackend.column_type(upcoming_dividends_df[i]),
+                                "format": MONEY_FORMAT if i in ['cash_amount', 'next_div_earned', 'est_yr_yield'] else None
+                            } for i in upcoming_dividends_df.columns],
+                        data=[],
+                        cell_selectable=False,
+                        page_action='custom',
+                        page_current=0,
+                        page_size=PAGE_SIZE,
+                        page_count=1,
+                        sort_action='custom',
+                        sort_mode='single',
+                        sort_by=[],
+                        filter_action='custom',
+                        filter_query='',
+                        style_header={'textAlign': 'center', 'backgroundColor': '#1E1E1E', 'fontWeight': 'bold', 'color': 'white'},
+                        style_filter={'backgroundColor': '#FFEB9C', 'fontWeight': 'bold', 'color': '#9C5700'},
+                        style_cell_conditional=[
+                            {
+                                'if': { 'column_id': ['Ticker', 'frequency', 'Shares', 'next_div_earned', 'est_yr_yield'] },
+                                'textAlign': 'center',
+                            }
+                        ],
+                        style_data_conditional=[
+                            {
+                                'if': {'row_index': 'odd'},
+                                'backgroundColor': '#1E1E1E',
+                                'color': 'white',
+                                'fontWeight': 'bold'
+                            },
+                            {
+                                'if': {'row_index': 'even'},
+                                'backgroundColor': '#adaaaa',  # A light grey for even rows
+                                'color': 'black',
+                                'fontWeight': 'bold'
+                            },
+                        ],
+                        style_as_list_view=False,
+                        style_table={'overflowX': 'scroll', 'width': '100%'}, 
+                )
+            ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'center', 'flexDirection': 'column', 'width': '100%'}),
+        ], style={'display': 'flex', 'justifyContent': 'flex-start', 'width': '60%', 'margin': 'auto'}),
+    ])
 
 #################### CALLBACKS ####################
 @callback(
     Output('dividend_table', 'data'),
+    Output('dividend_table', 'page_count'),
     Output('dividend_chart', 'figure'),
     Input('date_range', 'start_date'),
-    Input('date_range', 'end_date')
+    Input('date_range', 'end_date'),
+    Input('dividend_table', 'page_current'),
+    Input('dividend_table', 'page_size'),
+    Input('dividend_table', 'sort_by'),
+    Input('dividend_table', 'filter_query')
 )
-def update_dividend_table(start_date_str, end_date_str):
-    # Call the function to get fresh data from the Excel file
-    upcoming_dividends_df = calculate_upcoming_dividends()
-
-    div_df = upcoming_dividends_df.copy()
-    # Filter the dataframe based on the date range using query
-    div_df = div_df.query('pay_date >= @start_date_str and pay_date <= @end_date_str')
-    # create the chart
-    fig = create_dividend_chart(div_df)
-    return div_df.to_dict('records'), fig
+def update_dividend_table(start_date_str, end_date_str, page_current, page_size, sort_by, filter_query):
+    fig = no_update
+    # only rebuild the table frame when the date range or the data changed
+    version = (get_upcoming_dividends_index().version, start_date_str, end_date_str)
+    # Filter the cached pay_date index based on the date range
+    dividend_table_backend, rebuilt = dividend_table_backends.get_or_set(
+        version, lambda: calculate_upcoming_dividends(start_date_str, end_date_str))
+    # the layout draws every upcoming dividend, so the chart follows the range on the first
+    # call of a view and on every range change, paging and sorting leave it as it is
+    trigger_id = callback_context.triggered[0]['prop_id'].split('.')[0] if callback_context.triggered else ''
+    if rebuilt or trigger_id in ('', 'date_range'):
+        fig = create_dividend_chart(dividend_table_backend.frame)
+    records, page_count = dividend_table_backend.query(page_current, page_size, sort_by, filter_query)
+    return records, page_count, fig
 
 
@@ -1,50 +1,58 @@
 import dash
-from dash import html, dcc, Input, Output, callback, dash_table, no_update, State
+from dash import html, dcc, Input, Output, callback, dash_table, no_update, State, Patch
 from dash import callback_context
 import pandas as pd
 from datetime import date, timedelta, datetime, date
-from files.StockDataFetcher import StockDataFetcher
-import requests
-import yfinance as yf
-from prophet import Prophet
+from files.TableBackend import TableBackend
+from files.TableBackendStore import TableBackendStore
+from files.YieldScreener import YieldScreener
+from files.DividendDataFetcher import DividendDataFetcher
+from files.DividendCalendarStore import DividendCalendarStore
+from files.CachedLoader import CachedLoader
 import plotly.graph_objects as go
-import plotly.express as px
 import os
 from dotenv import load_dotenv
-from scipy.signal import savgol_filter
 
 
 load_dotenv('.env')
 
 #################### CONSTANTS ####################
-TODAYS_DATE = date.today()
 MONEY_FORMAT = dash_table.FormatTemplate.money(2)
 DECIMAL_FORMAT = dash_table.FormatTemplate.Format(precision=2, symbol_suffix='%')
 POLYGON_API = os.environ.get('POLYGON_IO_API')
+# number of rows sent to the browser per table page
+PAGE_SIZE = 15
+# number of processes used to forecast the candidates in parallel
+YIELD_HUNTER_WORKERS = int(os.environ.get('YIELD_HUNTER_WORKERS', os.cpu_count() or 1))
+# screen the candidates with the fast band engine first and run Prophet only on the survivors
+YIELD_HUNTER_PREFILTER = os.environ.get('YIELD_HUNTER_PREFILTER', '1') == '1'
+# the Prophet fidelity tier of the second stage, see ForecastProcessor.TIERS
+YIELD_HUNTER_FORECAST_TIER = os.environ.get('YIELD_HUNTER_FORECAST_TIER', 'screen')
+# how long the local ex-dividend calendar is used before it is synced with Polygon again, in seconds
+DIVIDEND_CALENDAR_TTL = int(os.environ.get('DIVIDEND_CALENDAR_TTL', 6 * 3600))
+# how often the page collects finished forecasts, in milliseconds
+SCREENING_POLL_INTERVAL = 1000
+# how long the upcoming ex-dividends chart is reused before it is rebuilt from the calendar, in seconds
+EX_DIVIDEND_CHART_TTL = 15 * 60
+# sync the calendar and build the chart in the background at start up instead of on the first view
+PAGE_WARMUP = os.environ.get('PAGE_WARMUP', '1') == '1'
 
 dash.register_page(__name__, path='/dividend_yield_hunter', name='Dividend Yield Hunter 🏹')
 
 ############### Object Instantiation ###############
-stock_data_fetcher = StockDataFetcher()
+yield_screener = YieldScreener(max_workers=YIELD_HUNTER_WORKERS, tier=YIELD_HUNTER_FORECAST_TIER)
+# the yield table of each screening job, so sessions never page through each other's results
+yield_table_backends = TableBackendStore(page_size=PAGE_SIZE)
+dividend_calendar = DividendCalendarStore(DividendDataFetcher(POLYGON_API), ttl=DIVIDEND_CALENDAR_TTL)
 
 #################### FUNCTIONS ####################
-def fetch_and_filter_dividends(selected_date, api):
-    # Calculate the date one day after today
-    fetch_date = selected_date
-    #  format the date to match "Year-mmonth-day"
-    fetch_date = fetch_date.strftime('%Y-%m-%d')
-
-    url = f'https://api.polygon.io/v3/reference/dividends?ex_dividend_date={fetch_date}&dividend_type=CD&order=asc&limit=1000&sort=ex_dividend_date&apiKey={api}'
-
-    # make a request to the url 
-    response = requests.get(url)
-    # convert the response to json
-    data = response.json()
+def fetch_and_filter_dividends(selected_date):
+    # look up the cash dividends going ex on the selected date in the local calendar,
+    # which syncs every page from Polygon when it is stale
+    df = dividend_calendar.get_dividends(selected_date)
 
     # check if data is empty
-    if data['results']:
-        # create a dataframe from the json data
-        df = pd.DataFrame(data['results'])
+    if not df.empty:
         # create a list from the dataframe ticker column
         ticker_list = df['ticker'].tolist()
     else:
@@ -52,7 +60,8 @@ def fetch_and_filter_dividends(selected_date, api):
         df3 = pd.DataFrame()
         return ticker_list, df3
     
-    # get close prices for the tickers
+    # get close prices for the tickers, yfinance is imported on first use
+    import yfinance as yf
     ticker_prices = yf.download(ticker_list, period='1d', interval='1d', prepost=True, rounding=True)['Close']
     # grap only the last row of the dataframe if there are multiple rows
     ticker_prices = ticker_prices.tail(1)
@@ -78,36 +87,23 @@ def fetch_and_filter_dividends(selected_date, api):
     ticker_list = df3['ticker'].tolist()
     return ticker_list, df3
 
-def forcasting_preparation(df):
-    # todo: add a doc string
-    df = df.reset_index()
-    return df[['Date', 'Close']]
-        
-def forecast_data(data):
-    # todo: add a doc string
-    data = data.rename(columns={'Date': 'ds', 'Close': 'y'})
-    model = Prophet()
-    model.fit(data)
-    future = model.make_future_dataframe(periods=90, freq='D')
-    forecast = model.predict(future)
-    return forecast
-
-def process_forecasted_data(forecast_df):
-    df = forecast_df.copy()
-    # keep only needed columns in the forecast dataframe
-    df = df[['ds', 'yhat', 'yhat_lower', 'yhat_upper', 'trend']]  
-    # use savgol_filter
-    df['predicted_price'] = savgol_filter(df['yhat'], window_length=31, polyorder=2) 
-    df['upper_band'] = savgol_filter(df['yhat_upper'], window_length=31, polyorder=2)
-    df['lower_band'] = savgol_filter(df['yhat_lower'], window_length=31, polyorder=2)
-    return df 
-
-def get_upcoming_ex_dividends(api_key):
+def create_buy_df(dataframe, symbols):
+    buy_df = dataframe[['cash_amount','ex_dividend_date','frequency','pay_date','ticker','close_Prices','percentage','yearly_percentage']]
+    # filter the buy_df for the symbols in the buy_list
+    buy_df = buy_df[buy_df['ticker'].isin(symbols)].copy()
+    # create a column that contains the number of shares to buy based on 100$ investment
+    buy_df['num_shares_100'] = 100 / buy_df['close_Prices']
+    # convert to integer
+    buy_df['num_shares_100'] = buy_df['num_shares_100'].astype(int)
+    buy_df['purchase_cost'] = buy_df['num_shares_100'] * buy_df['close_Prices']
+    buy_df['next_div_pay'] = buy_df['num_shares_100'] * buy_df['cash_amount']
+    buy_df['yr_div_pay'] = buy_df['next_div_pay'] * buy_df['frequency']
+    return buy_df
+
+def get_upcoming_ex_dividends():
     """
-    Fetches and plots the upcoming ex-dividend dates for the current month.
-
-    Parameters:
-    api_key (str): API key for accessing the data source.
+    Plots the upcoming ex-dividend dates for the current month from the local dividend
+    calendar, which holds the Polygon key.
 
     Returns:
     plotly.graph_objs._figure.Figure: A bar plot of the upcoming ex-dividend dates.
@@ -125,38 +121,19 @@ def get_upcoming_ex_dividends(api_key):
     # Set the end date to the end of the start date's month
     end_of_month = start_date.replace(day=28) + timedelta(days=4)
 
-    # Format dates for API call
-    start_date_str = start_date.strftime('%Y-%m-%d')
-    end_of_month_str = end_of_month.strftime('%Y-%m-%d')
-
-    # Calculate the end of the current month
-    end_of_month = today.replace(day=28) + timedelta(days=4)
-
-    # Define the API endpoint with parameters for the date range
-    api_url = f"https://api.polygon.io/v3/reference/dividends?ex_dividend_date.gt={start_date_str}&ex_dividend_date.lt={end_of_month_str}&limit=1000&apiKey={api_key}"
-
-    # Send GET request to the API
-    response = requests.get(api_url)
-    # Convert the response to JSON
-    data = response.json()
-
-    # Create a DataFrame from the API response
-    df = pd.DataFrame(data['results'])
-    if df.empty:
+    # count the stocks going ex on each date in the local calendar, which syncs every
+    # page from Polygon when it is stale. Both ends of the range are excluded.
+    stocks_per_date = dividend_calendar.count_by_ex_date(start_date + timedelta(days=1), end_of_month - timedelta(days=1))
+    if stocks_per_date.empty:
         print("No dividend data available for the given date range.")
         # Handle the scenario, possibly by loading data for a different date range.
 
     try:
-        # Sort DataFrame by the ex-dividend date
-        df.sort_values(by=['ex_dividend_date'], inplace=True)
-
-        # Group by ex_dividend_date and count the number of stocks for each date
-        stocks_per_date = df.groupby(['ex_dividend_date']).size()
-
         # Get the current month's name for the plot title
         current_month = datetime.now().strftime("%B")
 
-        # Create a bar plot with the grouped data
+        # Create a bar plot with the grouped data, plotly express is imported on first use
+        import plotly.express as px
         fig = px.bar(stocks_per_date, title=f'Upcoming Ex-Dividends for {current_month}', width=1550, height=500)
         # Update plot labels
         fig.update_layout(xaxis_title='Ex-Dividend Date', yaxis_title='Number of Stocks', showlegend=False)
@@ -165,126 +142,157 @@ def get_upcoming_ex_dividends(api_key):
 
         # return the plot
         return fig
-    except KeyError as e:
-        print(f"ex_dividend_date - Column not found in DataFrame: {e}")
+    except (KeyError, ValueError) as e:
+        print(f"Unable to plot the upcoming ex-dividends: {e}")
 
-    
+#################### LOAD DATA ####################
+# nothing is fetched from Polygon until the page is viewed or warmed up
+ex_dividends_chart_loader = CachedLoader(get_upcoming_ex_dividends, name='the upcoming ex-dividends',
+                                         ttl=EX_DIVIDEND_CHART_TTL)
+if PAGE_WARMUP:
+    ex_dividends_chart_loader.warm()
 
 #################### PAGE LAYOUT ####################
-layout = html.Div(children=[
-    html.Div(children=[
-        html.Br(),
-        html.H4(f'Dividend Yield Hunter {TODAYS_DATE}', style={'textAlign': 'center', 'margin': 10, 'padding': 0}),
-        html.Div(children=[
-            dcc.DatePickerSingle(id='user_date', date=TODAYS_DATE, display_format='YYYY-MM-DD'),
-        ], style={'margin': 30}),
+def layout():
+    todays_date = date.today()
+    # an empty chart if the calendar could not be synced or plotted
+    ex_dividends_chart = ex_dividends_chart_loader.get() or {}
+    return html.Div(children=[
         html.Div(children=[
-            html.Button('Find Dividends', id='find-button', className='btn btn-outline-dark', n_clicks=0, style={'margin': 10}),
-            html.Button('Clear Charts', id='clear-button', className='btn btn-outline-danger', n_clicks=0, style={'margin': 10}),
-        ], style={'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'row', 'margin': 20})
-    ]),
-    # html.Div(id='Upcoming_exDividend_chart_container', children=[
-    #     # insert a dcc.graph here
-    #     dcc.Loading(
-    #         id="circle",
-    #         type="graph", # This can be "graph", "cube", "circle", "dot", or "default"
-    #         children=dcc.Graph(id='Upcoming_exDividend_chart', figure=get_upcoming_ex_dividends(POLYGON_API))
-    #     )
-    # ], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'margin': 20}),
-    dcc.Loading(
-        id="loading",
-        type="graph", # This can be "graph", "cube", "circle", "dot", or "default"
-        children=html.Div(id='container', children=[
-            dcc.Graph(id='Upcoming_exDividend_chart', figure=get_upcoming_ex_dividends(POLYGON_API))
-        ], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'margin': 20})
-    ),
-])
+            html.Br(),
+            html.H4(f'Dividend Yield Hunter {todays_date}', style={'textAlign': 'center', 'margin': 10, 'padding': 0}),
+            html.Div(children=[
+                dcc.DatePickerSingle(id='user_date', date=todays_date, display_format='YYYY-MM-DD'),
+            ], style={'margin': 30}),
+            html.Div(children=[
+                html.Button('Find Dividends', id='find-button', className='btn btn-outline-dark', n_clicks=0, style={'margin': 10}),
+                html.Button('Clear Charts', id='clear-button', className='btn btn-outline-danger', n_clicks=0, style={'margin': 10}),
+            ], style={'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'row', 'margin': 20})
+        ]),
+        # html.Div(id='Upcoming_exDividend_chart_container', children=[
+        #     # insert a dcc.graph here
+        #     dcc.Loading(
+        #         id="circle",
+        #         type="graph", # This can be "graph", "cube", "circle", "dot", or "default"
+        #         children=dcc.Graph(id='Upcoming_exDividend_chart', figure=get_upcoming_ex_dividends())
+        #     )
+        # ], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'margin': 20}),
+        dcc.Loading(
+            id="loading",
+            type="graph", # This can be "graph", "cube", "circle", "dot", or "default"
+            children=html.Div(id='container', children=[
+                dcc.Graph(id='Upcoming_exDividend_chart', figure=ex_dividends_chart)
+            ], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'margin': 20})
+        ),
+        # the screening results stream in here, outside the loading component so it does not flicker
+        html.H5(id='screening_status', style={'textAlign': 'center', 'margin': 10, 'padding': 0, 'color': 'white'}),
+        html.Div(id='screening_results', children=[], style={'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'margin': 20}),
+        dcc.Interval(id='screening_interval', interval=SCREENING_POLL_INTERVAL, n_intervals=0, disabled=True),
+        dcc.Store(id='screening_job'),
+    ])
+
+#################### SCREENING JOBS ####################
+# the dividend data and qualifying symbols of each running screening job
+SCREENING_JOBS = {}
+NO_OPPORTUNITIES = html.H3('There are no dividends opportunities', style={'textAlign': 'center', 'margin': 10, 'padding': 0, 'color': 'white'})
 
 @callback(
-    [Output('container', 'children'), Output('find-button', 'n_clicks')],
+    [Output('container', 'children'), Output('find-button', 'n_clicks'),
+     Output('screening_results', 'children'), Output('screening_status', 'children'),
+     Output('screening_job', 'data'), Output('screening_interval', 'disabled')],
     [Input('clear-button', 'n_clicks'), Input('find-button', 'n_clicks'), Input('user_date', 'date')],
+    State('screening_job', 'data'),
     prevent_initial_call=True
 )
-def update_output(clear_clicks, find_clicks, date):
+def update_output(clear_clicks, find_clicks, date, running_job_id):
     # Determine which input was triggered
     ctx = callback_context
     if not ctx.triggered:
-        return no_update, no_update  # In case the callback was triggered without any of the specified inputs being clicked
+        return [no_update] * 6  # In case the callback was triggered without any of the specified inputs being clicked
 
     # Get the ID of the button that triggered the callback
     button_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
     # If the clear button was clicked, clear the charts and reset find button clicks
     if button_id == 'clear-button':
-        chart = get_upcoming_ex_dividends(POLYGON_API)
-        return [dcc.Graph(id='Upcoming_exDividend_chart', figure=chart)], 0
+        # stop the running screening job, if any
+        if running_job_id:
+            yield_screener.cancel(running_job_id)
+            SCREENING_JOBS.pop(running_job_id, None)
+        chart = ex_dividends_chart_loader.get() or {}
+        return [dcc.Graph(id='Upcoming_exDividend_chart', figure=chart)], 0, [], '', None, True
         
-    # If the find button was clicked, generate the graphs
+    # If the find button was clicked, start screening the candidates
     elif button_id == 'find-button':
         # If the find button has not been clicked, do not update the graphs
         if find_clicks <= 0:
-            return no_update, no_update
+            return [no_update] * 6
 
         # convert the date to a datetime object and format it
         date = datetime.strptime(date, '%Y-%m-%d').date()
-        ticker_list, dataframe = fetch_and_filter_dividends(date, POLYGON_API)
+        ticker_list, dataframe = fetch_and_filter_dividends(date)
 
         # If there are no dividends tomorrow, do not update the graphs
-        if ticker_list:
-            buy_list = []
-
-            for symbol in ticker_list:
-                # set the symbol
-                stock_data_fetcher.set_ticker(symbol)
-                # fetch the data
-                data = stock_data_fetcher.fetch_data()
-                forcasting_prep = forcasting_preparation(data)
-                forecast = forecast_data(forcasting_prep)
-                processed_forecast = process_forecasted_data(forecast)
-                # check if price is less then the lower band
-                date = data.index[-1].strftime('%Y-%m-%d')
-                price = data.Close[-1]
-                lower_band = processed_forecast.query(f'ds == "{date}"')['lower_band'].values[0]
-                # # check if the price is below the lower band
-                if price < lower_band:
-                    # visualize the data
-                    # plotly_visualize_forecast(symbol, data, processed_forecast)
-                    # append symbol to the short list
-                    buy_list.append([symbol, data, processed_forecast])
-
-            # if there are no stocks to buy return a message
-            if not buy_list:
-                components_to_return = html.H3('There are no dividends opportunities', style={'textAlign': 'center', 'margin': 10, 'padding': 0, 'color': 'white'}), find_clicks
-                return components_to_return, find_clicks
-            
-            buy_df = dataframe[['cash_amount','ex_dividend_date','frequency','pay_date','ticker','close_Prices','percentage','yearly_percentage']]
-            # extract the symbols from the buy_list
-            symbols = [sub_list[0] for sub_list in buy_list]
-            # filter the buy_df for the symbols in the buy_list
-            buy_df = buy_df[buy_df['ticker'].isin(symbols)]
-            # create a column that contains the number of shares to buy based on 100$ investment
-            buy_df['num_shares_100'] = 100 / buy_df['close_Prices']
-            # convert to integer
-            buy_df['num_shares_100'] = buy_df['num_shares_100'].astype(int)
-            buy_df['purchase_cost'] = buy_df['num_shares_100'] * buy_df['close_Prices']
-            buy_df['next_div_pay'] = buy_df['num_shares_100'] * buy_df['cash_amount']
-            buy_df['yr_div_pay'] = buy_df['next_div_pay'] * buy_df['frequency']    
-
-            # Generate graphs for each item in the list
-            graphs = [create_chart(symbol) for symbol in buy_list]
-            # generate the yield table 
-            yield_table = create_table(buy_df)
-            
-            # Now append the yield_table_component to your graphs list or any other container list
-            # that you are using to return the layout components
-            components_to_return = graphs + [yield_table]
-        else:
-            components_to_return = html.H3('There are no dividends opportunities', style={'textAlign': 'center', 'margin': 10, 'padding': 0, 'color': 'white'})
-        # Make sure to return the correct number of outputs
-        return components_to_return, find_clicks
+        if not ticker_list:
+            return NO_OPPORTUNITIES, find_clicks, [], '', None, True
+
+        if running_job_id:
+            yield_screener.cancel(running_job_id)
+            SCREENING_JOBS.pop(running_job_id, None)
+        # drop the candidates far from their lower band before paying for Prophet
+        if YIELD_HUNTER_PREFILTER:
+            ticker_list = yield_screener.prefilter(ticker_list)
+            if not ticker_list:
+                return NO_OPPORTUNITIES, find_clicks, [], '', None, True
+        # fan the candidates out across the process pool, stream_screening_results collects them
+        job_id = yield_screener.start(ticker_list)
+        SCREENING_JOBS[job_id] = {'dividends': dataframe, 'buy_list': [], 'failed': []}
+        status = f'Screening 0/{len(ticker_list)} tickers...'
+        return [], find_clicks, [], status, job_id, False
     
     # If the callback was not triggered by one of the buttons we're interested in
-    return no_update, no_update
+    return [no_update] * 6
+
+@callback(
+    Output('screening_results', 'children', allow_duplicate=True),
+    Output('screening_status', 'children', allow_duplicate=True),
+    Output('screening_interval', 'disabled', allow_duplicate=True),
+    Input('screening_interval', 'n_intervals'),
+    State('screening_job', 'data'),
+    prevent_initial_call=True
+)
+def stream_screening_results(n, job_id):
+    job = SCREENING_JOBS.get(job_id)
+    if job is None:
+        return no_update, no_update, True
+
+    results, completed, total, done = yield_screener.collect(job_id)
+    # append the chart of each qualifying symbol as soon as its forecast is done
+    charts = Patch()
+    has_changes = False
+    for symbol, data, processed_forecast, error in results:
+        # a failed download or forecast is reported, not mistaken for a symbol that does not qualify
+        if error is not None:
+            job['failed'].append(symbol)
+        if data is None:
+            continue
+        job['buy_list'].append([symbol, data, processed_forecast])
+        charts.append(create_chart([symbol, data, processed_forecast]))
+        has_changes = True
+
+    failed = f", failed: {', '.join(job['failed'])}" if job['failed'] else ''
+    if not done:
+        return charts if has_changes else no_update, f'Screening {completed}/{total} tickers...{failed}', False
+
+    # every candidate was screened, add the yield table for the qualifying symbols
+    SCREENING_JOBS.pop(job_id, None)
+    if job['buy_list']:
+        # extract the symbols from the buy_list
+        symbols = [sub_list[0] for sub_list in job['buy_list']]
+        charts.append(create_table(create_buy_df(job['dividends'], symbols), job_id))
+    else:
+        charts.append(NO_OPPORTUNITIES)
+    return charts, f'Screened {total} tickers{failed}', True
 
 
 def create_chart(symbol):
@@ -346,22 +354,32 @@ def plotly_visualize_forecast(symbol, data, forcast_processed, width=1200, heigh
     fig.add_trace(go.Scatter(x=forcast_processed.ds, y=forcast_processed.lower_band, line=dict(color='#1E82CD', width=2), name='lower_band'))
     return fig
 
-def create_table(df):
+def create_table(df, job_id):
+    # keep the full frame of the job on the server and only send the first page
+    yield_table_backend = yield_table_backends.set(job_id, df)
+    first_page, page_count = yield_table_backend.query(0, PAGE_SIZE, [], '')
     return dash_table.DataTable(
         id='yield_table',
                     columns=[
                         {
                             "name": i, 
                             "id": i,
-                            "type": "numeric",
+                            "type": TableBackend.column_type(df[i]),
                             "format": MONEY_FORMAT if i in ['cash_amount', 'close_Prices', 'purchase_cost', 'next_div_pay', 'yr_div_pay'] 
                             else DECIMAL_FORMAT if i in ['percentage', 'yearly_percentage']
                             else None
                         } for i in df.columns],
-                    data=df.to_dict('records'),
+                    data=first_page,
                     cell_selectable=False,
-                    sort_action='native',
-                    filter_action='native',
+                    page_action='custom',
+                    page_current=0,
+                    page_size=PAGE_SIZE,
+                    page_count=page_count,
+                    sort_action='custom',
+                    sort_mode='single',
+                    sort_by=[],
+                    filter_action='custom',
+                    filter_query='',
                     style_header={'textAlign': 'center', 'backgroundColor': '#1E1E1E', 'fontWeight': 'bold', 'color': 'white'},
                     style_filter={'backgroundColor': '#FFEB9C', 'fontWeight': 'bold', 'color': '#9C5700'},
                     style_cell_conditional=[
@@ -388,3 +406,20 @@ def create_table(df):
                     style_table={'overflowX': 'scroll', 'width': '100%'}
     )
             
+
+@callback(
+    Output('yield_table', 'data'),
+    Output('yield_table', 'page_count'),
+    Input('yield_table', 'page_current'),
+    Input('yield_table', 'page_size'),
+    Input('yield_table', 'sort_by'),
+    Input('yield_table', 'filter_query'),
+    State('screening_job', 'data'),
+    prevent_initial_call=True
+)
+def update_yield_table(page_current, page_size, sort_by, filter_query, job_id):
+    # answer paging, sorting and filtering from the frame create_table cached for this job
+    yield_table_backend = yield_table_backends.get(job_id)
+    if yield_table_backend is None:
+        return no_update, no_update
+    return yield_table_backend.query(page_current, page_size, sort_by, filter_query)
@@ -1,48 +1,55 @@
 import dash
-from dash import html, dcc, Input, Output, callback, dash_table
-import plotly.express as px
+from dash import html, dcc, Input, Output, State, callback, dash_table, no_update, Patch
+from dash import callback_context
 import pandas as pd
 import datetime as datetime
 import numpy as np
+import os
+from files.WorkbookLoader import WorkbookLoader
+from files.PortfolioStore import PortfolioStore
+from files.TableBackend import TableBackend
+from files.HoldingsWatcher import HoldingsWatcher
+from files.CachedLoader import CachedLoader
 
 #################### CONSTANTS ####################
 MONEY_FORMAT = dash_table.FormatTemplate.money(2)
 PERCENTAGE_FORMAT = dash_table.FormatTemplate.percentage(2)
-# get the current date and time
-CURRENT_TIME = datetime.datetime.now()
-# reformat to not show microseconds
-CURRENT_TIME = CURRENT_TIME.strftime("%Y-%m-%d %H:%M:%S")
 # excel file path
 EXCEL_FILE = 'data/Dividend_Dashboard.xlsx'
+# number of rows sent to the browser per table page
+PAGE_SIZE = 15
+# how often the browser asks whether the holdings changed, in milliseconds
+HOLDINGS_POLL_INTERVAL = 5*1000
+# load the charts and holdings in the background at start up instead of on the first view
+PAGE_WARMUP = os.environ.get('PAGE_WARMUP', '1') == '1'
+
+############### Object Instantiation ###############
+workbook_loader = WorkbookLoader(EXCEL_FILE)
+portfolio_store = PortfolioStore(workbook_loader=workbook_loader)
+holdings_table_backend = TableBackend(page_size=PAGE_SIZE)
 
 #################### FUNCTIONS ####################
-def get_yr_div_profits(sheet_names):
-    yr_div_profits = {}
-    for sheet in sheet_names:
-        data = pd.read_excel(EXCEL_FILE, sheet_name=sheet)
-        div_profits = round(data['Amount'].sum(), 2)
-        yr_div_profits[sheet] = div_profits
-    df = pd.DataFrame.from_dict(yr_div_profits, orient='index', columns=['Amount'])
+def get_yr_div_profits(years):
+    # sum the dividends paid per year in the portfolio store
+    df = portfolio_store.get_dividend_totals_by_year(years)
     return df
 
 def get_current_holdings():
-    #  read in the current holdings sheet
-    c_holdings_df = pd.read_excel(EXCEL_FILE, sheet_name='current_holdings')
+    #  read in the current holdings, already sorted by the G/L ($)
+    c_holdings_df = portfolio_store.get_current_holdings()
     #  keep only the columns we need
     c_holdings_df = c_holdings_df[['Ticker', 'Date Op.', 'Shares', 'Close' , 'Pur. Price', 'Exit Price', 'Amt. Paid', 'Pos. Value', 'G/L ($)', 'G/L (%)', 'Div. Earned']]
     # rounding the values to 2 decimal places
     c_holdings_df = c_holdings_df.round(2)
     # convert the shares to int type
     c_holdings_df['Shares'] = c_holdings_df['Shares'].astype(int)
-    # sort the values by the G/L ($)
-    c_holdings_df = c_holdings_df.sort_values(by='G/L ($)', ascending=False)
-    # convert the Date Op. column to string
-    c_holdings_df['Date Op.'] = c_holdings_df['Date Op.'].dt.strftime('%m-%d-%Y')
+    # convert the Date Op. column to an ISO date string, so it sorts and filters as a date
+    c_holdings_df['Date Op.'] = c_holdings_df['Date Op.'].dt.strftime('%Y-%m-%d')
     return c_holdings_df
 
 # get the dividends paid by month
 def sum_dividends_by_month():
-    data = pd.read_excel(EXCEL_FILE, sheet_name='2023')
+    data = portfolio_store.get_dividend_payments(['2023'])
     data = data[['Month', 'Amount']]
     # Define the order for the months
     months_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
@@ -56,7 +63,8 @@ def sum_dividends_by_month():
 def create_line_chart(data):
     # Calculate the average of the 'Amount'
     average_amount = data['Amount'].mean()
-    # Create the line chart
+    # Create the line chart, plotly express is imported on first use
+    import plotly.express as px
     fig = px.line(data, x=data.index, y='Amount', title='Dividends Paid by Month')
     # Add markers and show the value of each point
     fig.update_traces(mode='markers+lines', hovertemplate=None)
@@ -78,6 +86,7 @@ def create_line_chart(data):
 # create a bar chart directly without a callback
 def create_bar_chart(df):
     # Create the bar chart
+    import plotly.express as px
     fig = px.bar(df, x=df.index, y='Amount', title='Dividend Profits')
     # Update layout
     fig.update_layout(template = 'plotly_dark', title_x=0.5, xaxis_title='', yaxis_title='')
@@ -114,33 +123,29 @@ def preprocess_data(df):
 
     return dataframe
 
-def load_and_preprocess_data(filepath):
+def load_and_preprocess_data(store):
     """
-    Reads data from an Excel file and preprocesses it for analysis.
-    It reads data from different sheets and formats them.
+    Reads the dividend ledger and closed trades from the portfolio store and
+    preprocesses them for analysis.
 
     Parameters:
-    filepath (str): Path to the Excel file containing the data.
+    store (PortfolioStore): The portfolio store containing the data.
 
     Returns:
-    tuple: A tuple containing preprocessed dataframes.
+    DataFrame: The dividends paid and closed trade profits with 'Date' and 'Amount' columns.
     """
-    # Read data from Excel file
-    closed_trades_df = pd.read_excel(filepath, sheet_name='closed_trades')
-    div_paid_2023_df = pd.read_excel(filepath, sheet_name='2023')
-    div_paid_2022_df = pd.read_excel(filepath, sheet_name='2022')
-    div_paid_2021_df = pd.read_excel(filepath, sheet_name='2021')
+    # Read data from the portfolio store
+    closed_trades_df = store.get_closed_trades()
+    div_paid_df = store.get_dividend_payments()
 
     # Preprocess closed trades data
     closed_trades_df = preprocess_data(closed_trades_df)
 
     # Keep only Date and Amount columns for dividend data
-    div_paid_2023_df = div_paid_2023_df[['Date', 'Amount']]
-    div_paid_2022_df = div_paid_2022_df[['Date', 'Amount']]
-    div_paid_2021_df = div_paid_2021_df[['Date', 'Amount']]
+    div_paid_df = div_paid_df[['Date', 'Amount']]
 
     # Concatenate the dividend dataframes
-    div_paid_df = pd.concat([div_paid_2023_df, div_paid_2022_df, div_paid_2021_df, closed_trades_df])
+    div_paid_df = pd.concat([div_paid_df, closed_trades_df])
 
     return div_paid_df
 
@@ -176,6 +181,7 @@ def plot_cumulative_growth(df):
     Returns:
     None: Displays the plot.
     """
+    import plotly.express as px
     fig = px.line(df, x=df.index, y='cumulative_growth', 
                   title='Cumulative Growth:<br> Including Closed Trades and Dividends Paid',
                   template='plotly_dark')
@@ -197,6 +203,7 @@ def plot_yearly_dividends(df):
     Returns:
     None: Displays the plot.
     """
+    import plotly.express as px
     fig = px.bar(df, y='Amount', title='Yearly Payouts:<br> Including Closed Trades and Dividends Paid',
                  template='plotly_dark')
     fig.update_layout(hoverlabel=dict(font_size=16, font_family="Rockwell"))
@@ -208,118 +215,203 @@ def plot_yearly_dividends(df):
     fig.update_xaxes(tickmode='linear')
     return fig
 
-dash.register_page(__name__, path='/', name='Home 🤑')
+def normalise_record(record):
+    # NaN values arrive back from the browser as None
+    return {key: None if isinstance(value, float) and np.isnan(value) else value for key, value in record.items()}
 
-#################### LOAD DATA ####################
-div_profits_df = get_yr_div_profits(['2021', '2022', '2023'])
-cur_holdings_df = get_current_holdings()
-cur_dividends_paid_df = sum_dividends_by_month()
+def create_table_patch(old_records, new_records):
+    """
+    Builds a partial update that turns the rows shown in the table into the new rows.
+
+    Only rows that differ are sent, rows missing from the new page are deleted and
+    extra rows are appended.
 
-filepath = './data/Dividend_Dashboard.xlsx'
-div_paid_df = load_and_preprocess_data(filepath)
-# Calculate cumulative growth
-cumulative_growth_df = calculate_cumulative_growth(div_paid_df)
+    Parameters:
+    old_records (list): The records currently shown in the table.
+    new_records (list): The records that should be shown.
 
-# Prepare and plot yearly dividends
-div_paid_yearly_df = cumulative_growth_df.groupby(pd.Grouper(freq='Y')).sum()
-div_paid_yearly_df.index = div_paid_yearly_df.index.year
+    Returns:
+    Patch: The partial update for the table's data property.
+    """
+    old_records = old_records or []
+    new_records = [normalise_record(record) for record in new_records]
+    patch = Patch()
+    for i, (old, new) in enumerate(zip(old_records, new_records)):
+        if old != new:
+            patch[i] = new
+    if len(new_records) > len(old_records):
+        patch.extend(new_records[len(old_records):])
+    # delete from the end so the remaining indexes stay valid
+    for i in range(len(old_records) - 1, len(new_records) - 1, -1):
+        del patch[i]
+    return patch
+
+dash.register_page(__name__, path='/', name='Home 🤑')
+
+#################### LOAD DATA ####################
+def load_charts():
+    # read the dividends and closed trades and build the four charts, once per server
+    div_profits_df = get_yr_div_profits(['2021', '2022', '2023'])
+    cur_dividends_paid_df = sum_dividends_by_month()
+    div_paid_df = load_and_preprocess_data(portfolio_store)
+    # Calculate cumulative growth
+    cumulative_growth_df = calculate_cumulative_growth(div_paid_df)
+    # Prepare and plot yearly dividends
+    div_paid_yearly_df = cumulative_growth_df.groupby(pd.Grouper(freq='Y')).sum()
+    div_paid_yearly_df.index = div_paid_yearly_df.index.year
+    return [
+        [create_bar_chart(div_profits_df), create_line_chart(cur_dividends_paid_df)],
+        [plot_cumulative_growth(cumulative_growth_df), plot_yearly_dividends(div_paid_yearly_df)],
+    ]
+
+# nothing is read from the workbook until the page is viewed or warmed up
+charts_loader = CachedLoader(load_charts, name='the home charts')
+holdings_watcher_loader = CachedLoader(lambda: HoldingsWatcher(workbook_loader, get_current_holdings), name='the current holdings')
+if PAGE_WARMUP:
+    charts_loader.warm()
+    holdings_watcher_loader.warm()
+
+def get_holdings_first_page(holdings_watcher):
+    # the table backend is shared, only rebuild it when the holdings changed
+    if holdings_table_backend.version != holdings_watcher.version:
+        holdings_table_backend.set_frame(holdings_watcher.holdings, version=holdings_watcher.version)
+    return holdings_table_backend.query(0, PAGE_SIZE, [], '')
 
 #################### PAGE LAYOUT ####################
-layout = html.Div(children=[
-    html.Div(children=[
-        html.Br(),
-        html.Div(children=[
-            dcc.Graph(figure=create_bar_chart(div_profits_df)),
-            dcc.Graph(figure=create_line_chart(cur_dividends_paid_df))
-        ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row'}),
+def layout():
+    charts = charts_loader.get()
+    holdings_watcher = holdings_watcher_loader.get()
+    if charts is None or holdings_watcher is None:
+        return html.Div(children=[
+            html.Br(),
+            html.H3('The portfolio could not be loaded, try again in a moment.', style={'textAlign': 'center', 'margin': 10, 'padding': 0}),
+        ])
+    cur_holdings_df = holdings_watcher.holdings
+    holdings_first_page, holdings_page_count = get_holdings_first_page(holdings_watcher)
+    last_update = holdings_watcher_loader.loaded_at.strftime("%Y-%m-%d %H:%M:%S")
+    return html.Div(children=[
         html.Div(children=[
-            dcc.Graph(figure = plot_cumulative_growth(cumulative_growth_df)),
-            dcc.Graph(figure = plot_yearly_dividends(div_paid_yearly_df)),
-        ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row'}),
-        html.Div(children=[
-            html.Div([
-                html.H4('Current Holdings', style={'paddingLeft': '25px'}),
-                html.H6(f'(Last updated {CURRENT_TIME})', id='last_update', style={'paddingLeft': '10px', 'paddingTop': '15px'}),
-            ], style={'font-family': 'Rockwell, serif', 'textAlign': 'left', 'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'row'}),
-            dash_table.DataTable(
-                id='curr_holdings_table',
-                columns=[
-                    {
-                        "name": i, 
-                        "id": i,
-                        "type": "numeric",
-                        "format": MONEY_FORMAT if i in ['Close', 'Pur. Price', 'Exit Price', 'Amt. Paid', 'Pos. Value', 'G/L ($)', 'Div. Earned'] else
-                                  PERCENTAGE_FORMAT if i == 'G/L (%)' else None 
-                     } for i in cur_holdings_df.columns],
-                data=cur_holdings_df.to_dict('records'),
-                cell_selectable=False,
-                sort_action='native',
-                filter_action='native',
-                style_header={'textAlign': 'center', 'backgroundColor': '#1E1E1E', 'fontWeight': 'bold', 'color': 'white'},
-                style_filter={'backgroundColor': '#FFEB9C', 'fontWeight': 'bold', 'color': '#9C5700'},
-                style_cell_conditional=[
-                    {
-                        'if': { 'column_id': ['Ticker', 'Shares'] },
-                        'textAlign': 'center'
-                    }
-                ],
-                style_data_conditional=[
-                    {
-                        'if': {'row_index': 'odd'},
-                        'backgroundColor': '#1E1E1E',
-                        'color': 'white',
-                        'fontWeight': 'bold'
-                    },
-                    {
-                        'if': {'row_index': 'even'},
-                        'backgroundColor': '#adaaaa',  # A light grey for even rows
-                        'color': 'black',
-                        'fontWeight': 'bold'
-                    },
-                    # Odd rows with G/L ($) greater than 0
-                    {
-                        'if': {
-                            'filter_query': '{G/L ($)} > 0',
-                            'row_index': 'odd',
+            html.Br(),
+            html.Div(children=[dcc.Graph(figure=fig) for fig in charts[0]],
+                     style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row'}),
+            html.Div(children=[dcc.Graph(figure=fig) for fig in charts[1]],
+                     style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row'}),
+            html.Div(children=[
+                html.Div([
+                    html.H4('Current Holdings', style={'paddingLeft': '25px'}),
+                    html.H6(f'(Last updated {last_update})', id='last_update', style={'paddingLeft': '10px', 'paddingTop': '15px'}),
+                ], style={'font-family': 'Rockwell, serif', 'textAlign': 'left', 'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'row'}),
+                dash_table.DataTable(
+                    id='curr_holdings_table',
+                    columns=[
+                        {
+                            "name": i, 
+                            "id": i,
+                            "type": TableBackend.column_type(cur_holdings_df[i]),
+                            "format": MONEY_FORMAT if i in ['Close', 'Pur. Price', 'Exit Price', 'Amt. Paid', 'Pos. Value', 'G/L ($)', 'Div. Earned'] else
+                                      PERCENTAGE_FORMAT if i == 'G/L (%)' else None 
+                         } for i in cur_holdings_df.columns],
+                    data=holdings_first_page,
+                    cell_selectable=False,
+                    page_action='custom',
+                    page_current=0,
+                    page_size=PAGE_SIZE,
+                    page_count=holdings_page_count,
+                    sort_action='custom',
+                    sort_mode='single',
+                    sort_by=[],
+                    filter_action='custom',
+                    filter_query='',
+                    style_header={'textAlign': 'center', 'backgroundColor': '#1E1E1E', 'fontWeight': 'bold', 'color': 'white'},
+                    style_filter={'backgroundColor': '#FFEB9C', 'fontWeight': 'bold', 'color': '#9C5700'},
+                    style_cell_conditional=[
+                        {
+                            'if': { 'column_id': ['Ticker', 'Shares'] },
+                            'textAlign': 'center'
+                        }
+                    ],
+                    style_data_conditional=[
+                        {
+                            'if': {'row_index': 'odd'},
+                            'backgroundColor': '#1E1E1E',
+                            'color': 'white',
+                            'fontWeight': 'bold'
+                        },
+                        {
+                            'if': {'row_index': 'even'},
+                            'backgroundColor': '#adaaaa',  # A light grey for even rows
+                            'color': 'black',
+                            'fontWeight': 'bold'
+                        },
+                        # Odd rows with G/L ($) greater than 0
+                        {
+                            'if': {
+                                'filter_query': '{G/L ($)} > 0',
+                                'row_index': 'odd',
+                            },
+                            'backgroundColor': '#00B050',  # A darker green background for odd rows
+                            'color': '#115910',
+                            'fontWeight': 'bold'
                         },
-                        'backgroundColor': '#00B050',  # A darker green background for odd rows
-                        'color': '#115910',
-                        'fontWeight': 'bold'
-                    },
-                    # Even rows with G/L ($) greater than 0
-                    {
-                        'if': {
-                            'filter_query': '{G/L ($)} > 0',
-                            'row_index': 'even',
+                        # Even rows with G/L ($) greater than 0
+                        {
+                            'if': {
+                                'filter_query': '{G/L ($)} > 0',
+                                'row_index': 'even',
+                            },
+                            'backgroundColor': '#D9EAD3',  # A lighter green background for even rows
+                            'color': '#115910',
+                            'fontWeight': 'bold'
                         },
-                        'backgroundColor': '#D9EAD3',  # A lighter green background for even rows
-                        'color': '#115910',
-                        'fontWeight': 'bold'
-                    },
-                ],
-                style_as_list_view=False,
-                style_table={'overflowX': 'scroll', 'width': '100%'}, 
-            )
-        ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'column'}),
-        dcc.Interval(
-            id='interval-component',
-            interval=30*60*1000, # in milliseconds = 5 minutes
-            n_intervals=0
-        )
+                    ],
+                    style_as_list_view=False,
+                    style_table={'overflowX': 'scroll', 'width': '100%'}, 
+                )
+            ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'column'}),
+            dcc.Interval(
+                id='holdings_watch_interval',
+                interval=HOLDINGS_POLL_INTERVAL, # only checks the workbook mtime, rows are pushed when they change
+                n_intervals=0
+            ),
+            dcc.Store(id='holdings_version', data=holdings_watcher.version)
+        ])
     ])
-])
 
 #################### CALLBACKS ####################
 @callback(
     Output('curr_holdings_table', 'data'),
+    Output('curr_holdings_table', 'page_count'),
     Output('last_update', 'children'),
-    Input('interval-component', 'n_intervals')
+    Output('holdings_version', 'data'),
+    Input('holdings_watch_interval', 'n_intervals'),
+    Input('curr_holdings_table', 'page_current'),
+    Input('curr_holdings_table', 'page_size'),
+    Input('curr_holdings_table', 'sort_by'),
+    Input('curr_holdings_table', 'filter_query'),
+    State('curr_holdings_table', 'data'),
+    State('holdings_version', 'data')
 )
-def update_curr_holdings_table(n):
-    holdings_df = get_current_holdings()
+def update_curr_holdings_table(n, page_current, page_size, sort_by, filter_query, table_data, client_version):
+    trigger_id = callback_context.triggered[0]['prop_id'].split('.')[0]
+    if trigger_id != 'holdings_watch_interval':
+        # paging, sorting and filtering are answered from the cached frame
+        records, page_count = holdings_table_backend.query(page_current, page_size, sort_by, filter_query)
+        return records, page_count, no_update, no_update
+
+    holdings_watcher = holdings_watcher_loader.get()
+    if holdings_watcher is None:
+        return no_update, no_update, no_update, no_update
+    holdings_watcher.poll()
+    # nothing to push if this browser already shows the latest holdings
+    if client_version == holdings_watcher.version:
+        return no_update, no_update, no_update, no_update
+    if holdings_table_backend.version != holdings_watcher.version:
+        holdings_table_backend.set_frame(holdings_watcher.holdings, version=holdings_watcher.version)
+    records, page_count = holdings_table_backend.query(page_current, page_size, sort_by, filter_query)
     # update the timestamp
     cur_time = datetime.datetime.now()
     cur_time = cur_time.strftime("%Y-%m-%d %H:%M:%S")
     timestamp = f'(Last updated {cur_time})'
-    return holdings_df.to_dict('records'), timestamp
+    # send only the rows of the visible page that changed
+    return create_table_patch(table_data, records), page_count, timestamp, holdings_watcher.version
 
@@ -1,9 +1,9 @@
 import dash
 import os
 import pickle
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import yfinance as yf
 import plotly.graph_objects as go
 from dash import html, dcc, Input, Output, State, callback, dash_table 
 from plotly.subplots import make_subplots
@@ -16,18 +16,36 @@ from files.MT4DataFetcher import MT4DataFetcher
 from files.ForecastProcessor import ForecastProcessor
 from files.DataProcessor import DataProcessor
 from files.DataVisualizer import DataVisualizer
+from files.WorkbookLoader import WorkbookLoader
+from files.ForecastCache import ForecastCache
+from files.ForecastScheduler import ForecastScheduler
+from files.MergedDataStore import MergedDataStore
+from files.HttpClient import HttpClient
+from files.AsyncFetcher import AsyncFetcher
+from files.BarStreamServer import BarStreamServer
+from files.SingleFlight import SingleFlight
+from files.CachedLoader import CachedLoader
+from files.TableBackend import TableBackend
 
 load_dotenv('.env')
 
 #################### Object Instantiation ####################
 bot_controller = TradingBotController()
-stock_data_fetcher = StockDataFetcher()
-crypto_data_fetcher = CryptoDataFetcher()
+# the chart pipeline runs from callbacks and the warm-up threads at the same time, so the
+# stateful fetchers are created per call. This one only holds the MT4 file settings.
 mt4_data_fetcher = MT4DataFetcher()
+workbook_loader = WorkbookLoader('data/Dividend_Dashboard.xlsx')
+forecast_cache = ForecastCache(max_entries=64, cache_dir='data/.forecast_cache')
+http_client = HttpClient.shared()
+async_fetcher = AsyncFetcher.shared()
+# tabs, the refresh interval and the warm-up asking for the same chart share one computation
+merged_data_flight = SingleFlight()
 #################### FUNCTIONS ####################
 
 def download_market_data(tickers, period='1y', interval='1d'):
     """Downloads historical market data for given tickers."""
+    # imported on first use, so the app starts without paying for yfinance
+    import yfinance as yf
     try:
         return yf.download(tickers, period=period, interval=interval, group_by='ticker', rounding=True)
     except Exception as e:
@@ -103,9 +121,16 @@ def create_indices_charts(tickers=['^VIX', '^GSPC', 'CL=F', 'GC=F'], period='1y'
     market_charts = customize_chart_layout(market_charts, data, ticker_names, avg_prices, tickers)
     return market_charts
 
+def load_indices_charts():
+    # a failed download is retried on a later view instead of being cached
+    market_charts = create_indices_charts()
+    if market_charts is None:
+        raise ValueError("no market data was downloaded")
+    return market_charts
+
 def load_and_combine_tickers(CRYPTO_TICKERS, MT4_TICKERS, ETF_TICKERS):
     # get the Ticker column from the dividend excel file
-    dividend_tickers = pd.read_excel('data/Dividend_Dashboard.xlsx', sheet_name='current_holdings', usecols='G') 
+    dividend_tickers = workbook_loader.get_sheet('current_holdings', columns=['Ticker'])
     # convert divedend tickers to a list
     dividend_tickers = dividend_tickers['Ticker'].tolist()
     # sort the list
@@ -113,6 +138,10 @@ def load_and_combine_tickers(CRYPTO_TICKERS, MT4_TICKERS, ETF_TICKERS):
     tickers = ETF_TICKERS + CRYPTO_TICKERS + MT4_TICKERS + dividend_tickers
     return tickers
 
+def get_tickers():
+    # the ETFs, crypto and MT4 symbols plus the holdings, read from the workbook on first use
+    return tickers_loader.get()
+
 def splice_data(df, num_bars):
     # todo: add a doc string
     # return th complete dataframe if num_bars is 0
@@ -120,7 +149,7 @@ def splice_data(df, num_bars):
         return df
     else:
         data = df.copy()
-        return data.tail(num_bars + 90) # add 90 to account for the 90 day forecast
+        return data.tail(num_bars + 90) # add 90 to account for the 90 session forecast
     
 def getAdjustedSymbolNameForChart(symbol):
     # check if symbol is in the ticker dictionary
@@ -128,22 +157,35 @@ def getAdjustedSymbolNameForChart(symbol):
         return TICKER_DICT[symbol]
     return symbol
 
+def forecast_prepared_data(symbol, prep_data, freq='D', period=90, tier=None, asset_class=None):
+    """
+    Returns the processed Prophet forecast for the prepared bars, reusing a cached
+    forecast when the bars have not changed since the last fit. The future only holds
+    the sessions of the asset class ('equity', 'fx' or 'crypto').
+    """
+    tier = tier or MARKET_WATCH_FORECAST_TIER
+    key = ForecastCache.make_key(symbol, freq, period, prep_data, tier=tier, asset_class=asset_class)
+
+    def compute():
+        # warm-start from the previous fit of this symbol
+        forecast = ForecastProcessor.prophet_forecast(prep_data, period=period, freq=freq, model_key=symbol, tier=tier, asset_class=asset_class)
+        return DataProcessor.process_prophet_forecast(forecast)
+
+    return forecast_cache.get_or_compute(key, compute)
+
 def process_stock_data(symbol):
     print('\nprocessing daily stock', symbol)
     # set the ticker
+    stock_data_fetcher = StockDataFetcher()
     stock_data_fetcher.set_ticker(symbol)
     # fetch the data
     data = stock_data_fetcher.fetch_data()
     # prepare the data for prophet
     prep_data = DataProcessor.prepare_data_for_prophet(data)
-    # forecast the data 
-    forecast = ForecastProcessor.prophet_forecast(prep_data)
-    processed_forecast = DataProcessor.process_prophet_forecast(forecast)
+    # forecast the data, or reuse the cached forecast if no new bar arrived
+    processed_forecast = forecast_prepared_data(symbol, prep_data, asset_class='equity')
     # merge the dataframes 
-    MERGED_DATA[symbol] = DataProcessor.merge_dataframes_for_prophet(data, processed_forecast)
-    # slice the merged data using the num_bars as a percentage
-    stock_slice_df = splice_data(MERGED_DATA[symbol], 100)
-    return create_chart_figure(stock_slice_df, symbol, 'Daily')
+    return DataProcessor.merge_dataframes_for_prophet(data, processed_forecast)
 
 def process_crypto_data(symbol, timeframe):
     print(f'\nprocessing {timeframe} crypto', symbol)
@@ -151,43 +193,88 @@ def process_crypto_data(symbol, timeframe):
     period = '1hour' if timeframe == '1hour' else '1day'
     freq = 'H' if timeframe == '1hour' else 'D'
     # set the symbol
+    crypto_data_fetcher = CryptoDataFetcher()
     crypto_data_fetcher.set_symbol(symbol)
     # fetch the data
     crypto_df = crypto_data_fetcher.fetch_data(period=period)
     # prepare the data for prophet
     prep_data = DataProcessor.prepare_data_for_prophet(crypto_df)
-    # forecast the data 
-    forecast = ForecastProcessor.prophet_forecast(prep_data, freq=freq)
-    # process the forecasted data 
-    processed_forecast = DataProcessor.process_prophet_forecast(forecast)
+    # forecast and process the data, or reuse the cached forecast if no new bar arrived
+    processed_forecast = forecast_prepared_data(symbol, prep_data, freq=freq, asset_class='crypto')
     # merge the dataframes
-    MERGED_DATA[symbol] = DataProcessor.merge_dataframes_for_prophet(crypto_df, processed_forecast) 
-    if timeframe == '1hour':
-        # For hourly data, slice to show the last 291 rows
-        crypto_slice_df = MERGED_DATA[symbol].iloc[-291:]
-    else:
-        # For daily data, use splice_data function
-        crypto_slice_df = splice_data(MERGED_DATA[symbol], 100)
-    return create_chart_figure(crypto_slice_df, symbol, timeframe)
+    return DataProcessor.merge_dataframes_for_prophet(crypto_df, processed_forecast)
 
 def process_mt4_data(symbol):
     print('\nprocessing mt4', symbol)
     # set the symbol
-    mt4_data_fetcher.set_symbol(symbol)
-    timeframe = 'Daily'
+    fetcher = MT4DataFetcher(period=mt4_data_fetcher.period, base_path=mt4_data_fetcher.base_path)
+    fetcher.set_symbol(symbol)
     freq = 'D'
-    mt4_data = mt4_data_fetcher.fetch_data()
+    mt4_data = fetcher.fetch_data()
     # prepare the data for prophet
     prep_data = DataProcessor.prepare_data_for_prophet(mt4_data)
-    # forecast the data 
-    forecast = ForecastProcessor.prophet_forecast(prep_data, freq=freq)
-    # process the forecasted data 
-    processed_forecast = DataProcessor.process_prophet_forecast(forecast)
+    # forecast and process the data, or reuse the cached forecast if no new bar arrived
+    processed_forecast = forecast_prepared_data(symbol, prep_data, freq=freq, asset_class='fx')
     # merge the dataframes
-    MERGED_DATA[symbol] = DataProcessor.merge_dataframes_for_prophet(mt4_data, processed_forecast)
-    # slice the merged data using the num_bars as a percentage
-    mt4_slice_df = splice_data(MERGED_DATA[symbol], 100)
-    return create_chart_figure(mt4_slice_df, symbol, timeframe)
+    return DataProcessor.merge_dataframes_for_prophet(mt4_data, processed_forecast)
+
+def get_timeframes(symbol):
+    # crypto has a daily and an hourly chart, everything else is daily
+    if symbol in CRYPTO_TICKERS:
+        return ['1day', '1hour']
+    return ['Daily']
+
+def compute_merged_data(symbol, timeframe):
+    """
+    Fetches, forecasts and merges the data of a symbol for one timeframe.
+
+    This is what the forecast scheduler precomputes in the background.
+    """
+    if symbol in CRYPTO_TICKERS:
+        return process_crypto_data(symbol, timeframe)
+    elif symbol in MT4_SYMBOLS:
+        return process_mt4_data(symbol)
+    else:
+        return process_stock_data(symbol)
+
+def compute_merged_data_once(symbol, timeframe, version=None):
+    """
+    Computes the merged data of a symbol once for concurrent callers of the same
+    timeframe and bar version, who all receive the same result.
+    """
+    if version is None:
+        version = get_bar_version(symbol, timeframe)
+    return merged_data_flight.do((symbol, timeframe, version), compute_merged_data, symbol, timeframe)
+
+def last_us_close(now):
+    # the daily bar of a US stock is final once the market closes at 16:00 New York time
+    ny_now = now.tz_convert('America/New_York')
+    session = ny_now.normalize()
+    if ny_now < session + US_CLOSE_TIME:
+        session -= pd.Timedelta(days=1)
+    # step back over the weekend
+    while session.weekday() >= 5:
+        session -= pd.Timedelta(days=1)
+    return session.date()
+
+def get_bar_version(symbol, timeframe):
+    """
+    Returns a value that changes whenever a new bar is available for the symbol:
+    the last US close for stocks, the current candle for KuCoin and, for MT4, the
+    stream version or the modification time of the CSV the EA rewrites on every candle.
+    """
+    now = pd.Timestamp.now(tz='UTC')
+    if symbol in CRYPTO_TICKERS:
+        return now.floor('h' if timeframe == '1hour' else 'D')
+    elif symbol in MT4_SYMBOLS:
+        if MT4DataFetcher.bar_stream is not None:
+            stream_version = MT4DataFetcher.bar_stream.version(symbol, mt4_data_fetcher.period)
+            if stream_version is not None:
+                return ('stream', stream_version)
+        file_path = os.path.join(mt4_data_fetcher.base_path, f'{symbol}_{mt4_data_fetcher.period}.csv')
+        return os.stat(file_path).st_mtime_ns if os.path.exists(file_path) else None
+    else:
+        return last_us_close(now)
 
 def create_chart_figure(data_slice, symbol, timeframe):
     chart_symbol_title = getAdjustedSymbolNameForChart(symbol)
@@ -197,12 +284,22 @@ def create_chart_figure(data_slice, symbol, timeframe):
 def process_chart_pipeline(symbol, show_hourly_chart=False):
     if symbol in CRYPTO_TICKERS:
         timeframe = '1hour' if show_hourly_chart else '1day'
-        return process_crypto_data(symbol, timeframe)
-    elif symbol in MT4_SYMBOLS:
-        return process_mt4_data(symbol)
     else:
-        return process_stock_data(symbol)
-        
+        timeframe = 'Daily'
+    # use the forecast precomputed for the latest bar, compute it now if it is not ready
+    version = get_bar_version(symbol, timeframe)
+    merged_data = forecast_scheduler.get_ready(symbol, timeframe, version)
+    if merged_data is None:
+        merged_data = compute_merged_data_once(symbol, timeframe, version)
+        forecast_scheduler.set_ready(symbol, timeframe, version, merged_data)
+    MERGED_DATA[symbol] = merged_data
+    if timeframe == '1hour':
+        # For hourly data, slice to show the last 291 rows
+        slice_df = merged_data.iloc[-291:]
+    else:
+        # For daily data, use splice_data function
+        slice_df = splice_data(merged_data, 100)
+    return create_chart_figure(slice_df, symbol, timeframe)
 
 def fetch_dividend_data(ticker, api_key):
     """
@@ -215,12 +312,15 @@ def fetch_dividend_data(ticker, api_key):
     Returns:
     DataFrame: A DataFrame containing dividend information.
     """
-    # Format the URL for the API request, including the ticker symbol and API key
-    url = f'https://api.polygon.io/v3/reference/dividends?ticker={ticker}&limit=1&apiKey={api_key}'
-
     # Make a GET request to the API and parse the JSON response
-    response = requests.get(url).json()
+    response = http_client.get(get_dividend_data_url(ticker, api_key)).json()
+    return parse_dividend_data(response)
+
+def get_dividend_data_url(ticker, api_key):
+    # Format the URL for the API request, including the ticker symbol and API key
+    return f'https://api.polygon.io/v3/reference/dividends?ticker={ticker}&limit=1&apiKey={api_key}'
 
+def parse_dividend_data(response):
     # Check if the response contains results and return an empty DataFrame if not
     if not response.get('results'):
         return pd.DataFrame()
@@ -233,18 +333,46 @@ def fetch_dividend_data(ticker, api_key):
 
     return dividend_df
 
+def fetch_dividend_data_many(tickers, api_key):
+    """
+    Fetches the dividend data of many tickers concurrently, so the wall time is about
+    that of the slowest request instead of the sum of all of them.
+
+    Parameters:
+    tickers (list): The stock ticker symbols.
+    api_key (str): Your Polygon API key.
+
+    Returns:
+    dict: The dividend DataFrame of each ticker. Tickers whose request failed are left out.
+    """
+    responses = async_fetcher.fetch_all([get_dividend_data_url(ticker, api_key) for ticker in tickers], return_exceptions=True)
+    dividend_data = {}
+    for ticker, response in zip(tickers, responses):
+        try:
+            if isinstance(response, Exception):
+                raise response
+            dividend_data[ticker] = parse_dividend_data(response.json())
+        except Exception as e:
+            print(f"Error fetching the dividend data of {ticker}: {e}")
+    return dividend_data
+
 def create_table(ticker):
-    try:
-        table_df = fetch_dividend_data(ticker, POLYGON_API_KEY)
-    except:
-        table_df = pd.DataFrame()
+    # use the dividend data prefetched today, if any
+    prefetched = DIVIDEND_DATA.get(ticker)
+    if prefetched is not None and prefetched[0] == date.today():
+        table_df = prefetched[1]
+    else:
+        try:
+            table_df = fetch_dividend_data(ticker, POLYGON_API_KEY)
+        except:
+            table_df = pd.DataFrame()
     return dash_table.DataTable(
-                id='dividend_table',
+                id='ticker_dividend_table',
                     columns=[
                         {
                             "name": i, 
                             "id": i,
-                            "type": "numeric",
+                            "type": TableBackend.column_type(table_df[i]),
                             "format": MONEY_FORMAT if i in ['cash_amount'] else None
                         } for i in table_df.columns],
                     data=table_df.to_dict('records'),
@@ -279,13 +407,33 @@ def create_table(ticker):
 CRYPTO_TICKERS = ['BTC-USDC', 'ETH-USDC']
 MT4_SYMBOLS = ["USDCAD", "USDJPY", "USDCHF", "AUDUSD", "NZDUSD", "GBPUSD", "EURUSD", "OILUSe", "XAUUSD", "S&P500e"] 
 ETF_SYMBOLS = ['SPLG', 'GLD', 'SH']
-TICKERS = load_and_combine_tickers(CRYPTO_TICKERS, MT4_SYMBOLS, ETF_SYMBOLS)
 TICKER_DICT = {'USDCAD':'USD/CAD', 'USDJPY':'USD/JPY', 'USDCHF':'USD/CHF', 'EURUSD':'EUR/USD', 'GBPUSD':'GBP/USD', 'AUDUSD':'AUD/USD', 'NZDUSD':'NZD/USD', 'OILUSe':'Crude Oil', 'XAUUSD':'Gold Futures', 'GLD':'Gold ETF', 'S&P500e':'S&P 500 Futures', 'SPLG':'S&P 500 ETF', 'BTC-USDC':'Bitcoin', 'ETH-USDC':'Ethereum'}
 TODAYS_DATE = date.today()
 POLYGON_API_KEY = os.environ.get('POLYGON_IO_API')
 ALPHAVANTAGE_API_KEY = os.environ.get('ALPHAVANTAGE_CO_API')
 MONEY_FORMAT = dash_table.FormatTemplate.money(2)
-MERGED_DATA = {}
+# the memory budget of the merged bars and forecasts kept for the charts and the bot, in MB
+MERGED_DATA_MAX_MB = int(os.environ.get('MERGED_DATA_MAX_MB', 256))
+MERGED_DATA = MergedDataStore(max_bytes=MERGED_DATA_MAX_MB * 1024 ** 2)
+# the (date, DataFrame) dividend data prefetched per ticker by the warm-up
+DIVIDEND_DATA = {}
+# prefetch the dividend data of every stock at start up, off by default since it sends
+# one Polygon request per ticker at once
+DIVIDEND_WARMUP = os.environ.get('DIVIDEND_WARMUP', '0') == '1'
+# the daily bar of US stocks is forecast again once the market closes
+US_CLOSE_TIME = pd.Timedelta(hours=16, minutes=15)
+# warm the forecasts of every ticker in the background
+FORECAST_WARMUP = os.environ.get('FORECAST_WARMUP', '1') == '1'
+FORECAST_WARMUP_WORKERS = int(os.environ.get('FORECAST_WARMUP_WORKERS', 2))
+# receive the MT4 bars pushed by the EA on a localhost port instead of polling its CSV files
+MT4_STREAM = os.environ.get('MT4_STREAM', '0') == '1'
+MT4_STREAM_PORT = int(os.environ.get('MT4_STREAM_PORT', 5555))
+# the Prophet fidelity tier of the charts, see ForecastProcessor.TIERS
+MARKET_WATCH_FORECAST_TIER = os.environ.get('MARKET_WATCH_FORECAST_TIER', 'interactive')
+# how long the market indices chart is reused before it is downloaded again, in seconds
+INDICES_CHART_TTL = 60 * 60
+# load the tickers and the indices chart in the background at start up instead of on the first view
+PAGE_WARMUP = os.environ.get('PAGE_WARMUP', '1') == '1'
 # Map of ticker symbols to human-readable names
 TICKER_TO_NAME_MAP = {
     '^VIX': 'VIX Volatility Index',
@@ -295,69 +443,163 @@ TICKER_TO_NAME_MAP = {
 }
 
 
+#################### LOAD DATA ####################
+# nothing is read from the workbook or downloaded until the page is viewed or warmed up.
+# Without the workbook the page still lists the ETFs, crypto and MT4 symbols.
+tickers_loader = CachedLoader(lambda: load_and_combine_tickers(CRYPTO_TICKERS, MT4_SYMBOLS, ETF_SYMBOLS),
+                              name='the Market Watch tickers', default=ETF_SYMBOLS + CRYPTO_TICKERS + MT4_SYMBOLS)
+indices_charts_loader = CachedLoader(load_indices_charts, name='the market indices', ttl=INDICES_CHART_TTL)
+if PAGE_WARMUP:
+    indices_charts_loader.warm()
+
+#################### FORECAST WARM-UP ####################
+forecast_scheduler = ForecastScheduler(compute_merged_data_once, get_bar_version, max_workers=FORECAST_WARMUP_WORKERS)
+
+def warm_stock_forecasts(symbols, period=90):
+    """
+    Forecasts the daily charts of many stocks as one batch and hands them to the scheduler
+    as ready for the current bar.
+
+    The Prophet fits run on FORECAST_WARMUP_WORKERS threads. The forecasts of every stock
+    are then smoothed with a single savgol_filter call and merged with their bars into one
+    block by the DataProcessor panel API, instead of once per stock.
+    """
+    def fit(symbol):
+        version = get_bar_version(symbol, 'Daily')
+        stock_data_fetcher = StockDataFetcher()
+        stock_data_fetcher.set_ticker(symbol)
+        data = stock_data_fetcher.fetch_data()
+        prep_data = DataProcessor.prepare_data_for_prophet(data)
+        # the same key as forecast_prepared_data(), so the charts reuse the batch
+        key = ForecastCache.make_key(symbol, 'D', period, prep_data, tier=MARKET_WATCH_FORECAST_TIER, asset_class='equity')
+        processed_forecast = forecast_cache.get(key)
+        forecast = None
+        if processed_forecast is None:
+            forecast = ForecastProcessor.prophet_forecast(prep_data, period=period, freq='D', model_key=symbol,
+                                                          tier=MARKET_WATCH_FORECAST_TIER, asset_class='equity')
+        return version, data, key, processed_forecast, forecast
+
+    fitted = {}
+    with ThreadPoolExecutor(max_workers=FORECAST_WARMUP_WORKERS, thread_name_prefix='forecast-batch') as executor:
+        futures = {symbol: executor.submit(fit, symbol) for symbol in symbols}
+        for symbol, future in futures.items():
+            try:
+                fitted[symbol] = future.result()
+            except Exception as e:
+                # the scheduler computes it on its own later
+                print(f"Unable to forecast {symbol} in the warm-up batch: {e}")
+
+    processed_forecasts = {symbol: result[3] for symbol, result in fitted.items() if result[3] is not None}
+    new_forecasts = DataProcessor.process_prophet_forecasts({symbol: result[4] for symbol, result in fitted.items() if result[4] is not None})
+    for symbol, processed_forecast in new_forecasts.items():
+        forecast_cache.set(fitted[symbol][2], processed_forecast)
+    processed_forecasts.update(new_forecasts)
+
+    merged = DataProcessor.merge_panel({symbol: result[1] for symbol, result in fitted.items()}, processed_forecasts)
+    for symbol, merged_data in merged.items():
+        forecast_scheduler.set_ready(symbol, 'Daily', fitted[symbol][0], merged_data)
+    return merged
+
+def start_forecast_warmup():
+    tickers = get_tickers()
+    for ticker in tickers:
+        for timeframe in get_timeframes(ticker):
+            forecast_scheduler.add(ticker, timeframe)
+    # fill the bar store of every stock with a few bulk downloads, so the scheduler only
+    # needs a small delta request per symbol
+    stock_tickers = [ticker for ticker in tickers if ticker not in CRYPTO_TICKERS and ticker not in MT4_SYMBOLS]
+    _, failed = StockDataFetcher.fetch_many(stock_tickers)
+    if failed:
+        print(f"Unable to prefetch {len(failed)} tickers: {failed}")
+    if DIVIDEND_WARMUP:
+        for ticker, dividend_df in fetch_dividend_data_many(stock_tickers, POLYGON_API_KEY).items():
+            DIVIDEND_DATA[ticker] = (date.today(), dividend_df)
+    # the stocks are forecast as one batch, the scheduler then only refreshes the rest
+    warm_stock_forecasts(stock_tickers)
+    forecast_scheduler.start()
+
+if MT4_STREAM:
+    MT4DataFetcher.bar_stream = BarStreamServer(port=MT4_STREAM_PORT)
+    try:
+        MT4DataFetcher.bar_stream.start()
+    except OSError as e:
+        print(f"Unable to start the MT4 bar stream on port {MT4_STREAM_PORT}, reading the CSV files: {e}")
+        MT4DataFetcher.bar_stream = None
+    if MT4DataFetcher.bar_stream is not None and FORECAST_WARMUP:
+        # forecast a new bar as soon as it arrives instead of at the next scheduler poll, the
+        # scheduler thread checks the versions so the socket handler is not held up
+        MT4DataFetcher.bar_stream.subscribe(lambda symbol, period, bar_date: forecast_scheduler.request_tick())
+
+if FORECAST_WARMUP:
+    threading.Thread(target=start_forecast_warmup, name='forecast-warmup-prefetch', daemon=True).start()
+
 dash.register_page(__name__, path='/market_watch', name='Market Watch 📈')
 
 #################### PAGE LAYOUT ####################
-layout = html.Div(children=[
-        html.Br(),
-        html.Div(children=[
-            dcc.Graph(figure=create_indices_charts()),
-        ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'width': '100%'}),
-        html.Hr(style={'color': 'white'}),
-        dcc.Loading(id='loading_chart', children=[
-            html.Div([
+def layout():
+    tickers = get_tickers()
+    # an empty chart if the indices could not be downloaded
+    indices_charts = indices_charts_loader.get() or {}
+    return html.Div(children=[
+            html.Br(),
+            html.Div(children=[
+                dcc.Graph(figure=indices_charts),
+            ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'width': '100%'}),
+            html.Hr(style={'color': 'white'}),
+            dcc.Loading(id='loading_chart', children=[
                 html.Div([
-                    html.H4('Select Ticker:', style={'width': '100%'}),
-                    dcc.Dropdown(id='ticker_dropdown', 
-                                options=[{'label': TICKER_DICT[ticker], 'value': ticker} if ticker in TICKER_DICT else {'label': ticker, 'value': ticker} for ticker in TICKERS],
-                                value=TICKERS[0], clearable=False, persistence=True, persisted_props=['value'], persistence_type='local'
-                                ),
-                    html.Br(),
-                    html.H4('Select TimeFrame:', style={'width': '100%'}),
-                    dcc.Dropdown(id='timeframe_dropdown', 
-                                options=[{'label': 'Daily', 'value': 'Daily'}, {'label': 'Hourly', 'value': 'Hourly'}],
-                                value='Daily', clearable=False, persistence=True, persisted_props=['value'], 
-                                persistence_type='local'
-                                ),
-                    html.Br(),            
-                    
-                    # Wrapped BUY and SELL sections in a Div with an id 'bot_info'
-                    html.Div(id='bot_info', children=[
-                        html.Br(),
-                        html.H4('Start Bot Message:', style={'width': '100%', 'color': 'green'}),
-                        dcc.Textarea(id='buy_textarea', value='', placeholder='Enter Message to Start Bot', style={'width': '100%', 'height': '150px', 'resize': 'none', 'textAlign': 'left', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column'}),
-                        html.Br(),
-                        html.H4('Stop Bot Message:', style={'width': '100%', 'color': 'red'}),
-                        dcc.Textarea(id='sell_textarea', value='', placeholder='Enter Message to Stop Bot', style={'width': '100%', 'height': '150px', 'resize': 'none', 'textAlign': 'left', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column'}),
+                    html.Div([
+                        html.H4('Select Ticker:', style={'width': '100%'}),
+                        dcc.Dropdown(id='ticker_dropdown', 
+                                    options=[{'label': TICKER_DICT[ticker], 'value': ticker} if ticker in TICKER_DICT else {'label': ticker, 'value': ticker} for ticker in tickers],
+                                    value=tickers[0], clearable=False, persistence=True, persisted_props=['value'], persistence_type='local'
+                                    ),
                         html.Br(),
-                        html.Button(id='autotrade_button', className='btn btn-outline-dark', children='Autotrade', n_clicks=0, style={'width': '100%', 'height': '50px', 'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column'}),
-                        html.Br(),
-                        html.Div(id='autotrade_label', children=[
-
-                        ], style={'display': 'block'}),  # Initially set to not display
-                        html.Br(),
-                    ], style={'display': 'none'})  # Initially set to not display
-
-
-                ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row', 'width': '100%', 'padding': '10px 40px 10px 40px', 'display': 'inline-block'}),
+                        html.H4('Select TimeFrame:', style={'width': '100%'}),
+                        dcc.Dropdown(id='timeframe_dropdown', 
+                                    options=[{'label': 'Daily', 'value': 'Daily'}, {'label': 'Hourly', 'value': 'Hourly'}],
+                                    value='Daily', clearable=False, persistence=True, persisted_props=['value'], 
+                                    persistence_type='local'
+                                    ),
+                        html.Br(),            
+                    
+                        # Wrapped BUY and SELL sections in a Div with an id 'bot_info'
+                        html.Div(id='bot_info', children=[
+                            html.Br(),
+                            html.H4('Start Bot Message:', style={'width': '100%', 'color': 'green'}),
+                            dcc.Textarea(id='buy_textarea', value='', placeholder='Enter Message to Start Bot', style={'width': '100%', 'height': '150px', 'resize': 'none', 'textAlign': 'left', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column'}),
+                            html.Br(),
+                            html.H4('Stop Bot Message:', style={'width': '100%', 'color': 'red'}),
+                            dcc.Textarea(id='sell_textarea', value='', placeholder='Enter Message to Stop Bot', style={'width': '100%', 'height': '150px', 'resize': 'none', 'textAlign': 'left', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column'}),
+                            html.Br(),
+                            html.Button(id='autotrade_button', className='btn btn-outline-dark', children='Autotrade', n_clicks=0, style={'width': '100%', 'height': '50px', 'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column'}),
+                            html.Br(),
+                            html.Div(id='autotrade_label', children=[
+
+                            ], style={'display': 'block'}),  # Initially set to not display
+                            html.Br(),
+                        ], style={'display': 'none'})  # Initially set to not display
+
+
+                    ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'row', 'width': '100%', 'padding': '10px 40px 10px 40px', 'display': 'inline-block'}),
                 
-                html.Div(children=[
-                                dcc.Graph( id='ticker_chart', figure={}),
-                                html.Div(id='div_table', children=[
-                                ]),
-                        ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'width': '100%', 'marginBottom': '10px', 'padding' : '10px'}),
+                    html.Div(children=[
+                                    dcc.Graph( id='ticker_chart', figure={}),
+                                    html.Div(id='div_table', children=[
+                                    ]),
+                            ], style={'textAlign': 'center', 'display': 'flex', 'justifyContent': 'center', 'alignItems': 'center', 'flexDirection': 'column', 'width': '100%', 'marginBottom': '10px', 'padding' : '10px'}),
                 
-            ], style={'width': '100%', 'textAlign': 'center', 'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'row'}),
+                ], style={'width': '100%', 'textAlign': 'center', 'display': 'flex', 'justifyContent': 'left', 'alignItems': 'left', 'flexDirection': 'row'}),
             
-        ], type='circle', fullscreen=False), # Loading component ends here
-        dcc.Interval(
-            id='interval-component',
-            interval=15*60*1000, # in milliseconds = will update every 15 minutes
-            n_intervals=0
-        ), 
-        dcc.Store(id='autotrade_store', storage_type='local')
+            ], type='circle', fullscreen=False), # Loading component ends here
+            dcc.Interval(
+                id='interval-component',
+                interval=15*60*1000, # in milliseconds = will update every 15 minutes
+                n_intervals=0
+            ), 
+            dcc.Store(id='autotrade_store', storage_type='local')
         
-])
+    ])
 
 #################### CALLBACKS ####################
 @callback(
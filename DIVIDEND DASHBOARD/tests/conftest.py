@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the dashboard imports its helpers as files.X, run from the dashboard folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,60 @@
+import threading
+import time
+from files.AsyncFetcher import AsyncFetcher
+
+class _Gauge:
+    # counts the calls running at the same time and keeps the peak
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def call(self, value, delay=0.05):
+        def run():
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+            time.sleep(delay)
+            with self._lock:
+                self.running -= 1
+            return value
+        return run
+
+def test_the_results_keep_the_order_of_the_calls():
+    gauge = _Gauge()
+    fetcher = AsyncFetcher(http_client=object())
+    # the first calls finish last
+    calls = [gauge.call(i, delay=0.01 * (10 - i)) for i in range(10)]
+    assert fetcher.call_all(calls) == list(range(10))
+
+def test_the_limit_bounds_the_calls_in_flight():
+    gauge = _Gauge()
+    fetcher = AsyncFetcher(http_client=object(), max_concurrency=16)
+    assert fetcher.call_all([gauge.call(i) for i in range(20)], limit=3) == list(range(20))
+    assert gauge.peak == 3
+
+def test_the_host_limits_bound_each_host():
+    polygon, kucoin = _Gauge(), _Gauge()
+    fetcher = AsyncFetcher(http_client=object(), max_concurrency=16, host_limit=4,
+                           host_limits={'api.polygon.io': 2})
+    calls = [('api.polygon.io', polygon.call(i)) for i in range(8)]
+    calls += [('api.kucoin.com', kucoin.call(i)) for i in range(8)]
+    fetcher.call_all(calls)
+    # both hosts share asyncio's default thread pool, which may be smaller than 2 + 4
+    assert 1 < polygon.peak <= 2
+    assert 1 < kucoin.peak <= 4
+
+def test_the_overall_limit_bounds_every_host():
+    gauge = _Gauge()
+    fetcher = AsyncFetcher(http_client=object(), max_concurrency=5, host_limit=8)
+    calls = [(f'host{i % 4}', gauge.call(i)) for i in range(20)]
+    fetcher.call_all(calls)
+    assert gauge.peak == 5
+
+def test_failures_can_be_returned_in_place():
+    def fail():
+        raise ValueError('rate limited')
+
+    results = AsyncFetcher(http_client=object()).call_all([lambda: 1, fail], return_exceptions=True)
+    assert results[0] == 1
+    assert isinstance(results[1], ValueError)
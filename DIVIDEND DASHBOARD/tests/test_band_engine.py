@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+from files.BandEngine import BandEngine
+from files.YieldScreener import YieldScreener
+
+def log_linear_closes(seed, periods=300, growth=0.001, noise=0.01):
+    # a close growing 0.1% a bar with 1% lognormal noise
+    rng = np.random.default_rng(seed)
+    t = np.arange(periods)
+    return 50 * np.exp(growth * t + rng.normal(0, noise, periods))
+
+def test_the_bands_bracket_a_log_linear_series():
+    closes = np.vstack([log_linear_closes(1), log_linear_closes(2, growth=-0.0005)])
+    bands = BandEngine.rolling_bands(closes, window=60)
+
+    assert np.isnan(bands['trend'][:, :59]).all()
+    trend, lower, upper = bands['trend'][:, 59:], bands['lower_band'][:, 59:], bands['upper_band'][:, 59:]
+    assert (lower < trend).all() and (trend < upper).all()
+    # the trend follows the noiseless series and the slope is the growth per bar
+    expected = np.vstack([50 * np.exp(0.001 * np.arange(59, 300)), 50 * np.exp(-0.0005 * np.arange(59, 300))])
+    assert np.abs(trend / expected - 1).max() < 0.02
+    assert np.allclose(np.nanmean(bands['slope'], axis=1), [0.001, -0.0005], atol=0.0003)
+    # the 80% band holds most of the closes
+    inside = (closes[:, 59:] >= lower) & (closes[:, 59:] <= upper)
+    assert 0.6 < inside.mean() < 0.95
+
+def test_the_prefilter_keeps_a_close_below_the_lower_band(monkeypatch):
+    index = pd.date_range('2024-01-01', periods=300)
+    dip = log_linear_closes(1)
+    dip[-1] *= 0.8
+    frames = {'DIP': pd.DataFrame({'Close': dip}, index=index),
+              'STEADY': pd.DataFrame({'Close': log_linear_closes(2)}, index=index)}
+    monkeypatch.setattr('files.YieldScreener.StockDataFetcher.fetch_many', lambda tickers, period='2y': (frames, ['GONE']))
+
+    assert BandEngine.below_lower_band(pd.DataFrame({symbol: frame['Close'] for symbol, frame in frames.items()})) == ['DIP']
+    # the tickers that could not be downloaded are kept for the Prophet stage
+    assert YieldScreener(max_workers=1).prefilter(['STEADY', 'GONE', 'DIP']) == ['GONE', 'DIP']
@@ -0,0 +1,79 @@
+import sys
+import types
+import pandas as pd
+from files.BarStore import BarStore
+from files.StockDataFetcher import StockDataFetcher
+
+def make_bars(start, periods, scale=1.0):
+    index = pd.DatetimeIndex(pd.date_range(start, periods=periods), name='Date')
+    closes = [round((10 + i) * scale, 2) for i in range(periods)]
+    return pd.DataFrame({'Open': closes, 'High': closes, 'Low': closes, 'Close': closes}, index=index)
+
+def test_append_merges_only_the_new_bars(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.append('KO', '1d', make_bars('2024-01-01', 10), covered_from='2024-01-01')
+    # a delta from the last stored bar, which was still forming
+    delta = make_bars('2024-01-10', 3, scale=2.0)
+    bars = store.append('KO', '1d', delta)
+
+    assert len(bars) == 12
+    assert bars.index.is_unique and bars.index.is_monotonic_increasing
+    assert bars['Close'].iloc[8] == 18.0
+    assert bars['Close'].iloc[9:].tolist() == delta['Close'].tolist()
+    assert store.last_timestamp('KO', '1d') == pd.Timestamp('2024-01-12')
+    assert store.read('KO', '1d', pd.Timestamp('2024-01-11'))['Close'].tolist() == delta['Close'].iloc[1:].tolist()
+
+def test_covered_from_is_recorded_in_the_sidecar(tmp_path):
+    store = BarStore(str(tmp_path))
+    assert not store.covers('KO', '1d', pd.Timestamp('2024-01-01'))
+    store.append('KO', '1d', make_bars('2024-01-01', 10), covered_from='2024-01-01')
+    assert store.covers('KO', '1d', pd.Timestamp('2024-01-05'))
+    assert not store.covers('KO', '1d', pd.Timestamp('2023-12-01'))
+    assert not store.covers('KO', '1d', None)
+
+    # a delta keeps the coverage, a longer download extends it, 'max' covers everything
+    store.append('KO', '1d', make_bars('2024-01-10', 2))
+    assert store.covers('KO', '1d', pd.Timestamp('2024-01-01'))
+    store.append('KO', '1d', make_bars('2023-11-01', 5), covered_from='2023-11-01')
+    assert store.covers('KO', '1d', pd.Timestamp('2023-12-01'))
+    store.append('KO', '1d', make_bars('2023-10-01', 5), covered_from='max')
+    assert store.covers('KO', '1d', None)
+    # a fresh store over the same directory reads the sidecar
+    assert BarStore(str(tmp_path)).covers('KO', '1d', None)
+
+def test_replace_overwrites_the_readjusted_history(tmp_path):
+    store = BarStore(str(tmp_path))
+    store.append('KO', '1d', make_bars('2023-01-01', 400), covered_from='max')
+    adjusted = make_bars('2024-01-01', 30, scale=0.9)
+    bars = store.append('KO', '1d', adjusted, covered_from='2024-01-01', replace=True)
+
+    pd.testing.assert_frame_equal(bars, adjusted, check_freq=False)
+    pd.testing.assert_frame_equal(store.read('KO', '1d'), adjusted, check_freq=False)
+    # the older history is gone, so it is no longer covered
+    assert not store.covers('KO', '1d', None)
+    assert store.covers('KO', '1d', pd.Timestamp('2024-01-01'))
+
+def test_the_fetcher_downloads_a_readjusted_history_again(tmp_path, monkeypatch):
+    today = pd.Timestamp.now().normalize()
+    history = {'scale': 1.0}
+    downloads = []
+
+    def download(ticker, period=None, start=None, interval=None, rounding=None):
+        downloads.append('delta' if start else 'full')
+        bars = make_bars(today - pd.Timedelta(days=99), 100, history['scale'])
+        return bars if start is None else bars[bars.index >= pd.Timestamp(start)]
+
+    monkeypatch.setitem(sys.modules, 'yfinance', types.SimpleNamespace(download=download))
+    monkeypatch.setattr(StockDataFetcher, 'bar_store', BarStore(str(tmp_path)))
+    fetcher = StockDataFetcher()
+    fetcher.set_ticker('KO')
+
+    fetcher.fetch_data(period='3mo')
+    fetcher.fetch_data(period='3mo')
+    assert downloads == ['full', 'delta']
+    # a dividend rescales every past bar
+    history['scale'] = 0.95
+    bars = fetcher.fetch_data(period='3mo')
+    assert downloads == ['full', 'delta', 'delta', 'full']
+    assert bars['Close'].iloc[0] == 9.5
+    assert StockDataFetcher.bar_store.read('KO', '1d')['Close'].iloc[0] == bars['Close'].iloc[0]
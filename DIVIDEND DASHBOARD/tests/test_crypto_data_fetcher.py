@@ -0,0 +1,81 @@
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import pytest
+from files.CryptoDataFetcher import CryptoDataFetcher
+
+HOUR = 3600
+# a whole hour, so the stand-in candles fall on the window edges
+START_AT = 1_700_002_800
+
+class _CandlesHandler(BaseHTTPRequestHandler):
+    # a stand-in for KuCoin's /api/v1/market/candles
+    def do_GET(self):
+        query = {key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()}
+        self.server.requests.append(query)
+        if query['symbol'] == 'BAD-USDT':
+            body = {'code': '400100', 'msg': 'This pair is not provided at present'}
+        else:
+            start_at, end_at = int(query['startAt']), int(query['endAt'])
+            # both ends are inclusive, so neighbouring windows share their edge candle.
+            # Like KuCoin, the newest candles come first
+            times = list(range(end_at - end_at % HOUR, start_at - 1, -HOUR))
+            self.server.returned += len(times)
+            body = {'code': '200000', 'data': [[str(t), str(t % 1000), str(t % 1000 + 0.5), str(t % 1000 + 1), str(t % 1000 - 1), '1', '1']
+                                               for t in times]}
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def kucoin(monkeypatch):
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _CandlesHandler)
+    server.requests = []
+    server.returned = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def make_fetcher(server, symbol):
+    fetcher = CryptoDataFetcher(base_url=f'http://127.0.0.1:{server.server_address[1]}')
+    fetcher.set_symbol(symbol)
+    return fetcher
+
+def test_candles_are_split_into_windows_deduplicated_and_sorted(kucoin):
+    hours = 4000
+    fetcher = make_fetcher(kucoin, 'BTC-USDT')
+    df = fetcher.fetch_candles('1hour', datetime.fromtimestamp(START_AT), datetime.fromtimestamp(START_AT + hours * HOUR))
+
+    # 4000 hours need three windows of at most 1500 candles
+    windows = sorted((int(query['startAt']), int(query['endAt'])) for query in kucoin.requests)
+    assert len(windows) == 3
+    assert all(end_at - start_at <= CryptoDataFetcher.MAX_CANDLES * HOUR for start_at, end_at in windows)
+    assert windows[0][0] == START_AT and windows[-1][1] == START_AT + hours * HOUR
+
+    # the two shared edge candles are kept once, oldest first
+    assert kucoin.returned == hours + 3
+    assert df.index.is_unique
+    assert df.index.is_monotonic_increasing
+    assert len(df) == hours + 1
+    assert int(df.index[0].timestamp()) == START_AT
+    assert int(df.index[-1].timestamp()) == START_AT + hours * HOUR
+    assert list(df.columns) == ['Open', 'High', 'Low', 'Close']
+    first = START_AT % 1000
+    assert df.iloc[0].tolist() == [first, first + 1, first - 1, first + 0.5]
+
+def test_an_error_code_is_reported_as_no_data(kucoin, capsys):
+    fetcher = make_fetcher(kucoin, 'BAD-USDT')
+    df = fetcher.fetch_candles('1hour', datetime.fromtimestamp(START_AT), datetime.fromtimestamp(START_AT + 10 * HOUR))
+    assert df is None
+    assert 'KuCoin error 400100' in capsys.readouterr().out
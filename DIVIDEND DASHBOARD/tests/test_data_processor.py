@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import savgol_filter
+from files.DataProcessor import DataProcessor
+
+def make_forecast(seed, periods=100, start='2024-03-01'):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'ds': pd.date_range(start, periods=periods), 'yhat': rng.random(periods),
+                         'yhat_lower': rng.random(periods), 'yhat_upper': rng.random(periods),
+                         'trend': rng.random(periods)})
+
+def make_bars(seed, periods=120, start='2024-01-01'):
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex(pd.date_range(start, periods=periods), name='Date')
+    return pd.DataFrame(rng.random((periods, 4)), index=index, columns=['Open', 'High', 'Low', 'Close'])
+
+def test_the_panel_matches_the_per_column_smoothing():
+    forecasts = {'KO': make_forecast(1), 'PEP': make_forecast(2), 'BTC': make_forecast(3, start='2024-02-01')}
+    processed = DataProcessor.process_prophet_forecasts(forecasts)
+    for symbol, forecast in forecasts.items():
+        assert processed[symbol].index.equals(pd.DatetimeIndex(forecast['ds'], name='Date'))
+        assert np.allclose(processed[symbol]['predicted_price'], savgol_filter(forecast['yhat'], 31, 2))
+        assert np.allclose(processed[symbol]['lower_band'], savgol_filter(forecast['yhat_lower'], 31, 2))
+        assert np.allclose(processed[symbol]['upper_band'], savgol_filter(forecast['yhat_upper'], 31, 2))
+        assert np.array_equal(processed[symbol]['trend'], forecast['trend'])
+    # the single symbol call is the same computation
+    pd.testing.assert_frame_equal(DataProcessor.process_prophet_forecast(forecasts['KO']), processed['KO'])
+
+def test_merge_panel_returns_views_of_one_block():
+    bars = {'KO': make_bars(1), 'PEP': make_bars(2)}
+    processed = DataProcessor.process_prophet_forecasts({'KO': make_forecast(1), 'PEP': make_forecast(2)})
+    merged = DataProcessor.merge_panel(bars, processed)
+
+    # 2024-01-01 to 2024-06-08, the bars end on 2024-04-29
+    assert merged['KO'].shape == (160, 8)
+    assert merged['KO']['Close'].loc['2024-04-29'] == bars['KO']['Close'].iloc[-1]
+    assert np.isnan(merged['KO']['Close'].iloc[-1])
+    assert np.isnan(merged['KO']['predicted_price'].iloc[0])
+    ko, pep = merged['KO'].to_numpy(), merged['PEP'].to_numpy()
+    assert ko.base is not None and np.shares_memory(ko.base, pep.base)
+
+def test_repeated_dates_keep_their_last_row():
+    bars = make_bars(1)
+    forming = bars.iloc[-1:] * 2
+    forecast = make_forecast(1)
+    forecast = pd.concat([forecast, forecast.iloc[-1:].assign(yhat=5.0)], ignore_index=True)
+
+    processed = DataProcessor.process_prophet_forecast(forecast)
+    assert processed.index.is_unique
+    merged = DataProcessor.merge_dataframes_for_prophet(pd.concat([bars, forming]), processed)
+    assert merged.index.is_unique
+    assert merged['Close'].loc[bars.index[-1]] == forming['Close'].iloc[0]
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from files.DateRangeIndex import DateRangeIndex
+
+def make_dividends(rows=200):
+    # pay dates out of order, with repeated days and a few intraday times
+    rng = np.random.default_rng(0)
+    days = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 120, rows), unit='D')
+    hours = pd.to_timedelta(rng.choice([0, 0, 0, 15], rows), unit='h')
+    return pd.DataFrame({'Ticker': [f'T{i}' for i in range(rows)],
+                         'ex_dividend_date': days - pd.Timedelta(days=14),
+                         'pay_date': days + hours})
+
+def old_filter(df, start_date, end_date):
+    # the callback before the index: format the dates, then compare the strings
+    div_df = df.copy()
+    div_df['pay_date'] = div_df['pay_date'].dt.strftime('%Y-%m-%d')
+    return div_df.query('pay_date >= @start_date and pay_date <= @end_date')
+
+def test_the_slice_matches_the_string_filter():
+    df = make_dividends()
+    index = DateRangeIndex(df, 'pay_date')
+    ranges = [('2024-01-01', '2024-04-30'), ('2024-02-10', '2024-02-10'), ('2024-02-11', '2024-03-05'),
+              ('2023-06-01', '2024-01-15'), ('2024-04-20', '2025-01-01'), ('2024-03-01', '2024-02-01')]
+    for start_date, end_date in ranges:
+        expected = old_filter(df, start_date, end_date)
+        sliced = index.slice(start_date, end_date)
+        # the slice is sorted by pay_date, the old filter kept the workbook order
+        assert sorted(sliced['Ticker']) == sorted(expected['Ticker'])
+
+def test_both_endpoints_are_inclusive():
+    df = make_dividends()
+    first, last = df['pay_date'].min().normalize(), df['pay_date'].max().normalize()
+    index = DateRangeIndex(df, 'pay_date')
+    sliced = index.slice(first, last)
+
+    assert len(sliced) == len(df)
+    # a row paid in the afternoon of the end date is kept
+    afternoon = index.frame[index.frame['pay_date'].dt.hour == 15].iloc[0]
+    day = afternoon['pay_date'].strftime('%Y-%m-%d')
+    assert afternoon['Ticker'] in set(index.slice(day, day)['Ticker'])
+    assert sliced['pay_date'].is_monotonic_increasing
+    assert index.min_date() == df['pay_date'].min() and index.max_date() == df['pay_date'].max()
+
+def test_open_ended_ranges_keep_the_rest_of_the_index():
+    df = make_dividends()
+    index = DateRangeIndex(df, 'pay_date')
+    assert len(index.slice()) == len(df)
+    assert len(index.slice(start_date='2024-03-01')) == (df['pay_date'] >= '2024-03-01').sum()
+    assert len(index.slice(end_date='2024-02-29')) == (df['pay_date'] < '2024-03-01').sum()
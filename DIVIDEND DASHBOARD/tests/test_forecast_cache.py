@@ -0,0 +1,48 @@
+import pandas as pd
+from files.ForecastCache import ForecastCache
+
+def make_bars(periods=30, last_close=None):
+    bars = pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=periods), 'y': [float(i) for i in range(periods)]})
+    if last_close is not None:
+        bars.loc[bars.index[-1], 'y'] = last_close
+    return bars
+
+def test_the_key_changes_with_the_bars_and_the_model_parameters():
+    key = ForecastCache.make_key('KO', 'D', 90, make_bars(), tier='interactive')
+    assert key == ForecastCache.make_key('KO', 'D', 90, make_bars(), tier='interactive')
+    # a new bar, a forming bar that moved and different settings are all new forecasts
+    assert key != ForecastCache.make_key('KO', 'D', 90, make_bars(periods=31), tier='interactive')
+    assert key != ForecastCache.make_key('KO', 'D', 90, make_bars(last_close=99.0), tier='interactive')
+    assert key != ForecastCache.make_key('KO', 'D', 90, make_bars(), tier='screen')
+    assert key != ForecastCache.make_key('KO', 'D', 30, make_bars(), tier='interactive')
+    assert key != ForecastCache.make_key('KO', 'H', 90, make_bars(), tier='interactive')
+
+def test_the_least_recently_used_forecast_is_evicted():
+    cache = ForecastCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    # reading a makes b the least recently used one
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+def test_forecasts_are_read_back_from_disk(tmp_path):
+    forecast = pd.DataFrame({'predicted_price': [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2))
+    key = ForecastCache.make_key('KO', 'D', 90, make_bars())
+    ForecastCache(cache_dir=str(tmp_path)).set(key, forecast)
+
+    # a new cache, like after a restart, starts with an empty memory tier
+    cache = ForecastCache(cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(cache.get(key), forecast)
+    calls = []
+    assert cache.get_or_compute(key, lambda: calls.append(1)) is not None
+    assert calls == []
+
+def test_the_disk_tier_is_pruned(tmp_path):
+    cache = ForecastCache(max_entries=1, cache_dir=str(tmp_path), max_disk_entries=2)
+    for i in range(4):
+        cache.set(('KO', i), i)
+    assert len(list(tmp_path.glob('*.pickle'))) == 2
@@ -0,0 +1,52 @@
+import os
+import pandas as pd
+from files.HoldingsWatcher import HoldingsWatcher
+from files.WorkbookLoader import WorkbookLoader
+
+def write_holdings(path, holdings, mtime_ns):
+    with pd.ExcelWriter(path) as writer:
+        pd.DataFrame(holdings).to_excel(writer, sheet_name='current_holdings', index=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+HOLDINGS = {'Ticker': ['KO', 'PEP', 'O', 'KO'], 'Shares': [10, 5, 20, 3], 'G/L ($)': [12.5, -3.0, 40.0, 1.0]}
+
+def make_watcher(tmp_path):
+    path = str(tmp_path / 'Dividend_Dashboard.xlsx')
+    write_holdings(path, HOLDINGS, 1_000_000_000)
+    loader = WorkbookLoader(path)
+    loads = []
+
+    def load_holdings():
+        loads.append(1)
+        return loader.get_sheet('current_holdings')
+
+    return path, HoldingsWatcher(loader, load_holdings), loads
+
+def test_an_unchanged_workbook_is_not_reloaded(tmp_path):
+    _, watcher, loads = make_watcher(tmp_path)
+    assert watcher.poll() is None
+    assert watcher.poll() is None
+    assert len(loads) == 1
+    assert watcher.version == 0
+
+def test_only_the_changed_rows_are_reported(tmp_path):
+    path, watcher, loads = make_watcher(tmp_path)
+    # PEP is updated, O is sold, T is bought and the second KO lot is untouched
+    edited = {'Ticker': ['KO', 'PEP', 'KO', 'T'], 'Shares': [10, 8, 3, 50], 'G/L ($)': [12.5, -3.0, 1.0, 0.0]}
+    write_holdings(path, edited, 2_000_000_000)
+    changes = watcher.poll()
+
+    assert changes == {'inserted': ['T'], 'updated': ['PEP'], 'deleted': ['O']}
+    assert watcher.last_changes == changes
+    assert watcher.version == 1
+    assert watcher.holdings['Ticker'].tolist() == edited['Ticker']
+    # the new snapshot is the baseline of the next poll
+    assert watcher.poll() is None
+    assert len(loads) == 2
+
+def test_a_save_without_edits_keeps_the_version(tmp_path):
+    path, watcher, loads = make_watcher(tmp_path)
+    write_holdings(path, HOLDINGS, 2_000_000_000)
+    assert watcher.poll() is None
+    assert len(loads) == 2
+    assert watcher.version == 0
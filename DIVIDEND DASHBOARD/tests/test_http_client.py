@@ -0,0 +1,90 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from files.HttpClient import HttpClient
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    # answers each path with the next status of its script, then with 200
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self):
+        self.server.requests.append((self.command, self.path))
+        script = self.server.scripts.get(self.path, [])
+        status = script.pop(0) if script else 200
+        payload = b'{"ok": true}' if status == 200 else b'{}'
+        self.send_response(status)
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1,localhost')
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ScriptedHandler)
+    server.scripts = {}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def base_url(server):
+    return f'http://127.0.0.1:{server.server_address[1]}'
+
+def test_a_503_is_retried_until_it_succeeds(server):
+    server.scripts['/quote'] = [503, 503]
+    client = HttpClient(backoff=0.01)
+    response = client.get(base_url(server) + '/quote')
+
+    assert response.status_code == 200
+    assert response.json() == {'ok': True}
+    assert len(server.requests) == 3
+    stats = client.stats()[f'127.0.0.1:{server.server_address[1]}']
+    assert (stats['requests'], stats['errors'], stats['retries']) == (3, 2, 2)
+
+def test_a_429_is_retried_even_for_a_post(server):
+    server.scripts['/order'] = [429]
+    server.scripts['/fail'] = [500]
+    client = HttpClient(backoff=0.01)
+
+    assert client.post(base_url(server) + '/order').status_code == 200
+    # other POSTs may already have been processed, so they are not sent twice
+    assert client.post(base_url(server) + '/fail').status_code == 500
+    assert server.requests == [('POST', '/order'), ('POST', '/order'), ('POST', '/fail')]
+
+def test_the_last_response_is_returned_when_the_retries_run_out(server):
+    server.scripts['/down'] = [503, 503, 503]
+    client = HttpClient(retries=1, backoff=0.01)
+    response = client.get(base_url(server) + '/down')
+
+    assert response.status_code == 503
+    assert len(server.requests) == 2
+
+def test_each_host_reuses_its_session_and_connection(server):
+    client = HttpClient()
+    for _ in range(5):
+        assert client.get(base_url(server) + '/quote').status_code == 200
+    host = f'127.0.0.1:{server.server_address[1]}'
+
+    assert list(client._sessions) == [host]
+    assert client._session(host) is client._sessions[host]
+    stats = client.stats()[host]
+    assert (stats['requests'], stats['errors'], stats['retries']) == (5, 0, 0)
+    # keep-alive: the five calls went over a single pooled connection
+    assert stats['pool_connections'] == 1
+    assert stats['pool_requests'] == 5
+    assert 0 <= stats['latency_p50'] <= stats['latency_p95'] <= stats['latency_max']
+    # a second host gets a session of its own
+    client.get(f'http://localhost:{server.server_address[1]}/quote')
+    assert len(client._sessions) == 2
+    assert client._sessions[host] is not client._sessions[f'localhost:{server.server_address[1]}']
@@ -0,0 +1,9 @@
+import check_import_time
+
+def test_app_imports_within_the_budget_without_heavy_modules():
+    # one fresh interpreter importing app, with the page and forecast warm-ups off
+    total_ms, _, imported = check_import_time.summarize(check_import_time.measure())
+    budget_ms = check_import_time.budget_from_env()
+    assert total_ms <= budget_ms, f'import app took {total_ms:.0f} ms, the budget is {budget_ms:.0f} ms'
+    for module in ['prophet', 'scipy.signal', 'yfinance']:
+        assert module not in imported, f'{module} is imported at start up instead of on first use'
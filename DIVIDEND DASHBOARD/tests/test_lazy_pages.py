@@ -0,0 +1,32 @@
+import json
+import os
+import subprocess
+import sys
+
+DASHBOARD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# records every workbook or database open and every network call made while importing
+PROBE = """
+import json, sys
+events = []
+def audit(event, args):
+    if event == 'open' and isinstance(args[0], str) and args[0].endswith(('.xlsx', '.db')):
+        events.append([event, args[0]])
+    elif event in ('socket.connect', 'socket.getaddrinfo', 'sqlite3.connect'):
+        events.append([event, repr(args)])
+sys.addaudithook(audit)
+import {module}
+print(json.dumps(events))
+"""
+
+def import_events(module):
+    # a fresh interpreter, like start up, with the page and forecast warm-ups off
+    env = dict(os.environ, PAGE_WARMUP='0', FORECAST_WARMUP='0', DIVIDEND_WARMUP='0', MT4_STREAM='0')
+    result = subprocess.run([sys.executable, '-c', PROBE.format(module=module)], cwd=DASHBOARD_DIR,
+                            env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.splitlines()[-1])
+
+def test_importing_the_pages_does_no_workbook_or_network_io():
+    # app.py imports every page through dash's page registry
+    assert import_events('app') == []
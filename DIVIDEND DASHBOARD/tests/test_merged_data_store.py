@@ -0,0 +1,48 @@
+import json
+import numpy as np
+import pandas as pd
+from files.DataVisualizer import DataVisualizer
+from files.MergedDataStore import MergedDataStore
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'predicted_price', 'lower_band', 'upper_band', 'trend']
+
+def make_merged(rows=200, forecast_rows=90):
+    # the bars followed by the forecast sessions, like DataProcessor.merge_dataframes_for_prophet()
+    rng = np.random.default_rng(0)
+    index = pd.DatetimeIndex(pd.date_range('2024-01-01', periods=rows), name='Date')
+    df = pd.DataFrame(100 + rng.random((rows, len(COLUMNS))), index=index, columns=COLUMNS)
+    df.iloc[-forecast_rows:, :4] = np.nan
+    return df
+
+def test_eviction_keeps_the_total_under_the_budget():
+    entry_bytes = 200 * 8 + 200 * len(COLUMNS) * 4
+    store = MergedDataStore(max_bytes=3 * entry_bytes)
+    for symbol in ['KO', 'PEP', 'O']:
+        store[symbol] = make_merged()
+    # reading KO makes PEP the least recently used entry
+    assert store.get('KO') is not None
+    store['MO'] = make_merged()
+
+    assert store.nbytes <= store.max_bytes
+    assert store.nbytes == store.footprint()['bytes'].sum()
+    assert 'PEP' not in store
+    assert 'KO' in store and 'MO' in store
+    assert list(store.footprint().index) == ['O', 'KO', 'MO']
+
+def test_the_float32_round_trip_feeds_the_chart():
+    merged = make_merged()
+    store = MergedDataStore()
+    store['KO'] = merged
+    stored = store['KO']
+
+    assert stored.dtypes.eq(np.float32).all()
+    assert stored.index.equals(merged.index)
+    assert np.allclose(stored.to_numpy(), merged.to_numpy(), equal_nan=True, rtol=1e-6)
+    # the Market Watch chart of the last 100 bars and the forecast, serialized like Dash does
+    fig = DataVisualizer.create_candlestick_chart(stored.tail(190), 'KO', 'Daily')
+    json.loads(fig.to_json())
+    # the bot compares the last bar before the forecast with its bands
+    latest_data = stored.iloc[-91]
+    assert latest_data.name == merged.index[-91]
+    assert np.isclose(latest_data['Close'], merged['Close'].iloc[-91])
+    assert (latest_data['Close'] < latest_data['lower_band']) == (merged['Close'].iloc[-91] < merged['lower_band'].iloc[-91])
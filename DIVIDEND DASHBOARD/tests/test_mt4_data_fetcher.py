@@ -0,0 +1,49 @@
+import os
+import pandas as pd
+from files.BarStreamServer import BarStreamServer
+from files.MT4DataFetcher import MT4DataFetcher
+
+def write_bars(path, start, count, mtime_ns):
+    # the EA's format: date;open;high;low;close with one bar per hour
+    dates = pd.date_range(start, periods=count, freq='h')
+    with open(path, 'w') as file:
+        for i, bar_date in enumerate(dates):
+            file.write(f'{bar_date.strftime("%Y.%m.%d %H:%M")};{i}.0;{i + 1}.0;{i - 1}.0;{i}.5\n')
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return dates
+
+def test_full_rewrite_is_parsed_from_the_first_line(tmp_path):
+    path = str(tmp_path / 'EURUSD_60.csv')
+    write_bars(path, '2024-01-01 00:00', 730, 1_000_000_000)
+    assert len(MT4DataFetcher.read_csv(path)) == 730
+
+    # a new window that shares no bar with the cached one
+    dates = write_bars(path, '2025-01-01 00:00', 100, 2_000_000_000)
+    frame = MT4DataFetcher.read_csv(path)
+    assert len(frame) == 100
+    assert frame.index[0] == dates[0]
+    assert frame.index[-1] == dates[-1]
+
+    # the cache now describes the new file, so an append is still detected
+    with open(path, 'a') as file:
+        file.write('2025.01.05 04:00;1.0;2.0;0.5;1.5\n')
+    os.utime(path, ns=(3_000_000_000, 3_000_000_000))
+    frame = MT4DataFetcher.read_csv(path)
+    assert len(frame) == 101
+    assert frame.index[0] == dates[0]
+    assert frame.index[-1] == pd.Timestamp('2025-01-05 04:00')
+
+def test_a_partial_stream_is_seeded_from_the_file(tmp_path, monkeypatch):
+    dates = write_bars(str(tmp_path / 'EURUSD_60.csv'), '2024-01-01 00:00', 730, 1_000_000_000)
+    bar_stream = BarStreamServer(max_bars=730)
+    monkeypatch.setattr(MT4DataFetcher, 'bar_stream', bar_stream)
+    # the forming bar of the file and one new bar arrived on the stream
+    bar_stream.add_bar('EURUSD', '60', dates[-1], 1.0, 2.0, 0.5, 1.25)
+    bar_stream.add_bar('EURUSD', '60', dates[-1] + pd.Timedelta(hours=1), 1.0, 2.0, 0.5, 1.75)
+
+    fetcher = MT4DataFetcher(period='60', base_path=str(tmp_path))
+    fetcher.set_symbol('EURUSD')
+    frame = fetcher.fetch_data()
+    assert len(frame) == 730
+    assert frame.index[0] == dates[1]
+    assert frame['Close'].iloc[-2:].tolist() == [1.25, 1.75]
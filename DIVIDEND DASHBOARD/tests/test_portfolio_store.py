@@ -0,0 +1,67 @@
+import os
+import pandas as pd
+from files.PortfolioStore import PortfolioStore
+from files.WorkbookLoader import WorkbookLoader
+
+def write_workbook(path, holdings, mtime_ns):
+    # the sheets of the dashboard workbook, a few rows each
+    sheets = {
+        'current_holdings': pd.DataFrame(holdings),
+        'dividend_info': pd.DataFrame({
+            'Ticker': ['KO', 'O', 'PEP'],
+            'ex_dividend_date': pd.to_datetime(['2024-01-02', '2024-01-30', '2024-03-01']),
+            'pay_date': pd.to_datetime(['2024-01-15', '2024-02-15', '2024-03-29']),
+        }),
+        'closed_trades': pd.DataFrame({
+            'Ticker': ['T', 'VZ'],
+            'Date Op.': pd.to_datetime(['2022-05-01', '2022-01-10']),
+            'Date Closed': pd.to_datetime(['2023-06-01', '2023-02-01']),
+        }),
+        # the 2023 sheet names the account column 'Acc.'
+        '2023': pd.DataFrame({'Symbol': ['KO', 'O'], 'Acc.': ['IRA', 'Taxable'],
+                              'Date': pd.to_datetime(['2023-04-01', '2023-05-15']),
+                              'Month': ['April', 'May'], 'Amount': [10.25, 4.5]}),
+        '2024': pd.DataFrame({'Symbol': ['KO', 'O', 'PEP'], 'Account Type': ['IRA', 'Taxable', 'IRA'],
+                              'Date': pd.to_datetime(['2024-04-01', '2024-02-15', '2024-03-29']),
+                              'Month': ['April', 'February', 'March'], 'Amount': [11.0, 4.75, 7.5]}),
+    }
+    with pd.ExcelWriter(path) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def make_store(tmp_path):
+    path = str(tmp_path / 'Dividend_Dashboard.xlsx')
+    write_workbook(path, {'Ticker': ['KO', 'PEP', 'O'], 'Date Op.': pd.to_datetime(['2021-01-04', '2021-06-01', '2022-03-15']),
+                          'G/L ($)': [12.5, -3.0, 40.0]}, 1_000_000_000)
+    return path, PortfolioStore(str(tmp_path / 'portfolio.db'), WorkbookLoader(path))
+
+def test_queries_read_the_imported_workbook(tmp_path):
+    _, store = make_store(tmp_path)
+
+    holdings = store.get_current_holdings()
+    assert holdings['Ticker'].tolist() == ['O', 'KO', 'PEP']
+    assert pd.api.types.is_datetime64_any_dtype(holdings['Date Op.'])
+
+    upcoming = store.get_dividend_info('2024-01-15', '2024-02-15')
+    assert upcoming['Ticker'].tolist() == ['KO', 'O']
+
+    payments = store.get_dividend_payments(years=[2023])
+    assert payments['Symbol'].tolist() == ['KO', 'O']
+    assert payments['Account Type'].tolist() == ['IRA', 'Taxable']
+    totals = store.get_dividend_totals_by_year()
+    assert totals.index.tolist() == ['2023', '2024']
+    assert totals['Amount'].tolist() == [14.75, 23.25]
+
+    closed = store.get_closed_trades()
+    assert closed['Ticker'].tolist() == ['VZ', 'T']
+
+def test_a_changed_workbook_is_imported_again(tmp_path):
+    path, store = make_store(tmp_path)
+    assert store.sync()
+    assert not store.sync()
+
+    write_workbook(path, {'Ticker': ['KO', 'MO'], 'Date Op.': pd.to_datetime(['2021-01-04', '2024-02-01']),
+                          'G/L ($)': [15.0, 2.0]}, 2_000_000_000)
+    assert store.get_current_holdings()['Ticker'].tolist() == ['KO', 'MO']
+    assert not store.sync()
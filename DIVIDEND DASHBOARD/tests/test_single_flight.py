@@ -0,0 +1,68 @@
+import threading
+import time
+import pytest
+from files.SingleFlight import SingleFlight
+
+CALLERS = 8
+
+def run_callers(flight, function, key='KO'):
+    # starts every caller at once and collects what each one received
+    barrier = threading.Barrier(CALLERS)
+    outcomes = [None] * CALLERS
+
+    def caller(i):
+        barrier.wait()
+        try:
+            outcomes[i] = ('result', flight.do(key, function))
+        except Exception as e:
+            outcomes[i] = ('error', e)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+def test_concurrent_callers_of_a_key_share_one_computation():
+    flight = SingleFlight()
+    runs = []
+
+    def fetch():
+        runs.append(1)
+        # long enough for every caller to arrive while it is in flight
+        time.sleep(0.2)
+        return {'close': 60.5}
+
+    outcomes = run_callers(flight, fetch)
+    assert len(runs) == 1
+    assert all(kind == 'result' for kind, _ in outcomes)
+    # the waiting callers receive the very object the leader computed
+    assert all(value is outcomes[0][1] for _, value in outcomes)
+    assert (flight.calls, flight.shared) == (1, CALLERS - 1)
+
+def test_every_waiting_caller_receives_the_exception():
+    flight = SingleFlight()
+    runs = []
+
+    def fetch():
+        runs.append(1)
+        time.sleep(0.2)
+        raise ValueError('no data for KO')
+
+    outcomes = run_callers(flight, fetch)
+    assert len(runs) == 1
+    assert all(kind == 'error' and str(error) == 'no data for KO' for kind, error in outcomes)
+
+def test_the_key_is_released_once_the_call_finishes():
+    flight = SingleFlight()
+    assert flight.do('KO', lambda: 1) == 1
+    assert flight.do('KO', lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flight.do('KO', lambda: {}['missing'])
+    # a failure does not leave the key stuck in flight
+    assert flight.do('KO', lambda: 3) == 3
+    assert flight.calls == 4
+    # different keys never wait for each other
+    assert flight.do('PEP', lambda: 4) == 4
+    assert flight.shared == 0
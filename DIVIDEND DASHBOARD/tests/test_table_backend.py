@@ -0,0 +1,59 @@
+import pandas as pd
+from files.TableBackend import TableBackend
+
+def make_backend():
+    backend = TableBackend(page_size=15)
+    backend.set_frame(pd.DataFrame({
+        'Ticker': ['KO', 'PEP', 'O'],
+        'G/L ($)': [12.5, -3.0, 40.0],
+        'pay_date': ['2024-01-15', '2024-02-01', '2024-01-31'],
+    }))
+    return backend
+
+def tickers(records):
+    return [record['Ticker'] for record in records]
+
+def test_numeric_filter():
+    records, _ = make_backend().query(0, 15, [], '{G/L ($)} > 10')
+    assert tickers(records) == ['KO', 'O']
+
+def test_text_in_a_numeric_filter_matches_nothing():
+    records, page_count = make_backend().query(0, 15, [], '{G/L ($)} > abc')
+    assert records == []
+    assert page_count == 1
+
+def test_partial_date_filter():
+    records, _ = make_backend().query(0, 15, [], '{pay_date} datestartswith 2024-01')
+    assert tickers(records) == ['KO', 'O']
+    assert TableBackend.split_filter_part('{pay_date} datestartswith 01') == ('pay_date', 'datestartswith', '01')
+
+def test_the_column_types_follow_the_data():
+    df = make_backend().frame
+    assert [TableBackend.column_type(df[column]) for column in df.columns] == ['text', 'numeric', 'datetime']
+    assert TableBackend.column_type(pd.Series(pd.to_datetime(['2024-01-15']))) == 'datetime'
+    # dates in another format are only text to the table
+    assert TableBackend.column_type(pd.Series(['01-15-2024'])) == 'text'
+
+def test_sort_order():
+    backend = make_backend()
+    records, _ = backend.query(0, 15, [{'column_id': 'G/L ($)', 'direction': 'desc'}], '')
+    assert tickers(records) == ['O', 'KO', 'PEP']
+    records, _ = backend.query(0, 15, [{'column_id': 'pay_date', 'direction': 'asc'}], '')
+    assert tickers(records) == ['KO', 'O', 'PEP']
+    records, _ = backend.query(0, 15, [{'column_id': 'Ticker', 'direction': 'asc'}], '{G/L ($)} > 0')
+    assert tickers(records) == ['KO', 'O']
+    # no sort keeps the original order
+    assert tickers(backend.query(0, 15, [], '')[0]) == ['KO', 'PEP', 'O']
+
+def test_page_boundaries():
+    backend = TableBackend(page_size=15)
+    backend.set_frame(pd.DataFrame({'Ticker': [f'T{i:02d}' for i in range(31)], 'G/L ($)': [float(i) for i in range(31)]}))
+    pages = [backend.query(page, 15, [], '') for page in range(4)]
+
+    assert [len(records) for records, _ in pages] == [15, 15, 1, 0]
+    assert all(page_count == 3 for _, page_count in pages)
+    assert tickers(pages[1][0])[0] == 'T15' and tickers(pages[1][0])[-1] == 'T29'
+    assert tickers(pages[2][0]) == ['T30']
+    # exactly two full pages, and a filter counts only the matching rows
+    assert backend.query(0, 15, [], '{G/L ($)} < 30')[1] == 2
+    assert backend.query(1, 10, [{'column_id': 'G/L ($)', 'direction': 'desc'}], '')[0][0]['Ticker'] == 'T20'
@@ -0,0 +1,28 @@
+import pandas as pd
+from files.TradingCalendar import TradingCalendar
+
+def test_equity_sessions_skip_weekends_and_nyse_holidays():
+    # Wednesday before Thanksgiving, 2026-11-26
+    dates = TradingCalendar.future_dates('2026-11-25', 4, asset_class='equity')
+    assert list(dates.strftime('%Y-%m-%d')) == ['2026-11-27', '2026-11-30', '2026-12-01', '2026-12-02']
+
+def test_fx_sessions_skip_weekends_only():
+    dates = TradingCalendar.future_dates('2026-11-20', 5, asset_class='fx')
+    assert list(dates.strftime('%Y-%m-%d')) == ['2026-11-23', '2026-11-24', '2026-11-25', '2026-11-26', '2026-11-27']
+    hours = TradingCalendar.future_dates('2026-11-20 20:00', 30, freq='H', asset_class='fx')
+    assert len(hours) == 30
+    assert (hours.weekday < 5).all()
+    assert hours[3] == pd.Timestamp('2026-11-23 00:00')
+
+def test_crypto_keeps_every_day():
+    dates = TradingCalendar.future_dates('2026-11-25', 7, asset_class='crypto')
+    assert dates.equals(pd.date_range('2026-11-26', periods=7, freq='D'))
+
+def test_the_future_frame_appends_the_sessions_to_the_history():
+    history = pd.date_range('2026-11-23', periods=3, freq='D')
+    future = TradingCalendar.future_dataframe(history, 2, asset_class='equity')
+    assert list(future['ds'].dt.strftime('%Y-%m-%d')) == ['2026-11-23', '2026-11-24', '2026-11-25', '2026-11-27', '2026-11-30']
+
+def test_crypto_hours_keep_every_hour():
+    hours = TradingCalendar.future_dates('2026-11-21 22:00', 4, freq='H', asset_class='crypto')
+    assert hours.equals(pd.date_range('2026-11-21 23:00', periods=4, freq='h'))